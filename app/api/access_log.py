@@ -0,0 +1,109 @@
+import random
+import time
+import uuid
+from typing import Callable, Optional
+
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger("app.api.access")
+
+
+def should_log_request(
+    status_code: int,
+    duration_ms: float,
+    sample_rate: float,
+    slow_ms: float,
+    rand: Callable[[], float] = random.random,
+) -> bool:
+    """Errors and slow requests are always logged, the rest are sampled"""
+    if status_code >= 500 or duration_ms >= slow_ms:
+        return True
+    return sample_rate >= 1.0 or (sample_rate > 0 and rand() < sample_rate)
+
+
+def _request_id(scope) -> str:
+    """The client's X-Request-ID, or a new ID if it sent none"""
+    for name, value in scope.get("headers", ()):
+        if name == b"x-request-id":
+            return value.decode("latin-1")
+    return uuid.uuid4().hex
+
+
+class AccessLogMiddleware:
+    """
+    ASGI middleware writing one structured line per request.
+
+    Unlike the verbose logging middleware it never reads request or response
+    bodies and formats nothing for requests that are not logged. Successful
+    requests are sampled with ``sample_rate``; 5xx responses, unhandled
+    exceptions and requests slower than ``slow_ms`` are always logged.
+
+    The request ID is taken from the X-Request-ID header or generated once per
+    request. It is stored as ``request.state.request_id``, echoed in the
+    response's X-Request-ID header and written to the log line, so a logged
+    request can be matched to what the client saw.
+    """
+
+    def __init__(
+        self,
+        app,
+        sample_rate: Optional[float] = None,
+        slow_ms: Optional[float] = None,
+    ):
+        self.app = app
+        self.sample_rate = (
+            settings.API_ACCESS_LOG_SAMPLE_RATE if sample_rate is None else sample_rate
+        )
+        self.slow_ms = settings.API_SLOW_REQUEST_MS if slow_ms is None else slow_ms
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+        request_id = _request_id(scope)
+        scope.setdefault("state", {})["request_id"] = request_id
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = list(message.get("headers", ()))
+                if not any(name.lower() == b"x-request-id" for name, _ in headers):
+                    headers.append((b"x-request-id", request_id.encode("latin-1")))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception:
+            self._log(scope, request_id, 500, (time.perf_counter() - start) * 1000, failed=True)
+            raise
+
+        duration_ms = (time.perf_counter() - start) * 1000
+        if should_log_request(status_code, duration_ms, self.sample_rate, self.slow_ms):
+            self._log(scope, request_id, status_code, duration_ms)
+
+    def _log(
+        self,
+        scope,
+        request_id: str,
+        status_code: int,
+        duration_ms: float,
+        failed: bool = False,
+    ):
+        level = logger.error if status_code >= 500 else (
+            logger.warning if duration_ms >= self.slow_ms else logger.info
+        )
+        level(
+            "method=%s path=%s status=%d duration_ms=%.1f request_id=%s%s",
+            scope["method"],
+            scope["path"],
+            status_code,
+            duration_ms,
+            request_id,
+            " error=unhandled" if failed else "",
+        )
@@ -0,0 +1,118 @@
+import json
+import re
+import uuid
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple, Type, Union
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class JSONFragment:
+    """
+    Already serialized JSON spliced verbatim into a response body.
+
+    The caller is trusted to pass a single valid JSON value; it is not parsed
+    or validated again.
+    """
+
+    __slots__ = ("data",)
+
+    def __init__(self, data: Union[bytes, str]):
+        self.data = data if isinstance(data, bytes) else data.encode("utf-8")
+
+    def __repr__(self):
+        return f"JSONFragment({self.data[:40]!r})"
+
+
+# Stands in for fragments while the stdlib encoder runs, then is replaced by them
+_FRAGMENT_MARKER = f"__cmp_fragment_{uuid.uuid4().hex}_"
+_FRAGMENT_PATTERN = re.compile(rf'"{_FRAGMENT_MARKER}(\d+)"'.encode("utf-8"))
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, Decimal):
+        return float(obj)
+    return jsonable_encoder(obj)
+
+
+def _orjson_default(obj: Any) -> Any:
+    if isinstance(obj, JSONFragment):
+        return orjson.Fragment(obj.data)
+    return _default(obj)
+
+
+def dumps_json(content: Any) -> bytes:
+    """
+    Serialize content to compact UTF-8 JSON, splicing in any JSONFragment.
+
+    Uses orjson when installed and the standard library otherwise; both
+    produce the same document.
+    """
+    if orjson is not None:
+        return orjson.dumps(content, default=_orjson_default)
+
+    fragments: List[bytes] = []
+
+    def default(obj: Any) -> Any:
+        if isinstance(obj, JSONFragment):
+            fragments.append(obj.data)
+            return f"{_FRAGMENT_MARKER}{len(fragments) - 1}"
+        return _default(obj)
+
+    body = json.dumps(
+        content,
+        default=default,
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+    if fragments:
+        body = _FRAGMENT_PATTERN.sub(lambda m: fragments[int(m.group(1))], body)
+    return body
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response rendered with dumps_json.
+
+    Returning it from a route skips FastAPI's response_model validation and
+    jsonable_encoder pass, so it is meant for payloads the node built itself.
+    The route's response_model still documents the shape in OpenAPI.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps_json(content)
+
+
+@lru_cache(maxsize=None)
+def _model_keys(model: Type[BaseModel]) -> Tuple[Tuple[str, str, Any], ...]:
+    return tuple(
+        (name, field.alias or name, field.get_default(call_default_factory=True))
+        for name, field in model.model_fields.items()
+    )
+
+
+def model_payload(model: Type[BaseModel], data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Shape a trusted payload like ``model(**data).model_dump(by_alias=True)``.
+
+    Keeps only the model's fields, under their aliases, and fills in defaults,
+    without validating or copying the values.
+    """
+    payload = {}
+    for name, alias, default in _model_keys(model):
+        if alias in data:
+            payload[alias] = data[alias]
+        elif name in data:
+            payload[alias] = data[name]
+        else:
+            payload[alias] = default
+    return payload
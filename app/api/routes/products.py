@@ -1,4 +1,7 @@
-from fastapi import APIRouter, HTTPException, status, Depends, Path
+from fastapi import APIRouter, HTTPException, Query, status, Depends, Path
+from app.api.responses import FastJSONResponse, model_payload
+from app.core.config import settings
+from app.core.tracing import request_trace, trace_stage
 from app.services.product_service import ProductService
 from app.schemas.product import ProductByUrnResponse
 from app.db.base import get_db_session
@@ -63,6 +66,10 @@ async def get_product_by_urn(
         min_length=1,
         max_length=500,
     ),
+    debug: bool = Query(
+        default=False,
+        description="Add a `cmp:debug` section with timings and executed SQL (requires SEARCH_DEBUG_ENABLED)",
+    ),
     db: Session = Depends(get_db_session),
 ) -> ProductByUrnResponse:
     """
@@ -84,48 +91,61 @@ async def get_product_by_urn(
     The URN should be URL-encoded if it contains special characters.
 
     - **urn**: The URN to search for (e.g., "urn:cmp:sku:12345-abcde" or "urn:cmp:product:product-group-name")
+    - **debug**: Return the timing breakdown, executed SQL and row counts in `cmp:debug`
 
     Returns the data in schema.org ItemList format with proper JSON-LD context.
+    Every response carries a `Server-Timing` header with the time spent per stage.
     """
-    try:
-        # URL decode the URN in case it was encoded
-        decoded_urn = urllib.parse.unquote(urn)
+    with request_trace(debug=debug) as trace:
+        try:
+            if debug and not settings.SEARCH_DEBUG_ENABLED:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Search debug output is disabled",
+                )
+
+            # URL decode the URN in case it was encoded
+            decoded_urn = urllib.parse.unquote(urn)
         
-        # Basic URN validation
-        if not decoded_urn or not decoded_urn.strip():
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="URN cannot be empty",
-            )
-
-        # Validate URN format (basic check)
-        if not decoded_urn.startswith("urn:"):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Invalid URN format - must start with 'urn:'",
-            )
-
-        product_service = ProductService(db)
-        product_details = product_service.get_product_with_details_by_urn(decoded_urn)
-
-        if not product_details:
+            # Basic URN validation
+            if not decoded_urn or not decoded_urn.strip():
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="URN cannot be empty",
+                )
+
+            # Validate URN format (basic check)
+            if not decoded_urn.startswith("urn:"):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Invalid URN format - must start with 'urn:'",
+                )
+
+            product_service = ProductService(db)
+            product_details = product_service.get_product_with_details_by_urn(decoded_urn)
+
+            if not product_details:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Product not found",
+                )
+
+            with trace_stage("serialization"):
+                response_data = format_product_by_urn_response(product_details)
+                # The payload is built by the formatter, so skip re-validating it
+                payload = model_payload(ProductByUrnResponse, response_data)
+                if debug:
+                    payload["cmp:debug"] = trace.to_dict()
+                product_response = FastJSONResponse(payload)
+
+            product_response.headers["Server-Timing"] = trace.server_timing()
+            return product_response
+
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"Error retrieving product by URN {urn}: {str(e)}")
             raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Product not found",
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Product service error",
             )
-
-        response_data = format_product_by_urn_response(product_details)
-
-        # Create the ProductByUrnResponse object
-        response = ProductByUrnResponse(**response_data)
-
-        return response
-
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error retrieving product by URN {urn}: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Product service error",
-        )
\ No newline at end of file
@@ -1,10 +1,32 @@
-from fastapi import APIRouter, HTTPException, Query, status, Depends, Path
-from app.services.search import SearchServiceFactory
+from contextlib import aclosing
+from functools import partial
+from fastapi import APIRouter, HTTPException, Query, Request, status, Depends, Path
+from fastapi.responses import StreamingResponse
+from app.api.responses import FastJSONResponse, dumps_json, model_payload
+from app.core.config import settings
+from app.core.metrics import metrics_endpoint, time_search_stage
+from app.core.tracing import request_trace
+from app.services.search import SearchServiceFactory, SearchFilters
+from app.services.search.batch import search_batch
+from app.services.search.executor import run_in_search_executor
+from app.services.search.pagination import (
+    BatchQuery,
+    InvalidCursorError,
+    check_cursor,
+    search_page,
+)
+from app.services.search.streaming import SearchStream
+from app.services.search.result_cache import get_search_result_cache
 from app.services.product_service import ProductService
-from app.schemas.product import ProductSearchResponse, ProductByUrnResponse
-from app.db.base import get_db_session
+from app.schemas.product import (
+    BatchSearchRequest,
+    BatchSearchResponse,
+    ProductSearchResponse,
+    ProductByUrnResponse,
+)
+from app.db.base import SessionLocal, get_db_session
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from app.utils.formatters import format_product_search_response, format_product_by_urn_response
 import logging
 import urllib.parse
@@ -57,6 +79,32 @@ async def get_products(
         max_length=500,
         example="wireless headphones",
     ),
+    price_min: Optional[float] = Query(
+        default=None, ge=0, description="Only products with an offer at or above this price"
+    ),
+    price_max: Optional[float] = Query(
+        default=None, ge=0, description="Only products with an offer at or below this price"
+    ),
+    brand: Optional[str] = Query(default=None, description="Brand name", example="Acme"),
+    category: Optional[str] = Query(default=None, description="Category name"),
+    availability: Optional[str] = Query(
+        default=None, description="Offer availability", example="InStock"
+    ),
+    organization_urn: Optional[str] = Query(
+        default=None, description="Only products from this organization (URN)"
+    ),
+    limit: int = Query(default=20, ge=1, le=100, description="Number of results per page"),
+    cursor: Optional[str] = Query(
+        default=None, description="`cmp:nextCursor` from the previous page"
+    ),
+    collapse_variants: bool = Query(
+        default=False,
+        description="Return one product per product group, with `cmp:variantCount`",
+    ),
+    debug: bool = Query(
+        default=False,
+        description="Add a `cmp:debug` section with stage timings and executed SQL (requires SEARCH_DEBUG_ENABLED)",
+    ),
     db: Session = Depends(get_db_session),
 ) -> ProductSearchResponse:
     """
@@ -65,32 +113,366 @@ async def get_products(
     The search uses hybrid search combining dense and sparse vectors for optimal results.
 
     - **q**: The search query (e.g., "gaming laptop", "wireless earbuds", "running shoes")
+    - **price_min** / **price_max**: Price range; both must be met by the same offer
+    - **brand**, **category**: Exact brand or category name
+    - **availability**: Offer availability (e.g., "InStock"); combined with the price range per offer
+    - **organization_urn**: Restrict results to one organization
+    - **limit**: Results per page (1-100)
+    - **cursor**: Pass `cmp:nextCursor` from the previous response to get the next page
+    - **collapse_variants**: Return only the best matching variant of each product
+      group, with `cmp:variantCount` and `isVariantOf`; keep it set when paging
+    - **debug**: Return the timing breakdown, executed SQL and row counts in `cmp:debug`;
+      debug requests bypass the result cache
+
+    Filters are applied inside the vector query, so `limit` always counts matching products.
+    Later pages are served from the ranking computed for the first page; cursors are
+    tied to the query and filters they were issued for.
+
+    Every response carries a `Server-Timing` header with the time spent per stage.
 
     Returns a list of products sorted by relevance score.
     """
-    try:
-        if not q or not q.strip():
+    with (
+        request_trace(debug=debug) as trace,
+        metrics_endpoint("rest"),
+        time_search_stage("total"),
+    ):
+        try:
+            if debug and not settings.SEARCH_DEBUG_ENABLED:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Search debug output is disabled",
+                )
+
+            if not q or not q.strip():
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Search query cannot be empty",
+                )
+
+            if price_min is not None and price_max is not None and price_min > price_max:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="price_min cannot be greater than price_max",
+                )
+
+            filters = SearchFilters(
+                price_min=price_min,
+                price_max=price_max,
+                brand=brand,
+                category=category,
+                availability=availability,
+                organization_urn=organization_urn,
+            )
+
+            headers = {}
+            cache = None if debug else get_search_result_cache()
+            cache_key = None
+            if cache:
+                # Key generation and lookup may call Redis, so keep them off the event loop
+                cache_key, cached = await run_in_search_executor(
+                    cache.lookup,
+                    q,
+                    limit,
+                    filters,
+                    cursor=cursor,
+                    collapse_variants=collapse_variants,
+                )
+                if cached is not None:
+                    headers["X-Search-Cache"] = "hit"
+                    headers["Server-Timing"] = trace.server_timing()
+                    return FastJSONResponse(
+                        model_payload(ProductSearchResponse, cached), headers=headers
+                    )
+
+            search_service = SearchServiceFactory.create(db, collapse_variants=collapse_variants)
+            try:
+                page = await search_page(search_service, q, limit, cursor=cursor, filters=filters)
+            except InvalidCursorError as e:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+            degraded = search_service.degraded_retrievers
+            if degraded:
+                headers["X-Search-Degraded"] = ",".join(degraded)
+
+            # Degraded results are not cached so a recovered retriever is used right away
+            cacheable = cache_key and not degraded
+            if cacheable:
+                headers["X-Search-Cache"] = "miss"
+
+            with time_search_stage("formatting"):
+                response_data = format_product_search_response(
+                    page.results,
+                    degraded=bool(degraded),
+                    next_cursor=page.next_cursor,
+                    offset=page.offset,
+                )
+                # The payload is built by the formatter, so skip re-validating it
+                payload = model_payload(ProductSearchResponse, response_data)
+                if debug:
+                    payload["cmp:debug"] = trace.to_dict()
+                search_response = FastJSONResponse(payload, headers=headers)
+
+            if cacheable:
+                await run_in_search_executor(cache.set, cache_key, response_data)
+            search_response.headers["Server-Timing"] = trace.server_timing()
+            return search_response
+
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"Error during product search: {str(e)}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Search service error",
+            )
+
+
+@search_router.post(
+    "/search:batch",
+    response_model=BatchSearchResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Run several product searches at once",
+    description="Answer up to SEARCH_BATCH_MAX_QUERIES searches in one request. Returns one ItemList per query, in request order.",
+    response_description="Search results for each query",
+    responses={
+        400: {
+            "description": "Invalid batch",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "At most 20 queries per batch"}
+                }
+            },
+        },
+        500: {
+            "description": "Internal server error",
+            "content": {
+                "application/json": {"example": {"detail": "Search service error"}}
+            },
+        },
+    },
+)
+async def batch_search_products(
+    request: BatchSearchRequest,
+    db: Session = Depends(get_db_session),
+) -> BatchSearchResponse:
+    """
+    Run several product searches in one request.
+
+    All queries are embedded in one provider call and ranked together, and the
+    products returned for any query are loaded with a single lookup, so related
+    sub-queries (e.g. one per category) cost about as much as one search.
+
+    Each query takes the same filters as `GET /v1/search`. Every result list is
+    the first page of its query; pass its `cmp:nextCursor` to `GET /v1/search`
+    with the same query and filters to continue.
+    """
+    with (
+        request_trace() as trace,
+        metrics_endpoint("rest_batch"),
+        time_search_stage("total"),
+    ):
+        try:
+            if len(request.queries) > settings.SEARCH_BATCH_MAX_QUERIES:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"At most {settings.SEARCH_BATCH_MAX_QUERIES} queries per batch",
+                )
+
+            queries = []
+            for i, query in enumerate(request.queries):
+                if not query.q.strip():
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail=f"Query {i}: search query cannot be empty",
+                    )
+                if (
+                    query.price_min is not None
+                    and query.price_max is not None
+                    and query.price_min > query.price_max
+                ):
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail=f"Query {i}: price_min cannot be greater than price_max",
+                    )
+                queries.append(
+                    BatchQuery(
+                        query=query.q,
+                        limit=query.limit,
+                        filters=SearchFilters(
+                            price_min=query.price_min,
+                            price_max=query.price_max,
+                            brand=query.brand,
+                            category=query.category,
+                            availability=query.availability,
+                            organization_urn=query.organization_urn,
+                        ),
+                    )
+                )
+
+            responses, degraded = await search_batch(
+                queries,
+                lambda: SearchServiceFactory.create(
+                    db, collapse_variants=request.collapse_variants
+                ),
+                collapse_variants=request.collapse_variants,
+            )
+
+            headers = {}
+            if degraded:
+                headers["X-Search-Degraded"] = ",".join(degraded)
+            # search_batch already timed formatting, this is only the JSON render
+            with time_search_stage("serialization"):
+                # The payloads are built by the formatter, so skip re-validating them
+                batch_response = FastJSONResponse(
+                    {
+                        "results": [
+                            model_payload(ProductSearchResponse, data) for data in responses
+                        ]
+                    },
+                    headers=headers,
+                )
+
+            batch_response.headers["Server-Timing"] = trace.server_timing()
+            return batch_response
+
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"Error during batch product search: {str(e)}")
             raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Search query cannot be empty",
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Search service error",
             )
 
-        search_service = SearchServiceFactory.create(db)
-        results = search_service.search_products(q)
 
-        response_data = format_product_search_response(results)
+def _ndjson_event(event: str, data: dict) -> bytes:
+    return dumps_json({"event": event, **data}) + b"\n"
 
-        # Create the ProductSearchResponse object
-        response = ProductSearchResponse(**response_data)
 
+def _sse_event(event: str, data: dict) -> bytes:
+    return b"event: " + event.encode("ascii") + b"\ndata: " + dumps_json(data) + b"\n\n"
 
-        return response
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error during product search: {str(e)}")
+@search_router.get(
+    "/search:stream",
+    status_code=status.HTTP_200_OK,
+    summary="Stream product search results",
+    description="Same search as GET /v1/search, streamed as NDJSON (default) or Server-Sent Events (Accept: text/event-stream): ranked candidates first, then enriched ListItems in batches.",
+    response_description="Stream of search events",
+    responses={
+        200: {
+            "description": "Stream of candidates, items and done events",
+            "content": {"application/x-ndjson": {}, "text/event-stream": {}},
+        },
+        400: {
+            "description": "Invalid search query or cursor",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "Search query cannot be empty"}
+                }
+            },
+        },
+    },
+)
+async def stream_products(
+    request: Request,
+    q: str = Query(
+        ...,
+        description="Search query for finding products",
+        min_length=1,
+        max_length=500,
+        example="wireless headphones",
+    ),
+    price_min: Optional[float] = Query(
+        default=None, ge=0, description="Only products with an offer at or above this price"
+    ),
+    price_max: Optional[float] = Query(
+        default=None, ge=0, description="Only products with an offer at or below this price"
+    ),
+    brand: Optional[str] = Query(default=None, description="Brand name", example="Acme"),
+    category: Optional[str] = Query(default=None, description="Category name"),
+    availability: Optional[str] = Query(
+        default=None, description="Offer availability", example="InStock"
+    ),
+    organization_urn: Optional[str] = Query(
+        default=None, description="Only products from this organization (URN)"
+    ),
+    limit: int = Query(default=20, ge=1, le=100, description="Number of results per page"),
+    cursor: Optional[str] = Query(
+        default=None, description="`cmp:nextCursor` from a previous page"
+    ),
+    collapse_variants: bool = Query(
+        default=False,
+        description="Return one product per product group, with `cmp:variantCount`",
+    ),
+) -> StreamingResponse:
+    """
+    Stream one page of search results as they become available.
+
+    Takes the same parameters as `GET /v1/search`. Events, in order:
+
+    - **candidates**: ranked `@id`s with `cmp:searchScore`, `cmp:degraded` and
+      `cmp:nextCursor`, sent as soon as retrieval finishes
+    - **items**: enriched Product ListItems, one event per enrichment batch
+    - **done**: end of the page; **error** replaces the remaining events on failure
+
+    Each NDJSON line is one event object with an `event` field. The search stops
+    and releases its database connection when the client disconnects. Streamed
+    searches do not use the search result cache.
+    """
+    if not q.strip():
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Search service error",
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Search query cannot be empty",
         )
+    if price_min is not None and price_max is not None and price_min > price_max:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="price_min cannot be greater than price_max",
+        )
+
+    filters = SearchFilters(
+        price_min=price_min,
+        price_max=price_max,
+        brand=brand,
+        category=category,
+        availability=availability,
+        organization_urn=organization_urn,
+    )
+    if cursor:
+        # Checked up front, once streaming starts the status can no longer change
+        try:
+            check_cursor(cursor, q, filters, collapse_variants)
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    sse = "text/event-stream" in request.headers.get("accept", "")
+    encode = _sse_event if sse else _ndjson_event
+    stream = SearchStream(
+        q,
+        limit,
+        SessionLocal,
+        partial(SearchServiceFactory.create, collapse_variants=collapse_variants),
+        cursor=cursor,
+        filters=filters,
+    )
+
+    async def body():
+        with metrics_endpoint("rest_stream"), time_search_stage("total"):
+            try:
+                async with aclosing(stream.events()) as events:
+                    async for event, data in events:
+                        if await request.is_disconnected():
+                            logger.info("Client disconnected, stopping search stream")
+                            return
+                        yield encode(event, data)
+            except Exception as e:
+                logger.error(f"Error during streamed product search: {str(e)}")
+                yield encode("error", {"detail": "Search service error"})
+
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream" if sse else "application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
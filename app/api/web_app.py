@@ -16,6 +16,7 @@ from sqlalchemy import text
 # Local imports
 from app.core.config import settings
 from app.core.logging import get_logger
+from app.api.access_log import AccessLogMiddleware
 import app.api as api
 
 
@@ -41,11 +42,26 @@ async def lifespan(app: FastAPI):
         logger.error(f"❌ Database connection failed: {e}")
         raise
 
+    from app.db.base import SessionLocal
+    from app.services.search.pgvector_search import check_quantized_index
+
+    session = SessionLocal()
+    try:
+        check_quantized_index(session)
+    finally:
+        session.close()
+
     yield  # This is where FastAPI serves the application
 
     # Shutdown
     logger.info("🛑 Openfeed API shutting down...")
 
+    from app.embeddings.factory import close_embedding_provider
+    from app.services.search.executor import shutdown_search_executor
+
+    await close_embedding_provider()
+    shutdown_search_executor()
+
 
 def create_app() -> FastAPI:
     """Create and configure FastAPI application"""
@@ -77,103 +93,107 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
-    # Add detailed request/response logging middleware
-    @app.middleware("http")
-    async def log_requests(request: Request, call_next):
-        request_id = str(uuid.uuid4())
-        print(f"[{request_id}] Incoming request: {request.method} {request.url}")
-        logger.info(f"[{request_id}] {'='*60}")
-        logger.info(f"[{request_id}] REQUEST START")
-        logger.info(f"[{request_id}] Method: {request.method}")
-        logger.info(f"[{request_id}] URL: {request.url}")
-
-        # Log headers (filter sensitive ones in production)
-        headers = dict(request.headers)
-        # Remove sensitive headers in non-debug mode
-        sensitive_headers = ["authorization", "cookie", "x-api-key"]
-        for header in sensitive_headers:
-            if header in headers:
-                headers[header] = "[REDACTED]"
-        logger.info(f"[{request_id}] Headers: {headers}")
-        logger.info(f"[{request_id}] Query Params: {dict(request.query_params)}")
-
-        # Log request body for POST/PUT/PATCH requests
-        if request.method in ["POST", "PUT", "PATCH"]:
-            try:
-                body = await request.body()
-                if body:
-                    # Try to decode as JSON for better readability
-                    try:
-                        import json
-
-                        body_json = json.loads(body.decode())
-                        logger.info(
-                            f"[{request_id}] Request Body: {json.dumps(body_json, indent=2)}"
-                        )
-                    except:
-                        logger.info(f"[{request_id}] Request Body: {body.decode()}")
-                else:
-                    logger.info(f"[{request_id}] Request Body: (empty)")
+    # Request logging: "access" writes one sampled line per request, "verbose"
+    # dumps headers and bodies of every request and is meant for development
+    if settings.API_LOG_MODE == "access":
+        app.add_middleware(AccessLogMiddleware)
+    else:
+        @app.middleware("http")
+        async def log_requests(request: Request, call_next):
+            request_id = str(uuid.uuid4())
+            print(f"[{request_id}] Incoming request: {request.method} {request.url}")
+            logger.info(f"[{request_id}] {'='*60}")
+            logger.info(f"[{request_id}] REQUEST START")
+            logger.info(f"[{request_id}] Method: {request.method}")
+            logger.info(f"[{request_id}] URL: {request.url}")
+
+            # Log headers (filter sensitive ones in production)
+            headers = dict(request.headers)
+            # Remove sensitive headers in non-debug mode
+            sensitive_headers = ["authorization", "cookie", "x-api-key"]
+            for header in sensitive_headers:
+                if header in headers:
+                    headers[header] = "[REDACTED]"
+            logger.info(f"[{request_id}] Headers: {headers}")
+            logger.info(f"[{request_id}] Query Params: {dict(request.query_params)}")
+
+            # Log request body for POST/PUT/PATCH requests
+            if request.method in ["POST", "PUT", "PATCH"]:
+                try:
+                    body = await request.body()
+                    if body:
+                        # Try to decode as JSON for better readability
+                        try:
+                            import json
+
+                            body_json = json.loads(body.decode())
+                            logger.info(
+                                f"[{request_id}] Request Body: {json.dumps(body_json, indent=2)}"
+                            )
+                        except:
+                            logger.info(f"[{request_id}] Request Body: {body.decode()}")
+                    else:
+                        logger.info(f"[{request_id}] Request Body: (empty)")
 
-                # Recreate the request body since we consumed it
-                from starlette.requests import Request as StarletteRequest
+                    # Recreate the request body since we consumed it
+                    from starlette.requests import Request as StarletteRequest
 
-                request._body = body
-            except Exception as e:
-                logger.warning(f"[{request_id}] Could not read request body: {e}")
+                    request._body = body
+                except Exception as e:
+                    logger.warning(f"[{request_id}] Could not read request body: {e}")
 
-        start_time = time.time()
+            start_time = time.time()
 
-        try:
-            response = await call_next(request)
-            process_time = time.time() - start_time
+            try:
+                response = await call_next(request)
+                process_time = time.time() - start_time
 
-            # Log response details
+                # Log response details
 
-            logger.info(f"[{request_id}] RESPONSE")
-            logger.info(f"[{request_id}] Status Code: {response.status_code}")
-            logger.info(f"[{request_id}] Response Headers: {dict(response.headers)}")
-            logger.info(f"[{request_id}] Process Time: {process_time:.4f}s")
+                logger.info(f"[{request_id}] RESPONSE")
+                logger.info(f"[{request_id}] Status Code: {response.status_code}")
+                logger.info(f"[{request_id}] Response Headers: {dict(response.headers)}")
+                logger.info(f"[{request_id}] Process Time: {process_time:.4f}s")
 
-            # Log response body for error status codes or in debug mode
-            if response.status_code >= 400:
-                try:
-                    # For streaming responses, we can't easily read the body
-                    if hasattr(response, "body"):
-                        response_body = response.body
-                        if response_body:
-                            try:
-                                import json
-
-                                body_json = json.loads(response_body.decode())
-                                logger.info(
-                                    f"[{request_id}] Response Body: {json.dumps(body_json, indent=2)}"
-                                )
-                            except:
-                                logger.info(
-                                    f"[{request_id}] Response Body: {response_body.decode()}"
-                                )
+                # Log response body for error status codes or in debug mode
+                if response.status_code >= 400:
+                    try:
+                        # For streaming responses, we can't easily read the body
+                        if hasattr(response, "body"):
+                            response_body = response.body
+                            if response_body:
+                                try:
+                                    import json
+
+                                    body_json = json.loads(response_body.decode())
+                                    logger.info(
+                                        f"[{request_id}] Response Body: {json.dumps(body_json, indent=2)}"
+                                    )
+                                except:
+                                    logger.info(
+                                        f"[{request_id}] Response Body: {response_body.decode()}"
+                                    )
+                            else:
+                                logger.info(f"[{request_id}] Response Body: (empty)")
                         else:
-                            logger.info(f"[{request_id}] Response Body: (empty)")
-                    else:
-                        logger.info(
-                            f"[{request_id}] Response Body: (streaming response)"
-                        )
-                except Exception as e:
-                    logger.warning(f"[{request_id}] Could not read response body: {e}")
+                            logger.info(
+                                f"[{request_id}] Response Body: (streaming response)"
+                            )
+                    except Exception as e:
+                        logger.warning(f"[{request_id}] Could not read response body: {e}")
 
-            logger.info(f"[{request_id}] REQUEST END")
-            logger.info(f"[{request_id}] {'='*60}")
+                logger.info(f"[{request_id}] REQUEST END")
+                logger.info(f"[{request_id}] {'='*60}")
 
-            return response
-        except Exception as e:
-            process_time = time.time() - start_time
-            logger.error(
-                f"[{request_id}] Request failed after {process_time:.4f}s: {str(e)}",
-                exc_info=True,
-            )
-            logger.info(f"[{request_id}] REQUEST END (ERROR)")
-            logger.info(f"[{request_id}] {'='*60}")
+                return response
+            except Exception as e:
+                process_time = time.time() - start_time
+                logger.error(
+                    f"[{request_id}] Request failed after {process_time:.4f}s: {str(e)}",
+                    exc_info=True,
+                )
+                logger.info(f"[{request_id}] REQUEST END (ERROR)")
+                logger.info(f"[{request_id}] {'='*60}")
 
     # Add request timing middleware
     @app.middleware("http")
@@ -185,14 +205,29 @@ def create_app() -> FastAPI:
         return response
 
     # Health check endpoint
+    # A plain def, so FastAPI runs it in its thread pool: reading the stats
+    # snapshot may block on Redis or the database
     @app.get("/health")
-    async def health_check():
+    def health_check():
         """Health check endpoint for load balancers and monitoring"""
+        from app.services.index_stats_service import get_index_stats
+
         return {
             "status": "healthy",
             "timestamp": datetime.now(timezone.utc).isoformat(),
+            "index": get_index_stats(),
         }
 
+    if settings.METRICS_ENABLED:
+
+        @app.get("/metrics", include_in_schema=False)
+        async def metrics():
+            """Search and ingestion metrics in Prometheus text format"""
+            from fastapi.responses import Response
+            from app.core.metrics import CONTENT_TYPE_LATEST, render_metrics
+
+            return Response(content=render_metrics(), media_type=CONTENT_TYPE_LATEST)
+
     # OpenAPI specification endpoints
     @app.get("/openapi.yaml")
     async def get_openapi_yaml():
@@ -22,6 +22,8 @@ class Settings(BaseSettings):
     FEED_CHECK_INTERVAL: int = int(os.getenv("FEED_CHECK_INTERVAL", "300"))
     EMBEDDING_UPDATE_INTERVAL: int = int(os.getenv("EMBEDDING_UPDATE_INTERVAL", "3600"))
     CLEANUP_INTERVAL: int = int(os.getenv("CLEANUP_INTERVAL", "3600"))
+    INDEX_STATS_REFRESH_INTERVAL: int = int(os.getenv("INDEX_STATS_REFRESH_INTERVAL", "300"))
+    INDEX_STATS_MAX_AGE: int = int(os.getenv("INDEX_STATS_MAX_AGE", "900"))  # seconds before a snapshot is reported stale
     DATA_DIR: str = os.getenv(
         "DATA_DIR", "/tmp/discovery-node/"
     )
@@ -35,6 +37,11 @@ class Settings(BaseSettings):
     # Other settings
     DEBUG: bool = os.getenv("DEBUG", "true").lower() == "true"
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "info")
+    API_LOG_MODE: str = os.getenv("API_LOG_MODE", "verbose")  # verbose (full request dumps) or access (one line per request)
+    API_ACCESS_LOG_SAMPLE_RATE: float = float(os.getenv("API_ACCESS_LOG_SAMPLE_RATE", "1.0"))  # share of successful requests logged
+    API_SLOW_REQUEST_MS: float = float(os.getenv("API_SLOW_REQUEST_MS", "1000"))  # slower requests are always logged
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "true").lower() == "true"  # serve Prometheus metrics at /metrics
+    METRICS_WORKER_PORT: int = int(os.getenv("METRICS_WORKER_PORT", "0"))  # port for the Celery worker's metrics, 0 disables
     PINECONE_BATCH_SIZE: int = int(os.getenv("PINECONE_BATCH_SIZE", "96"))
     PINECONE_API_KEY: str = os.getenv("PINECONE_API_KEY")
     PINECONE_ENVIRONMENT: str = os.getenv("PINECONE_ENVIRONMENT", "dev01")
@@ -47,20 +54,98 @@ class Settings(BaseSettings):
         "PINECONE_SPARSE_INDEX", "dev01-cmp-discovery-sparse"
     )
     PINECONE_NAMESPACE: str = os.getenv("PINECONE_NAMESPACE", "__default__")
+    PINECONE_DENSE_TIMEOUT: float = float(os.getenv("PINECONE_DENSE_TIMEOUT", "2.0"))  # seconds
+    PINECONE_SPARSE_TIMEOUT: float = float(os.getenv("PINECONE_SPARSE_TIMEOUT", "2.0"))  # seconds
     MCP_REDIS_URL: str = os.getenv("MCP_REDIS_URL", "redis://localhost:6379/1")
     
 
     # Vector provider settings
-    VECTOR_PROVIDER: str = os.getenv("VECTOR_PROVIDER", "pgvector")  # pgvector (default) or pinecone
+    VECTOR_PROVIDER: str = os.getenv("VECTOR_PROVIDER", "pgvector")  # pgvector (default), pinecone or local
+    SEARCH_MAX_CONCURRENCY: int = int(
+        os.getenv("SEARCH_MAX_CONCURRENCY", os.getenv("DB_MAX_CONNECTIONS", "20"))
+    )  # worker threads for blocking search I/O, sized to the DB pool by default
+    SEARCH_RETRIEVER_CONCURRENCY: int = int(
+        os.getenv("SEARCH_RETRIEVER_CONCURRENCY", "40")
+    )  # worker threads for concurrent retriever calls (dense/sparse fan-out)
+    SEARCH_CANDIDATE_POOL: int = int(os.getenv("SEARCH_CANDIDATE_POOL", "100"))  # ranked candidates kept for pagination
+    SEARCH_COLLAPSE_FETCH_FACTOR: int = int(
+        os.getenv("SEARCH_COLLAPSE_FETCH_FACTOR", "4")
+    )  # products ranked per requested group when collapsing variants
+    SEARCH_CURSOR_CACHE_SIZE: int = int(os.getenv("SEARCH_CURSOR_CACHE_SIZE", "1000"))
+    SEARCH_CURSOR_TTL: int = int(os.getenv("SEARCH_CURSOR_TTL", "900"))  # seconds a cursor's ranking is kept
+    SEARCH_RRF_K: int = int(os.getenv("SEARCH_RRF_K", "60"))  # Reciprocal Rank Fusion constant for hybrid retrievers
+    SEARCH_BATCH_MAX_QUERIES: int = int(os.getenv("SEARCH_BATCH_MAX_QUERIES", "20"))  # queries accepted per batch search
+    SEARCH_STREAM_BATCH_SIZE: int = int(os.getenv("SEARCH_STREAM_BATCH_SIZE", "5"))  # products enriched per streamed batch
+    SEARCH_DEBUG_ENABLED: bool = (
+        os.getenv("SEARCH_DEBUG_ENABLED", "false").lower() == "true"
+    )  # allow ?debug=true to return timings and executed SQL in the response body
+    
+    # Local (in-process NumPy) vector settings
+    LOCAL_VECTOR_DIR: str = os.getenv("LOCAL_VECTOR_DIR", "data/vectors")
+    LOCAL_VECTOR_INDEX: str = os.getenv("LOCAL_VECTOR_INDEX", "products")
+    LOCAL_VECTOR_DTYPE: str = os.getenv("LOCAL_VECTOR_DTYPE", "float32")  # float32 or float16
+    LOCAL_VECTOR_BLOCK_SIZE: int = int(os.getenv("LOCAL_VECTOR_BLOCK_SIZE", "65536"))  # rows scored per matmul
+    LOCAL_VECTOR_COMPACT_RATIO: float = float(
+        os.getenv("LOCAL_VECTOR_COMPACT_RATIO", "0.2")
+    )  # compact once this fraction of rows are tombstones
     
     # PgVector settings
     PGVECTOR_EMBEDDING_SERVICE_URL: str = os.getenv("PGVECTOR_EMBEDDING_SERVICE_URL", "")
+    PGVECTOR_HYBRID_SEARCH: bool = (
+        os.getenv("PGVECTOR_HYBRID_SEARCH", "false").lower() == "true"
+    )  # fuse full-text (search_tsv) matches with vector results; cmp:searchScore becomes an RRF score
+    PGVECTOR_QUANTIZATION: str = os.getenv("PGVECTOR_QUANTIZATION", "none")  # none, halfvec or binary ANN candidate pass
+    PGVECTOR_RERANK_FACTOR: int = int(
+        os.getenv("PGVECTOR_RERANK_FACTOR", "4")
+    )  # quantized candidates per result, re-ranked at full precision
+    PGVECTOR_PREFIX_SEARCH: bool = (
+        os.getenv("PGVECTOR_PREFIX_SEARCH", "false").lower() == "true"
+    )  # ANN candidate pass over the embedding prefix, re-ranked at full precision
+    PGVECTOR_ITERATIVE_SCAN: str = os.getenv("PGVECTOR_ITERATIVE_SCAN", "relaxed_order")  # relaxed_order, strict_order or off
+    PGVECTOR_EXACT_SCAN_THRESHOLD: int = int(
+        os.getenv("PGVECTOR_EXACT_SCAN_THRESHOLD", "2000")
+    )  # filters matching at most this many products use an exact scan, 0 disables
     
     # Embedding model settings for pgvector
-    EMBEDDING_MODEL_PROVIDER: str = os.getenv("EMBEDDING_MODEL_PROVIDER", "openai")  # openai, cohere, etc.
+    EMBEDDING_MODEL_PROVIDER: str = os.getenv("EMBEDDING_MODEL_PROVIDER", "openai")  # openai, service or local (testing only)
     EMBEDDING_MODEL_NAME: str = os.getenv("EMBEDDING_MODEL_NAME", "text-embedding-3-small")
     EMBEDDING_API_KEY: str = os.getenv("EMBEDDING_API_KEY", "")  # API key for embedding provider
     EMBEDDING_DIMENSION: int = int(os.getenv("EMBEDDING_DIMENSION", "1536"))  # 1536 for text-embedding-3-small
+    EMBEDDING_PREFIX_DIMENSION: int = int(
+        os.getenv("EMBEDDING_PREFIX_DIMENSION", "256")
+    )  # Matryoshka prefix stored in products.embedding_prefix, 0 disables; must match the column
+    EMBEDDING_TIMEOUT: float = float(os.getenv("EMBEDDING_TIMEOUT", "10"))  # seconds per request
+    EMBEDDING_MAX_RETRIES: int = int(os.getenv("EMBEDDING_MAX_RETRIES", "3"))
+    EMBEDDING_BATCH_SIZE: int = int(os.getenv("EMBEDDING_BATCH_SIZE", "100"))
+    EMBEDDING_POOL_SIZE: int = int(os.getenv("EMBEDDING_POOL_SIZE", "20"))  # pooled HTTP connections
+
+    # Cache settings
+    CACHE_REDIS_URL: str = os.getenv("CACHE_REDIS_URL", "")  # shared cache tier, disabled when empty
+    CACHE_REDIS_TIMEOUT: float = float(os.getenv("CACHE_REDIS_TIMEOUT", "0.1"))  # seconds
+    EMBEDDING_CACHE_ENABLED: bool = (
+        os.getenv("EMBEDDING_CACHE_ENABLED", "true").lower() == "true"
+    )
+    EMBEDDING_CACHE_SIZE: int = int(os.getenv("EMBEDDING_CACHE_SIZE", "10000"))
+    EMBEDDING_CACHE_TTL: int = int(os.getenv("EMBEDDING_CACHE_TTL", "86400"))  # seconds
+    SEARCH_CACHE_ENABLED: bool = (
+        os.getenv("SEARCH_CACHE_ENABLED", "true").lower() == "true"
+    )  # also requires CACHE_REDIS_URL
+    SEARCH_CACHE_SIZE: int = int(os.getenv("SEARCH_CACHE_SIZE", "5000"))
+    SEARCH_CACHE_TTL: int = int(os.getenv("SEARCH_CACHE_TTL", "3600"))  # seconds, bounds entries if invalidation is missed
+    SEARCH_SEMANTIC_CACHE_ENABLED: bool = (
+        os.getenv("SEARCH_SEMANTIC_CACHE_ENABLED", "false").lower() == "true"
+    )  # reuse rankings of near-duplicate queries (pgvector backend, dense search only)
+    SEARCH_SEMANTIC_CACHE_SIZE: int = int(os.getenv("SEARCH_SEMANTIC_CACHE_SIZE", "2048"))
+    SEARCH_SEMANTIC_CACHE_THRESHOLD: float = float(
+        os.getenv("SEARCH_SEMANTIC_CACHE_THRESHOLD", "0.95")
+    )  # minimum cosine similarity between query embeddings
+    SEARCH_RERANK_ENABLED: bool = (
+        os.getenv("SEARCH_RERANK_ENABLED", "false").lower() == "true"
+    )  # re-order fused candidates by offer features
+    SEARCH_RERANK_WEIGHTS: str = os.getenv(
+        "SEARCH_RERANK_WEIGHTS",
+        "score=1.0,in_stock=0.3,price_percentile=-0.15,delivery_days=-0.1,inventory=0.05,warranty=0.05",
+    )  # feature=weight pairs, features scaled to [0, 1] within the candidate set
     
 
     @property
@@ -1,7 +1,9 @@
 from contextlib import contextmanager
+from functools import partial
 from sqlalchemy.orm import Session
 from app.db.base import SessionLocal
 from app.services.search.factory import SearchServiceFactory as SearchFactory
+from app.services.search.streaming import SearchStream
 from app.services.product_service import ProductService
 from app.db.repositories.product_repository import ProductRepository
 from app.db.repositories.vector_repository import VectorRepository
@@ -22,15 +24,27 @@ def get_db_session():
 class SearchServiceFactory:
     """Factory for creating SearchService instances with fresh DB sessions"""
     
-    def create(self):
+    def create(self, collapse_variants: bool = False):
         """Create a new SearchService instance with a fresh DB session"""
         db_session = SessionLocal()
-        return SearchFactory.create(db_session)
+        return SearchFactory.create(db_session, collapse_variants=collapse_variants)
     
-    def create_with_cleanup(self):
+    def create_with_cleanup(self, collapse_variants: bool = False):
         """Create SearchService with automatic session cleanup"""
         with get_db_session() as db_session:
-            yield SearchFactory.create(db_session)
+            yield SearchFactory.create(db_session, collapse_variants=collapse_variants)
+
+    def create_stream(
+        self, query: str, limit: int, collapse_variants: bool = False, **kwargs
+    ) -> SearchStream:
+        """Create a SearchStream, which opens and closes its own DB session"""
+        return SearchStream(
+            query,
+            limit,
+            SessionLocal,
+            partial(SearchFactory.create, collapse_variants=collapse_variants),
+            **kwargs,
+        )
 
 class ProductServiceFactory:
     """Factory for creating ProductService instances with fresh DB sessions"""
@@ -16,7 +16,12 @@ def get_logger(name):
     """
     # Create logger
     logger = logging.getLogger(name)
-    logger.setLevel(logging.INFO)
+    if logger.handlers:
+        # Already configured by an earlier call
+        return logger
+    # Level from LOG_LEVEL; per-result DEBUG logs cost only a level check otherwise
+    level = getattr(logging, os.getenv("LOG_LEVEL", "info").upper(), logging.INFO)
+    logger.setLevel(level)
 
     # Create formatters
     file_formatter = logging.Formatter(
@@ -35,12 +40,12 @@ def get_logger(name):
         maxBytes=10 * 1024 * 1024,  # 10MB
         backupCount=5,
     )
-    file_handler.setLevel(logging.INFO)
+    file_handler.setLevel(level)
     file_handler.setFormatter(file_formatter)
 
     # Create and configure console handler
     console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(logging.INFO)
+    console_handler.setLevel(level)
     console_handler.setFormatter(console_formatter)
 
     # Add handlers to logger
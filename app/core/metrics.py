@@ -0,0 +1,129 @@
+import logging
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+    start_http_server,
+)
+
+from app.core.config import settings
+from app.core.tracing import record_stage
+
+logger = logging.getLogger(__name__)
+
+# Latency buckets in seconds, from a cache hit to a slow cold search
+DEFAULT_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+# Entry point of the request being served ("rest", "mcp:<tool>", ...), used as
+# the endpoint label. Context variables follow the request into the search
+# thread pools, which copy the caller's context.
+_endpoint: ContextVar[str] = ContextVar("metrics_endpoint", default="internal")
+
+SEARCH_STAGE_SECONDS = Histogram(
+    "cmp_search_stage_seconds",
+    "Time spent in each search stage (embedding, dense, sparse, retrieval, fusion, "
+    "enrichment, formatting, serialization, total)",
+    ("stage", "backend", "endpoint"),
+    buckets=DEFAULT_BUCKETS,
+)
+SEARCH_CACHE_REQUESTS = Counter(
+    "cmp_search_cache_requests_total",
+    "Search-path cache lookups by cache and result (hit or miss)",
+    ("cache", "result"),
+)
+EMBEDDING_FAILURES = Counter(
+    "cmp_embedding_failures_total",
+    "Query embedding requests that raised",
+    ("provider",),
+)
+SEARCH_FALLBACKS = Counter(
+    "cmp_search_fallbacks_total",
+    "Searches served by a fallback path (degraded retriever, expired cursor)",
+    ("backend", "reason"),
+)
+INGESTION_STAGE_SECONDS = Histogram(
+    "cmp_ingestion_stage_seconds",
+    "Time spent in each ingestion stage",
+    ("stage",),
+    buckets=(0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0, 3600.0),
+)
+INGESTION_ITEMS = Counter(
+    "cmp_ingestion_items_total",
+    "Items written by ingestion, by kind",
+    ("kind",),
+)
+
+
+def _collector_registry() -> CollectorRegistry:
+    """
+    Registry to expose: this process's metrics, or with PROMETHEUS_MULTIPROC_DIR
+    set those of every process writing to that directory (uvicorn or Celery
+    prefork workers). The variable must be set before the first import of
+    this module in each process.
+    """
+    if not os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def render_metrics() -> bytes:
+    """Current metrics in Prometheus text format"""
+    return generate_latest(_collector_registry())
+
+
+def start_metrics_server(port: int):
+    """
+    Serve /metrics from a background thread, for processes without an HTTP
+    app such as the Celery worker.
+    """
+    start_http_server(port, registry=_collector_registry())
+    logger.info(f"Serving Prometheus metrics on port {port}")
+
+
+def current_endpoint() -> str:
+    return _endpoint.get()
+
+
+@contextmanager
+def metrics_endpoint(endpoint: str) -> Iterator[None]:
+    """Label search metrics recorded inside the block with this endpoint"""
+    token = _endpoint.set(endpoint)
+    try:
+        yield
+    finally:
+        _endpoint.reset(token)
+
+
+@contextmanager
+def time_search_stage(stage: str, backend: Optional[str] = None) -> Iterator[None]:
+    """
+    Time one search stage for the current endpoint.
+
+    The duration is also added to the current request trace, which feeds the
+    Server-Timing header.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        SEARCH_STAGE_SECONDS.labels(
+            stage=stage,
+            backend=backend or settings.VECTOR_PROVIDER,
+            endpoint=_endpoint.get(),
+        ).observe(elapsed)
+        record_stage(stage, elapsed)
@@ -0,0 +1,132 @@
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+
+from sqlalchemy import event
+
+# Search stages as they are named in the Server-Timing header
+_SERVER_TIMING_NAMES = {
+    "retrieval": "ann",
+    "dense": "ann-dense",
+    "sparse": "ann-sparse",
+    "formatting": "serialization",
+}
+
+# Statements are cut to this many characters in debug output
+_MAX_STATEMENT_LENGTH = 2000
+
+_current_trace: ContextVar[Optional["RequestTrace"]] = ContextVar(
+    "request_trace", default=None
+)
+
+
+class RequestTrace:
+    """
+    Timing breakdown of one request.
+
+    Stages recorded several times (e.g. one SQL statement after another) are
+    summed. With ``debug`` the executed SQL statements and their row counts are
+    kept as well. Search work offloaded to thread pools records into the same
+    trace, so updates are locked.
+    """
+
+    def __init__(self, debug: bool = False):
+        self.debug = debug
+        self.start = time.perf_counter()
+        self.stages: Dict[str, float] = {}
+        self.queries: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def add(self, stage: str, seconds: float):
+        if stage == "total":
+            # The total is the trace's own elapsed time
+            return
+        name = _SERVER_TIMING_NAMES.get(stage, stage)
+        with self._lock:
+            self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def add_query(self, statement: str, rows: int, seconds: float):
+        self.add("db", seconds)
+        if self.debug:
+            with self._lock:
+                self.queries.append(
+                    {
+                        "sql": " ".join(statement.split())[:_MAX_STATEMENT_LENGTH],
+                        "rows": rows,
+                        "duration_ms": round(seconds * 1000, 3),
+                    }
+                )
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.start
+
+    def server_timing(self) -> str:
+        """Server-Timing header value, durations in milliseconds"""
+        with self._lock:
+            stages = list(self.stages.items())
+        parts = [f"{name};dur={seconds * 1000:.1f}" for name, seconds in stages]
+        parts.append(f"total;dur={self.elapsed() * 1000:.1f}")
+        return ", ".join(parts)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Breakdown for the debug section of a response body"""
+        with self._lock:
+            timings = {name: round(s * 1000, 3) for name, s in self.stages.items()}
+            queries = list(self.queries)
+        timings["total"] = round(self.elapsed() * 1000, 3)
+        return {"timingsMs": timings, "queries": queries}
+
+
+def current_trace() -> Optional[RequestTrace]:
+    return _current_trace.get()
+
+
+@contextmanager
+def request_trace(debug: bool = False) -> Iterator[RequestTrace]:
+    """Collect a timing breakdown for everything run inside the block"""
+    trace = RequestTrace(debug=debug)
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+
+
+def record_stage(stage: str, seconds: float):
+    """Add a stage duration to the current request's trace, if any"""
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.add(stage, seconds)
+
+
+@contextmanager
+def trace_stage(stage: str) -> Iterator[None]:
+    """Time the block as a stage of the current request's trace"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(stage, time.perf_counter() - start)
+
+
+# The start time lives on the statement's execution context, so a statement
+# that raises leaves nothing behind on the connection
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_trace.get() is not None and context is not None:
+        context._trace_query_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    trace = _current_trace.get()
+    start = getattr(context, "_trace_query_start", None)
+    if trace is None or start is None:
+        return
+    trace.add_query(statement, cursor.rowcount, time.perf_counter() - start)
+
+
+def install_sql_tracing(engine):
+    """Record the SQL run by an engine into the current request's trace"""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
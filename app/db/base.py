@@ -1,7 +1,22 @@
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy import create_engine
+from sqlalchemy.pool import QueuePool
 from app.core.config import settings
+from app.core.tracing import install_sql_tracing, trace_stage
+
+
+class TracedQueuePool(QueuePool):
+    """
+    Queue pool recording connection checkout time as the ``pool_wait`` stage
+    of the current request trace (waiting for a free connection, opening a
+    new one and the pre-ping).
+    """
+
+    def connect(self):
+        with trace_stage("pool_wait"):
+            return super().connect()
+
 
 # Create SQLAlchemy engine
 engine = create_engine(
@@ -10,7 +25,9 @@ engine = create_engine(
     max_overflow=settings.DB_MAX_CONNECTIONS - settings.DB_MIN_CONNECTIONS,
     echo=settings.DB_ECHO,
     pool_pre_ping=True,
+    poolclass=TracedQueuePool,
 )
+install_sql_tracing(engine)
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -5,6 +5,8 @@ from app.db.models.brand import Brand
 from app.db.models.product_group import ProductGroup
 from app.db.models.product import Product
 from app.db.models.offer import Offer
+from app.db.models.product_search_card import ProductSearchCard
+from app.db.models.index_stats_snapshot import IndexStatsSnapshot
 from app.db.models.associations import organization_category
 
 # Import other models as they are created
@@ -0,0 +1,22 @@
+# app/db/models/index_stats_snapshot.py
+from sqlalchemy import Column, String, func
+from sqlalchemy.dialects.postgresql import JSONB, TIMESTAMP
+from app.db.base import Base
+
+
+class IndexStatsSnapshot(Base):
+    """
+    Latest search index statistics, computed by the worker and read by the
+    API processes, which must never run the aggregation themselves.
+    """
+
+    __tablename__ = "index_stats_snapshots"
+
+    name = Column(String, primary_key=True, comment="Snapshot name, 'latest'")
+    snapshot = Column(JSONB, nullable=False, comment="Statistics as served by /health")
+    updated_at = Column(
+        TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+    def __repr__(self):
+        return f"<IndexStatsSnapshot(name='{self.name}')>"
@@ -1,7 +1,7 @@
 # app/db/models/product.py (update this file to add the Product model)
 from sqlalchemy import Column, String, Text, ForeignKey, UUID, Float, Integer, func
 from sqlalchemy.orm import relationship
-from sqlalchemy.dialects.postgresql import JSONB, TIMESTAMP
+from sqlalchemy.dialects.postgresql import JSONB, TIMESTAMP, TSVECTOR
 from pgvector.sqlalchemy import Vector
 from app.db.base import Base
 import uuid
@@ -50,12 +50,29 @@ class Product(Base):
         JSONB, default={}, comment="Attributes that differentiate this variant"
     )
     raw_data = Column(JSONB, comment="Full JSON-LD representation of the product")
+    media = Column(
+        JSONB,
+        default=[],
+        comment="Media objects extracted from raw_data at ingestion, falling back to the product group",
+    )
     
     # Vector embedding for similarity search
     embedding = Column(
         Vector(1536),  # text-embedding-3-small dimension (configurable)
         comment="Dense embedding vector for semantic search"
     )
+    embedding_prefix = Column(
+        Vector(256),  # EMBEDDING_PREFIX_DIMENSION
+        comment="Renormalized Matryoshka prefix of the embedding for the first search stage",
+    )
+    embedded_at = Column(
+        TIMESTAMP(timezone=True),
+        comment="When the embedding column was last written",
+    )
+    search_tsv = Column(
+        TSVECTOR,
+        comment="Full-text vector for lexical search, maintained by a database trigger",
+    )
 
     # Timestamps
     created_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
@@ -50,6 +50,9 @@ class ProductGroup(Base):
         nullable=False,
     )
     raw_data = Column(JSONB, comment="Full JSON-LD representation of the product group")
+    media = Column(
+        JSONB, default=[], comment="Media objects extracted from raw_data at ingestion"
+    )
 
     # Timestamps
     created_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
@@ -0,0 +1,36 @@
+# app/db/models/product_search_card.py
+from sqlalchemy import Column, String, Text, ForeignKey, UUID, func
+from sqlalchemy.dialects.postgresql import JSONB, TIMESTAMP
+from app.db.base import Base
+
+
+class ProductSearchCard(Base):
+    """
+    Denormalized projection of a product holding exactly what a search result
+    needs, so enrichment is a single indexed lookup. Maintained by
+    ProductSearchCardRepository.refresh during feed ingestion.
+    """
+
+    __tablename__ = "product_search_cards"
+
+    urn = Column(String, primary_key=True, comment="Product URN")
+    product_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("products.id", ondelete="CASCADE"),
+        nullable=False,
+        unique=True,
+    )
+    organization_id = Column(UUID(as_uuid=True), nullable=False, index=True)
+    name = Column(String, nullable=False)
+    description = Column(Text)
+    url = Column(String)
+    brand_name = Column(String)
+    category_name = Column(String)
+    media = Column(JSONB, nullable=False, server_default="[]", comment="JSON-LD media objects")
+    offers = Column(
+        JSONB, nullable=False, server_default="[]", comment="Offers, cheapest first"
+    )
+    updated_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
+
+    def __repr__(self):
+        return f"<ProductSearchCard(urn='{self.urn}', name='{self.name}')>"
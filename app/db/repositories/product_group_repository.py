@@ -177,6 +177,7 @@ class ProductGroupRepository:
                     'category_id': stmt.excluded.category_id,
                     'organization_id': stmt.excluded.organization_id,
                     'raw_data': stmt.excluded.raw_data,
+                    'media': stmt.excluded.media,
                     'updated_at': func.now(),
                 }
                 
@@ -239,6 +239,7 @@ class ProductRepository:
                 selectinload(Product.product_group),
                 selectinload(Product.category),
                 selectinload(Product.offers),
+                selectinload(Product.organization),
             )
             .filter(Product.organization_id == org_id)
             .order_by(Product.id)  # IMPORTANT: Consistent ordering for pagination
@@ -358,6 +359,7 @@ class ProductRepository:
                     'organization_id': stmt.excluded.organization_id,
                     'variant_attributes': stmt.excluded.variant_attributes,
                     'raw_data': stmt.excluded.raw_data,
+                    'media': stmt.excluded.media,
                     'updated_at': func.now(),
                 }
                 
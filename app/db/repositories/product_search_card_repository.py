@@ -0,0 +1,95 @@
+# app/db/repositories/product_search_card_repository.py
+from typing import List, Optional
+from uuid import UUID
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from app.db.models.product_search_card import ProductSearchCard
+
+# Offers of product ``p`` as stored on its card, cheapest first
+OFFERS_JSON_SQL = """
+        SELECT jsonb_agg(
+            jsonb_build_object(
+                'price', o.price,
+                'currency', o.price_currency,
+                'availability', o.availability,
+                'inventory_level', o.inventory_level,
+                'est_delivery_max_days', o.est_delivery_max_days,
+                'warranty_months', o.warranty_months,
+                'seller_id', o.seller_id
+            )
+            ORDER BY o.price
+        ) AS offers
+        FROM offers o
+        WHERE o.product_id = p.id"""
+
+# Upserts the cards of the products matching {where}; products without a
+# category (or brand) still get a card, with that name left null
+_REFRESH_SQL = """
+    INSERT INTO product_search_cards (
+        urn, product_id, organization_id, name, description, url,
+        brand_name, category_name, media, offers, updated_at
+    )
+    SELECT
+        p.urn,
+        p.id,
+        p.organization_id,
+        p.name,
+        p.description,
+        p.url,
+        b.name,
+        c.name,
+        coalesce(p.media, '[]'::jsonb),
+        coalesce(po.offers, '[]'::jsonb),
+        now()
+    FROM products p
+    LEFT JOIN brands b ON b.id = p.brand_id
+    LEFT JOIN categories c ON c.id = p.category_id
+    LEFT JOIN LATERAL ({offers}
+    ) po ON true
+    WHERE {where}
+    ON CONFLICT (urn) DO UPDATE SET
+        product_id = EXCLUDED.product_id,
+        organization_id = EXCLUDED.organization_id,
+        name = EXCLUDED.name,
+        description = EXCLUDED.description,
+        url = EXCLUDED.url,
+        brand_name = EXCLUDED.brand_name,
+        category_name = EXCLUDED.category_name,
+        media = EXCLUDED.media,
+        offers = EXCLUDED.offers,
+        updated_at = EXCLUDED.updated_at
+"""
+
+
+class ProductSearchCardRepository:
+    """Repository for the denormalized product search cards"""
+
+    def __init__(self, db_session: Session):
+        self.db_session = db_session
+
+    def refresh(self, product_ids: Optional[List[UUID]] = None) -> int:
+        """
+        Rebuild the cards of the given products (all products if None) from
+        products, brands, categories and offers in one statement.
+
+        Returns the number of cards written. Does not commit.
+        """
+        if product_ids is not None and not product_ids:
+            return 0
+
+        where = "TRUE" if product_ids is None else "p.id = ANY(CAST(:product_ids AS uuid[]))"
+        params = {} if product_ids is None else {"product_ids": [str(i) for i in product_ids]}
+        result = self.db_session.execute(
+            text(_REFRESH_SQL.format(offers=OFFERS_JSON_SQL, where=where)), params
+        )
+        return result.rowcount
+
+    def get_by_urns(self, urns: List[str]) -> List[ProductSearchCard]:
+        """Get the cards for the given product URNs"""
+        if not urns:
+            return []
+        return (
+            self.db_session.query(ProductSearchCard)
+            .filter(ProductSearchCard.urn.in_(urns))
+            .all()
+        )
@@ -2,6 +2,7 @@ import time
 import random
 import requests
 import logging
+from typing import Optional
 from pinecone import Pinecone, ServerlessSpec
 from app.core.config import settings
 
@@ -49,12 +50,20 @@ class VectorRepository:
         """Upsert products into Pinecone sparse index with rate limit handling, in batches"""
         self._batch_upsert(self.sparse_index, records)
 
+    def _build_query(self, query: str, top_k: int, filter: Optional[dict]) -> dict:
+        """Build an integrated-inference search query, with an optional metadata filter"""
+        search_query = {"top_k": top_k, "inputs": {"text": query}}
+        if filter:
+            search_query["filter"] = filter
+        return search_query
+
     def _search_products(
         self,
         query: str,
         top_k: int = 20,
         alpha: float = 0.7,
         include_metadata: bool = True,
+        filter: Optional[dict] = None,
     ):
         """Search for products using Pinecone's Inference API"""
         start_time = time.time()
@@ -63,7 +72,7 @@ class VectorRepository:
 
         try:
             results = self.dense_index.search(
-                namespace=self.namespace, query={"top_k": top_k, "inputs": {"text": query}}
+                namespace=self.namespace, query=self._build_query(query, top_k, filter)
             )
 
             query_time = time.time() - start_time
@@ -81,9 +90,10 @@ class VectorRepository:
         top_k: int = 20,
         alpha: float = 0.7,
         include_metadata: bool = True,
+        filter: Optional[dict] = None,
     ):
         """Search for products using Pinecone's dense index"""
-        return self._search_products(query, top_k, alpha, include_metadata)
+        return self._search_products(query, top_k, alpha, include_metadata, filter)
 
     def _search_sparse_index(
         self,
@@ -91,6 +101,7 @@ class VectorRepository:
         top_k: int = 20,
         alpha: float = 0.7,
         include_metadata: bool = True,
+        filter: Optional[dict] = None,
     ):
         """Search for products using Pinecone's sparse index"""
         start_time = time.time()
@@ -99,7 +110,7 @@ class VectorRepository:
 
         try:
             results = self.sparse_index.search(
-                namespace=self.namespace, query={"top_k": top_k, "inputs": {"text": query}}
+                namespace=self.namespace, query=self._build_query(query, top_k, filter)
             )
 
             query_time = time.time() - start_time
@@ -7,17 +7,22 @@ from pinecone import Pinecone
 
 from app.core.config import settings
 from app.db.models import Product
+from app.embeddings import get_embedding_provider, get_query_embedding, truncate_embedding
+from app.vectors.providers.local import get_local_vector_provider
+from app.vectors.types import VectorRecord
 
 logger = logging.getLogger(__name__)
 
 
 class VectorRepository:
     """
-    Vector repository with pgvector as default and Pinecone as optional override.
+    Vector repository with pgvector as default and Pinecone or the in-process
+    local index as optional overrides.
     """
     
     def __init__(self):
         self.use_pinecone = settings.VECTOR_PROVIDER == "pinecone"
+        self.use_local = settings.VECTOR_PROVIDER == "local"
         logger.info(f"VectorRepository initialized with VECTOR_PROVIDER={settings.VECTOR_PROVIDER}, use_pinecone={self.use_pinecone}")
         
         if self.use_pinecone:
@@ -33,6 +38,9 @@ class VectorRepository:
         if self.use_pinecone:
             logger.info("Using Pinecone for dense index")
             self._upsert_to_pinecone_dense(records)
+        elif self.use_local:
+            logger.info("Using local vector index for dense index")
+            self._upsert_to_local(records)
         else:
             logger.info("Using pgvector for dense index")
             if db is None:
@@ -55,6 +63,8 @@ class VectorRepository:
         """Search dense vector index."""
         if self.use_pinecone:
             return self._search_pinecone_dense(query, top_k)
+        elif self.use_local:
+            return self._search_local(query, top_k)
         else:
             # For pgvector, we need the db session from SearchService
             # This is a limitation of the current design
@@ -76,14 +86,17 @@ class VectorRepository:
         if self.use_pinecone:
             return self._search_pinecone_sparse(query, top_k)
         else:
-            # For pgvector, return empty results or use full-text search
-            return {"results": []}
+            # For pgvector, the lexical retriever is full-text search over search_tsv
+            from app.db.base import SessionLocal
+            db = SessionLocal()
+            try:
+                return self._search_pgvector_text(query, top_k, db)
+            finally:
+                db.close()
     
     # pgvector implementation
     def _upsert_to_pgvector(self, records: List[Dict[str, Any]], db: Session):
         """Update product embeddings in the database."""
-        import requests
-        
         # Batch compute embeddings
         texts = [record["canonical_text"] for record in records]
         embeddings = self._batch_compute_embeddings(texts)
@@ -92,83 +105,42 @@ class VectorRepository:
             logger.error("Failed to compute embeddings")
             return
         
+        prefix_dimension = settings.EMBEDDING_PREFIX_DIMENSION
+        if prefix_dimension:
+            statement = text(
+                "UPDATE products SET embedding = :embedding, "
+                "embedding_prefix = :embedding_prefix, embedded_at = now() "
+                "WHERE urn = :product_urn"
+            )
+        else:
+            statement = text(
+                "UPDATE products SET embedding = :embedding, embedded_at = now() "
+                "WHERE urn = :product_urn"
+            )
+        
         # Update products with embeddings
         for i, record in enumerate(records):
             product_id = record["id"]
             embedding = embeddings[i]
+            params = {"embedding": embedding, "product_urn": product_id}
+            if prefix_dimension:
+                params["embedding_prefix"] = truncate_embedding(embedding, prefix_dimension)
             
             # Update the product's embedding using URN
-            db.execute(
-                text("UPDATE products SET embedding = :embedding WHERE urn = :product_urn"),
-                {"embedding": embedding, "product_urn": product_id}
-            )
+            db.execute(statement, params)
         
         db.commit()
         logger.info(f"Updated {len(records)} product embeddings in database")
     
     def _batch_compute_embeddings(self, texts: List[str]) -> List[List[float]]:
-        """Compute embeddings for a batch of texts."""
-        if settings.PGVECTOR_EMBEDDING_SERVICE_URL:
-            # Use custom embedding service if configured
-            try:
-                import requests
-                response = requests.post(
-                    f"{settings.PGVECTOR_EMBEDDING_SERVICE_URL}/embeddings",
-                    json={"texts": texts, "model": settings.EMBEDDING_MODEL_NAME},
-                    timeout=30
-                )
-                response.raise_for_status()
-                return response.json()["embeddings"]
-            except Exception as e:
-                logger.error(f"Failed to compute embeddings via service: {e}")
-        
-        # Use configured embedding provider
-        if settings.EMBEDDING_MODEL_PROVIDER == "openai":
-            return self._compute_embeddings_via_openai(texts)
-        else:
-            logger.error(f"Unsupported embedding provider: {settings.EMBEDDING_MODEL_PROVIDER}")
-            raise ValueError(f"Unsupported embedding provider: {settings.EMBEDDING_MODEL_PROVIDER}")
-    
-    def _compute_embeddings_via_openai(self, texts: List[str]) -> List[List[float]]:
-        """Compute embeddings using OpenAI API."""
-        if not settings.EMBEDDING_API_KEY:
-            raise ValueError("EMBEDDING_API_KEY is required for OpenAI embeddings")
-        
+        """Compute embeddings for a batch of texts with the shared embedding provider."""
         try:
-            import openai
-            
-            # Support both old and new OpenAI API key formats
-            api_key = settings.EMBEDDING_API_KEY
-            
-            # Check if this is a project key that needs special handling
-            if api_key.startswith("k-proj-"):
-                logger.info("Detected OpenAI project key format")
-                # Project keys might need to be used differently
-                # For now, try using it as-is
-            
-            client = openai.OpenAI(api_key=api_key)
-            
-            logger.info(f"Computing embeddings for {len(texts)} texts using OpenAI {settings.EMBEDDING_MODEL_NAME}")
-            
-            # OpenAI has a limit on batch size, process in chunks if needed
-            embeddings = []
-            batch_size = 100  # OpenAI recommended batch size
-            
-            for i in range(0, len(texts), batch_size):
-                batch = texts[i:i + batch_size]
-                response = client.embeddings.create(
-                    model=settings.EMBEDDING_MODEL_NAME,
-                    input=batch
-                )
-                
-                for embedding_data in response.data:
-                    embeddings.append(embedding_data.embedding)
-            
+            logger.info(f"Computing embeddings for {len(texts)} texts using {settings.EMBEDDING_MODEL_NAME}")
+            embeddings = get_embedding_provider().embed(texts)
             logger.info(f"Successfully computed {len(embeddings)} embeddings")
             return embeddings
-            
         except Exception as e:
-            logger.error(f"Failed to compute embeddings via OpenAI: {e}")
+            logger.error(f"Failed to compute embeddings: {e}")
             raise
     
     def _compute_embeddings_via_pinecone(self, texts: List[str]) -> List[List[float]]:
@@ -277,13 +249,75 @@ class VectorRepository:
         
         return {"results": formatted_results}
     
+    # local implementation
+    def _upsert_to_local(self, records: List[Dict[str, Any]]):
+        """Append product embeddings to the local vector index."""
+        texts = [record["canonical_text"] for record in records]
+        embeddings = self._batch_compute_embeddings(texts)
+        
+        if not embeddings:
+            logger.error("Failed to compute embeddings")
+            return
+        
+        vector_records = [
+            VectorRecord(
+                id=record["id"],
+                values=embedding,
+                metadata={
+                    key: value
+                    for key, value in record.items()
+                    if key not in ("id", "canonical_text")
+                },
+            )
+            for record, embedding in zip(records, embeddings)
+        ]
+        if not get_local_vector_provider().upsert_vectors(settings.LOCAL_VECTOR_INDEX, vector_records):
+            raise Exception("Failed to upsert products to local vector index")
+    
+    def _search_local(self, query: str, top_k: int) -> Dict[str, Any]:
+        """Search the local vector index."""
+        results = get_local_vector_provider().search_by_vector(
+            settings.LOCAL_VECTOR_INDEX, self._get_query_embedding(query), top_k
+        )
+        return {
+            "results": [
+                {"id": r.id, "score": r.score, "metadata": r.metadata or {}}
+                for r in results
+            ]
+        }
+    
+    def _search_pgvector_text(self, query: str, top_k: int, db: Session) -> Dict[str, Any]:
+        """Search products by full-text match on the search_tsv column."""
+        results = db.execute(
+            text("""
+                SELECT p.urn AS id, ts_rank_cd(p.search_tsv, q.tsquery) AS score
+                FROM products p, (
+                    SELECT websearch_to_tsquery('english', :text_query)
+                        || websearch_to_tsquery('simple', :text_query) AS tsquery
+                ) q
+                WHERE p.search_tsv @@ q.tsquery
+                ORDER BY score DESC
+                LIMIT :limit
+            """),
+            {"text_query": query, "limit": top_k},
+        ).fetchall()
+        
+        return {
+            "results": [
+                {"id": row.id, "score": float(row.score), "metadata": {}}
+                for row in results
+            ]
+        }
+    
     def _get_query_embedding(self, query: str) -> List[float]:
-        """Get embedding for query text."""
-        # This should call your embedding service
-        # For now, returning a placeholder
-        import numpy as np
-        logger.warning("Using placeholder embedding - implement embedding service integration")
-        return np.random.rand(1024).tolist()
+        """Get embedding for query text, served from the embedding cache when possible."""
+        try:
+            return get_query_embedding(query)
+        except Exception as e:
+            # Placeholder fallback for environments without an embedding provider
+            import numpy as np
+            logger.warning(f"Using placeholder embedding - query embedding failed: {e}")
+            return np.random.rand(settings.EMBEDDING_DIMENSION).tolist()
     
     # Pinecone implementation (existing code)
     def _upsert_to_pinecone_dense(self, records: List[Dict[str, Any]]):
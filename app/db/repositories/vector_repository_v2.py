@@ -38,6 +38,13 @@ class VectorRepositoryV2:
                 "pool_max_size": settings.PGVECTOR_POOL_MAX_SIZE,
                 "embedding_service_url": settings.PGVECTOR_EMBEDDING_SERVICE_URL
             }
+        elif provider_name == "local":
+            config = {
+                "data_dir": settings.LOCAL_VECTOR_DIR,
+                "dtype": settings.LOCAL_VECTOR_DTYPE,
+                "block_size": settings.LOCAL_VECTOR_BLOCK_SIZE,
+                "compact_ratio": settings.LOCAL_VECTOR_COMPACT_RATIO,
+            }
         else:
             raise ValueError(f"Unknown vector provider: {provider_name}")
             
@@ -0,0 +1,17 @@
+from .base import EmbeddingProvider
+from .cache import EmbeddingCache, get_embedding_cache
+from .factory import EmbeddingProviderFactory, get_embedding_provider
+from .matryoshka import truncate_embedding
+from .query import aget_query_embedding, aget_query_embeddings, get_query_embedding
+
+__all__ = [
+    "EmbeddingProvider",
+    "EmbeddingProviderFactory",
+    "EmbeddingCache",
+    "get_embedding_cache",
+    "get_embedding_provider",
+    "get_query_embedding",
+    "aget_query_embedding",
+    "aget_query_embeddings",
+    "truncate_embedding",
+]
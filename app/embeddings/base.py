@@ -0,0 +1,133 @@
+from abc import ABC, abstractmethod
+from typing import Any, Awaitable, Callable, Dict, List, TypeVar
+import asyncio
+import logging
+import random
+import time
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class EmbeddingProvider(ABC):
+    """Abstract base class for embedding providers.
+
+    Providers hold long-lived, pooled HTTP clients and are meant to be shared
+    process-wide (see ``get_embedding_provider``). Inputs are split into
+    batches of ``batch_size`` and every remote call is retried with
+    exponential backoff.
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        """Initialize the embedding provider with configuration."""
+        self.config = config
+        self.model = config.get("model", "")
+        self.dimension = config.get("dimension")
+        self.batch_size = config.get("batch_size", 100)
+        self.timeout = config.get("timeout", 10.0)
+        self.max_retries = config.get("max_retries", 3)
+        self._setup()
+
+    @abstractmethod
+    def _setup(self):
+        """Setup provider-specific resources (clients, pools)."""
+        pass
+
+    @abstractmethod
+    def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """Embed a single batch of texts.
+
+        Args:
+            texts: Texts to embed, at most ``batch_size`` items
+
+        Returns:
+            One embedding per input text, in order
+        """
+        pass
+
+    @abstractmethod
+    async def _aembed_batch(self, texts: List[str]) -> List[List[float]]:
+        """Async variant of ``_embed_batch``."""
+        pass
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts, batching and retrying as configured.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            One embedding per input text, in order
+        """
+        embeddings = []
+        for i in range(0, len(texts), self.batch_size):
+            batch = texts[i : i + self.batch_size]
+            embeddings.extend(self._retry_with_backoff(lambda b=batch: self._embed_batch(b)))
+        return embeddings
+
+    async def aembed(self, texts: List[str]) -> List[List[float]]:
+        """Async variant of ``embed``. Batches are sent concurrently."""
+        batches = [
+            texts[i : i + self.batch_size] for i in range(0, len(texts), self.batch_size)
+        ]
+        results = await asyncio.gather(
+            *[
+                self._aretry_with_backoff(lambda b=batch: self._aembed_batch(b))
+                for batch in batches
+            ]
+        )
+        return [embedding for batch in results for embedding in batch]
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a single query text."""
+        return self.embed([text])[0]
+
+    async def aembed_query(self, text: str) -> List[float]:
+        """Async variant of ``embed_query``."""
+        return (await self.aembed([text]))[0]
+
+    def close(self):
+        """Release pooled connections. Override if the provider holds any."""
+        pass
+
+    async def aclose(self):
+        """Release pooled async connections. Override if the provider holds any."""
+        pass
+
+    def _backoff_delay(self, attempt: int) -> float:
+        return (2**attempt) * 0.25 + random.uniform(0, 0.25)
+
+    def _retry_with_backoff(self, func: Callable[[], T]) -> T:
+        """Retry func with exponential backoff and jitter."""
+        for attempt in range(self.max_retries):
+            try:
+                return func()
+            except Exception as e:
+                if attempt < self.max_retries - 1:
+                    wait_time = self._backoff_delay(attempt)
+                    logger.warning(
+                        f"Embedding request failed ({e}), retrying in {wait_time:.2f} seconds "
+                        f"(attempt {attempt + 1}/{self.max_retries})"
+                    )
+                    time.sleep(wait_time)
+                    continue
+                raise
+        return func()
+
+    async def _aretry_with_backoff(self, func: Callable[[], Awaitable[T]]) -> T:
+        """Async variant of ``_retry_with_backoff``."""
+        for attempt in range(self.max_retries):
+            try:
+                return await func()
+            except Exception as e:
+                if attempt < self.max_retries - 1:
+                    wait_time = self._backoff_delay(attempt)
+                    logger.warning(
+                        f"Embedding request failed ({e}), retrying in {wait_time:.2f} seconds "
+                        f"(attempt {attempt + 1}/{self.max_retries})"
+                    )
+                    await asyncio.sleep(wait_time)
+                    continue
+                raise
+        return await func()
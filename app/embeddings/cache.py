@@ -0,0 +1,133 @@
+import hashlib
+import logging
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from app.core.cache import LRUCache, get_redis_client
+from app.core.config import settings
+from app.core.metrics import SEARCH_CACHE_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingCache:
+    """
+    Two-tier cache for query embeddings.
+
+    Entries are keyed on (model name, dimension, normalized query text). The
+    in-process LRU tier is always used; the Redis tier is shared between API
+    replicas and is only consulted when a Redis client is configured.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 10000,
+        ttl_seconds: int = 86400,
+        redis_client=None,
+        key_prefix: str = "cmp:embedding",
+    ):
+        self.local = LRUCache(max_size=max_size, ttl_seconds=ttl_seconds)
+        self.redis = redis_client
+        self.ttl_seconds = ttl_seconds
+        self.key_prefix = key_prefix
+        self.local_hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def normalize_query(text: str) -> str:
+        """Lower-case and collapse whitespace so trivial variants share an entry"""
+        return " ".join(text.lower().split())
+
+    def make_key(self, text: str, model: str, dimension: int) -> str:
+        """Build the cache key for a query"""
+        return f"{model}:{dimension}:{self.normalize_query(text)}"
+
+    def _redis_key(self, key: str) -> str:
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return f"{self.key_prefix}:{digest}"
+
+    def get(self, text: str, model: str, dimension: int) -> Optional[List[float]]:
+        """Return a cached embedding, or None on a miss"""
+        key = self.make_key(text, model, dimension)
+
+        embedding = self.local.get(key)
+        if embedding is not None:
+            self.local_hits += 1
+            SEARCH_CACHE_REQUESTS.labels(cache="embedding", result="hit").inc()
+            return embedding
+
+        if self.redis is not None:
+            try:
+                raw = self.redis.get(self._redis_key(key))
+            except Exception as e:
+                logger.warning(f"Embedding cache Redis lookup failed: {e}")
+                raw = None
+
+            if raw:
+                embedding = np.frombuffer(raw, dtype=np.float32).tolist()
+                self.local.set(key, embedding)
+                self.redis_hits += 1
+                SEARCH_CACHE_REQUESTS.labels(cache="embedding", result="hit").inc()
+                return embedding
+
+        self.misses += 1
+        SEARCH_CACHE_REQUESTS.labels(cache="embedding", result="miss").inc()
+        return None
+
+    def set(self, text: str, model: str, dimension: int, embedding: List[float]):
+        """Store an embedding in both tiers"""
+        key = self.make_key(text, model, dimension)
+        self.local.set(key, list(embedding))
+
+        if self.redis is not None:
+            try:
+                self.redis.set(
+                    self._redis_key(key),
+                    np.asarray(embedding, dtype=np.float32).tobytes(),
+                    ex=self.ttl_seconds or None,
+                )
+            except Exception as e:
+                logger.warning(f"Embedding cache Redis write failed: {e}")
+
+    def get_or_compute(
+        self,
+        text: str,
+        compute: Callable[[str], List[float]],
+        model: str,
+        dimension: int,
+    ) -> List[float]:
+        """Return the cached embedding for text, computing and storing it on a miss"""
+        embedding = self.get(text, model, dimension)
+        if embedding is None:
+            embedding = compute(text)
+            self.set(text, model, dimension, embedding)
+        return embedding
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters for both tiers"""
+        return {
+            "local_hits": self.local_hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "size": len(self.local),
+        }
+
+
+_embedding_cache: Optional[EmbeddingCache] = None
+
+
+def get_embedding_cache() -> Optional[EmbeddingCache]:
+    """Get the process-wide embedding cache, or None if caching is disabled"""
+    global _embedding_cache
+    if not settings.EMBEDDING_CACHE_ENABLED:
+        return None
+
+    if _embedding_cache is None:
+        _embedding_cache = EmbeddingCache(
+            max_size=settings.EMBEDDING_CACHE_SIZE,
+            ttl_seconds=settings.EMBEDDING_CACHE_TTL,
+            redis_client=get_redis_client(),
+        )
+    return _embedding_cache
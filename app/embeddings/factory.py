@@ -0,0 +1,121 @@
+from typing import Any, Dict, Optional
+import logging
+import threading
+
+from app.core.config import settings
+from .base import EmbeddingProvider
+from .providers.local import LocalEmbeddingProvider
+from .providers.openai import OpenAIEmbeddingProvider
+from .providers.service import ServiceEmbeddingProvider
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingProviderFactory:
+    """Factory for creating embedding providers."""
+
+    _providers = {
+        "openai": OpenAIEmbeddingProvider,
+        "service": ServiceEmbeddingProvider,
+        "local": LocalEmbeddingProvider,
+    }
+
+    @classmethod
+    def register_provider(cls, name: str, provider_class: type):
+        """Register a new provider class.
+
+        Args:
+            name: Provider name
+            provider_class: Provider class that inherits from EmbeddingProvider
+        """
+        if not issubclass(provider_class, EmbeddingProvider):
+            raise ValueError(f"{provider_class} must inherit from EmbeddingProvider")
+        cls._providers[name] = provider_class
+        logger.info(f"Registered embedding provider: {name}")
+
+    @classmethod
+    def create(cls, provider_name: str, config: Dict[str, Any]) -> EmbeddingProvider:
+        """Create an embedding provider instance.
+
+        Args:
+            provider_name: Name of the provider (e.g., "openai", "service", "local")
+            config: Provider-specific configuration
+
+        Returns:
+            EmbeddingProvider instance
+
+        Raises:
+            ValueError: If provider is not registered
+        """
+        if provider_name not in cls._providers:
+            raise ValueError(
+                f"Unknown embedding provider: {provider_name}. "
+                f"Available providers: {list(cls._providers.keys())}"
+            )
+
+        provider_class = cls._providers[provider_name]
+        logger.info(f"Creating embedding provider: {provider_name}")
+
+        return provider_class(config)
+
+    @classmethod
+    def list_providers(cls) -> list[str]:
+        """List all registered provider names."""
+        return list(cls._providers.keys())
+
+
+_provider: Optional[EmbeddingProvider] = None
+_provider_lock = threading.Lock()
+
+
+def _provider_from_settings() -> EmbeddingProvider:
+    """Resolve the configured embedding backend.
+
+    Raises:
+        ValueError: If the OpenAI provider is selected without an API key
+    """
+    config = {
+        "model": settings.EMBEDDING_MODEL_NAME,
+        "dimension": settings.EMBEDDING_DIMENSION,
+        "batch_size": settings.EMBEDDING_BATCH_SIZE,
+        "timeout": settings.EMBEDDING_TIMEOUT,
+        "max_retries": settings.EMBEDDING_MAX_RETRIES,
+        "pool_size": settings.EMBEDDING_POOL_SIZE,
+    }
+
+    # A configured embedding service takes precedence, as it always has
+    if settings.PGVECTOR_EMBEDDING_SERVICE_URL:
+        config["url"] = settings.PGVECTOR_EMBEDDING_SERVICE_URL
+        return EmbeddingProviderFactory.create("service", config)
+
+    provider_name = settings.EMBEDDING_MODEL_PROVIDER
+    if provider_name == "openai":
+        # Never fall back to the local provider here: its vectors would be
+        # stored and cached as if they came from the configured model
+        if not settings.EMBEDDING_API_KEY:
+            raise ValueError(
+                "EMBEDDING_API_KEY is required for the openai embedding provider; "
+                "set EMBEDDING_MODEL_PROVIDER=local for the deterministic local provider"
+            )
+        config["api_key"] = settings.EMBEDDING_API_KEY
+
+    return EmbeddingProviderFactory.create(provider_name, config)
+
+
+def get_embedding_provider() -> EmbeddingProvider:
+    """Get the process-wide embedding provider, creating it on first use"""
+    global _provider
+    if _provider is None:
+        with _provider_lock:
+            if _provider is None:
+                _provider = _provider_from_settings()
+    return _provider
+
+
+async def close_embedding_provider():
+    """Close pooled connections held by the process-wide provider"""
+    global _provider
+    if _provider is not None:
+        await _provider.aclose()
+        _provider.close()
+        _provider = None
@@ -0,0 +1,17 @@
+from typing import List, Sequence
+
+import numpy as np
+
+
+def truncate_embedding(embedding: Sequence[float], dimension: int) -> List[float]:
+    """
+    Truncate an embedding to its first ``dimension`` values and renormalize.
+
+    Matryoshka-trained models such as text-embedding-3-small keep most of
+    their retrieval quality in a short prefix of the full vector.
+    """
+    prefix = np.asarray(embedding[:dimension], dtype=np.float32)
+    norm = np.linalg.norm(prefix)
+    if norm:
+        prefix = prefix / norm
+    return prefix.tolist()
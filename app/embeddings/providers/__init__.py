@@ -0,0 +1,9 @@
+from .local import LocalEmbeddingProvider
+from .openai import OpenAIEmbeddingProvider
+from .service import ServiceEmbeddingProvider
+
+__all__ = [
+    "LocalEmbeddingProvider",
+    "OpenAIEmbeddingProvider",
+    "ServiceEmbeddingProvider",
+]
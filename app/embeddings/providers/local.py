@@ -0,0 +1,50 @@
+import hashlib
+import logging
+import re
+from typing import List
+
+import numpy as np
+
+from ..base import EmbeddingProvider
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+class LocalEmbeddingProvider(EmbeddingProvider):
+    """Deterministic in-process stand-in for tests, benchmarks and offline development.
+
+    Texts are embedded by feature-hashing their lower-cased tokens into a
+    fixed-size signed vector and L2-normalizing it, so identical texts always
+    map to identical vectors and texts sharing tokens have positive cosine
+    similarity. No network calls are made.
+    """
+
+    def _setup(self):
+        """Resolve the output dimension."""
+        self.dimension = self.dimension or 1536
+
+    def _embed_text(self, text: str) -> List[float]:
+        vector = np.zeros(self.dimension, dtype=np.float32)
+        for token in _TOKEN_RE.findall(text.lower()):
+            digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+            bucket = int.from_bytes(digest[:4], "little") % self.dimension
+            sign = 1.0 if digest[4] & 1 else -1.0
+            vector[bucket] += sign
+
+        norm = np.linalg.norm(vector)
+        if norm == 0:
+            # Empty input still needs a valid (non-zero) vector for cosine distance
+            vector[0] = 1.0
+        else:
+            vector /= norm
+        return vector.tolist()
+
+    def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """Embed a batch of texts."""
+        return [self._embed_text(text) for text in texts]
+
+    async def _aembed_batch(self, texts: List[str]) -> List[List[float]]:
+        """Embed a batch of texts."""
+        return self._embed_batch(texts)
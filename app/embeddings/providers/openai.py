@@ -0,0 +1,54 @@
+import logging
+from typing import List
+
+import httpx
+
+from ..base import EmbeddingProvider
+
+logger = logging.getLogger(__name__)
+
+
+class OpenAIEmbeddingProvider(EmbeddingProvider):
+    """OpenAI embeddings API backed by keep-alive connection pools."""
+
+    def _setup(self):
+        """Create sync and async OpenAI clients sharing pooled HTTP transports."""
+        import openai
+
+        api_key = self.config["api_key"]
+        limits = httpx.Limits(
+            max_connections=self.config.get("pool_size", 20),
+            max_keepalive_connections=self.config.get("pool_size", 20),
+        )
+
+        # Retries are handled by EmbeddingProvider so every backend behaves alike
+        self.client = openai.OpenAI(
+            api_key=api_key,
+            max_retries=0,
+            timeout=self.timeout,
+            http_client=httpx.Client(limits=limits, timeout=self.timeout),
+        )
+        self.async_client = openai.AsyncOpenAI(
+            api_key=api_key,
+            max_retries=0,
+            timeout=self.timeout,
+            http_client=httpx.AsyncClient(limits=limits, timeout=self.timeout),
+        )
+
+    def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """Embed a batch of texts with the sync client."""
+        response = self.client.embeddings.create(model=self.model, input=texts)
+        return [item.embedding for item in response.data]
+
+    async def _aembed_batch(self, texts: List[str]) -> List[List[float]]:
+        """Embed a batch of texts with the async client."""
+        response = await self.async_client.embeddings.create(model=self.model, input=texts)
+        return [item.embedding for item in response.data]
+
+    def close(self):
+        """Close the sync connection pool."""
+        self.client.close()
+
+    async def aclose(self):
+        """Close the async connection pool."""
+        await self.async_client.close()
@@ -0,0 +1,53 @@
+import logging
+from typing import List
+
+import httpx
+
+from ..base import EmbeddingProvider
+
+logger = logging.getLogger(__name__)
+
+
+class ServiceEmbeddingProvider(EmbeddingProvider):
+    """Self-hosted embedding service reached over HTTP.
+
+    The service is expected to expose ``POST {url}/embeddings`` accepting
+    ``{"texts": [...], "model": "..."}`` and returning ``{"embeddings": [...]}``.
+    """
+
+    def _setup(self):
+        """Create pooled sync and async HTTP clients for the service."""
+        self.base_url = self.config["url"].rstrip("/")
+        limits = httpx.Limits(
+            max_connections=self.config.get("pool_size", 20),
+            max_keepalive_connections=self.config.get("pool_size", 20),
+        )
+        self.client = httpx.Client(
+            base_url=self.base_url, limits=limits, timeout=self.timeout
+        )
+        self.async_client = httpx.AsyncClient(
+            base_url=self.base_url, limits=limits, timeout=self.timeout
+        )
+
+    def _payload(self, texts: List[str]) -> dict:
+        return {"texts": texts, "model": self.model}
+
+    def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """Embed a batch of texts with the sync client."""
+        response = self.client.post("/embeddings", json=self._payload(texts))
+        response.raise_for_status()
+        return response.json()["embeddings"]
+
+    async def _aembed_batch(self, texts: List[str]) -> List[List[float]]:
+        """Embed a batch of texts with the async client."""
+        response = await self.async_client.post("/embeddings", json=self._payload(texts))
+        response.raise_for_status()
+        return response.json()["embeddings"]
+
+    def close(self):
+        """Close the sync connection pool."""
+        self.client.close()
+
+    async def aclose(self):
+        """Close the async connection pool."""
+        await self.async_client.aclose()
@@ -0,0 +1,108 @@
+from typing import Dict, List
+
+from app.core.config import settings
+from app.core.metrics import EMBEDDING_FAILURES, time_search_stage
+from .cache import get_embedding_cache
+from .factory import get_embedding_provider
+
+
+def _embed_query(query: str) -> List[float]:
+    try:
+        return get_embedding_provider().embed_query(query)
+    except Exception:
+        EMBEDDING_FAILURES.labels(provider=settings.EMBEDDING_MODEL_PROVIDER).inc()
+        raise
+
+
+def _cached_embeddings(cache, queries: List[str]) -> Dict[str, List[float]]:
+    embeddings: Dict[str, List[float]] = {}
+    for query in dict.fromkeys(queries):
+        cached = cache.get(query, settings.EMBEDDING_MODEL_NAME, settings.EMBEDDING_DIMENSION)
+        if cached is not None:
+            embeddings[query] = cached
+    return embeddings
+
+
+def _store_embeddings(cache, embeddings: Dict[str, List[float]]) -> None:
+    for query, embedding in embeddings.items():
+        cache.set(query, settings.EMBEDDING_MODEL_NAME, settings.EMBEDDING_DIMENSION, embedding)
+
+
+def get_query_embedding(query: str) -> List[float]:
+    """Embed a search query with the shared provider, using the embedding cache"""
+    with time_search_stage("embedding"):
+        cache = get_embedding_cache()
+        if cache is None:
+            return _embed_query(query)
+
+        return cache.get_or_compute(
+            query,
+            _embed_query,
+            settings.EMBEDDING_MODEL_NAME,
+            settings.EMBEDDING_DIMENSION,
+        )
+
+
+async def aget_query_embedding(query: str) -> List[float]:
+    """Async variant of ``get_query_embedding``
+
+    Cache lookups and stores may hit Redis, so they run on the search
+    executor rather than the event loop.
+    """
+    # Deferred: app.services.search imports this package
+    from app.services.search.executor import run_in_search_executor
+
+    with time_search_stage("embedding"):
+        cache = get_embedding_cache()
+        if cache is not None:
+            cached = await run_in_search_executor(
+                cache.get, query, settings.EMBEDDING_MODEL_NAME, settings.EMBEDDING_DIMENSION
+            )
+            if cached is not None:
+                return cached
+
+        try:
+            embedding = await get_embedding_provider().aembed_query(query)
+        except Exception:
+            EMBEDDING_FAILURES.labels(provider=settings.EMBEDDING_MODEL_PROVIDER).inc()
+            raise
+        if cache is not None:
+            await run_in_search_executor(
+                cache.set,
+                query,
+                settings.EMBEDDING_MODEL_NAME,
+                settings.EMBEDDING_DIMENSION,
+                embedding,
+            )
+        return embedding
+
+
+async def aget_query_embeddings(queries: List[str]) -> List[List[float]]:
+    """
+    Embed several search queries, sending all cache misses to the provider
+    in one request.
+
+    Returns:
+        One embedding per query, in order
+    """
+    from app.services.search.executor import run_in_search_executor
+
+    with time_search_stage("embedding"):
+        cache = get_embedding_cache()
+        embeddings: Dict[str, List[float]] = {}
+        if cache is not None:
+            embeddings = await run_in_search_executor(_cached_embeddings, cache, queries)
+
+        missing = list(dict.fromkeys(q for q in queries if q not in embeddings))
+        if missing:
+            try:
+                computed = await get_embedding_provider().aembed(missing)
+            except Exception:
+                EMBEDDING_FAILURES.labels(provider=settings.EMBEDDING_MODEL_PROVIDER).inc()
+                raise
+            embeddings.update(zip(missing, computed))
+            if cache is not None:
+                await run_in_search_executor(
+                    _store_embeddings, cache, dict(zip(missing, computed))
+                )
+        return [embeddings[query] for query in queries]
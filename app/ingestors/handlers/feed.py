@@ -158,6 +158,7 @@ class FeedHandler:
                 
                 # Validate and prepare products for bulk processing
                 valid_products = []
+                upserted_product_ids = []
                 
                 for product_data in products:
                     try:
@@ -208,6 +209,7 @@ class FeedHandler:
                                 product_list, brand_id, category_name, batch_size=500
                             )
                             products_processed += len(upserted)
+                            upserted_product_ids.extend(p.id for p in upserted)
                             print(f"Bulk processed {len(upserted)} products for brand {brand_id}, category {category_name}")
                         except Exception as e:
                             logger.error(f"Error bulk processing products for brand {brand_id}, category {category_name}: {str(e)}")
@@ -215,6 +217,15 @@ class FeedHandler:
                             # Rollback the transaction to clear the error state
                             self.db_session.rollback()
                 
+                # Keep the search cards in step with the products and offers just written
+                if upserted_product_ids:
+                    try:
+                        refreshed = self.product_service.refresh_search_cards(upserted_product_ids)
+                        logger.info(f"Refreshed {refreshed} product search cards")
+                    except Exception as e:
+                        logger.error(f"Error refreshing product search cards: {str(e)}")
+                        self.db_session.rollback()
+                
                 products_duration = time.time() - products_start_time
                 logger.info(f"Products processing completed in {products_duration:.2f} seconds")
 
@@ -19,7 +19,9 @@ from app.ingestors.base import (
     ProcessingError,
 )
 from app.core.config import settings
+from app.core.metrics import INGESTION_ITEMS, INGESTION_STAGE_SECONDS
 from app.ingestors.handlers.vector import VectorHandler
+from app.services.search.result_cache import invalidate_search_results
 
 logger = logging.getLogger(__name__)
 
@@ -109,6 +111,7 @@ class IngestorManager:
 
                 # Calculate duration
                 duration = (datetime.now() - start_time).total_seconds()
+                INGESTION_STAGE_SECONDS.labels(stage="registry").observe(duration)
 
                 return {
                     "status": "success",
@@ -238,13 +241,19 @@ class IngestorManager:
 
                         try:
                             # Fetch shard data
-                            shard_data = source.fetch_feed(shard_url)
+                            with INGESTION_STAGE_SECONDS.labels(stage="shard_fetch").time():
+                                shard_data = source.fetch_feed(shard_url)
 
                             # Create feed handler for this shard
                             handler = FeedHandler(db_session, org_urn)
 
                             # Process shard data
-                            shard_result = handler.process(shard_data)
+                            with INGESTION_STAGE_SECONDS.labels(stage="shard_process").time():
+                                shard_result = handler.process(shard_data)
+                            for kind in ("product_groups", "products", "offers"):
+                                INGESTION_ITEMS.labels(kind=kind).inc(
+                                    shard_result.get(f"{kind}_processed", 0)
+                                )
 
                             # Accumulate results
                             total_product_groups += shard_result.get(
@@ -260,6 +269,9 @@ class IngestorManager:
                     
                     feed_indexes_processed += 1
 
+                    # Catalog changed for this organization, drop cached searches
+                    invalidate_search_results(org_urn)
+
                 result = {
                     "feed_indexes_processed": feed_indexes_processed,
                     "shards_processed": shards_processed,
@@ -270,6 +282,7 @@ class IngestorManager:
 
                 # Calculate duration
                 duration = (datetime.now() - start_time).total_seconds()
+                INGESTION_STAGE_SECONDS.labels(stage="feed").observe(duration)
 
                 return {
                     "status": "success",
@@ -329,8 +342,12 @@ class IngestorManager:
                 handler = VectorHandler(db_session)
                 result = handler.process(org_urn)
                 
+                # Embeddings changed for this organization, drop cached searches
+                invalidate_search_results(org_urn)
+                
                 # Calculate duration
                 duration = (datetime.now() - start_time).total_seconds()
+                INGESTION_STAGE_SECONDS.labels(stage="vector").observe(duration)
                 
                 return {
                     "status": "success",
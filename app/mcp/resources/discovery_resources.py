@@ -10,6 +10,8 @@ from pydantic import AnyUrl
 from app.core.logging import get_logger
 from app.core.dependencies import get_search_service
 from app.db.base import SessionLocal
+from app.services.index_stats_service import get_index_stats
+from app.services.search.executor import run_in_search_executor
 
 logger = get_logger(__name__)
 
@@ -479,6 +481,21 @@ async def _get_node_info() -> str:
             "cmp:protocol": "v0.1"
         }
         
+        index_stats = await run_in_search_executor(get_index_stats)
+        if index_stats:
+            node_info["cmp:indexStats"] = {
+                "embeddedProducts": index_stats["embedded_products"],
+                "lastEmbeddedAt": index_stats["last_embedded_at"],
+                "organizations": {
+                    org_urn: {
+                        "embeddedProducts": org["embedded_products"],
+                        "lastEmbeddedAt": org["last_embedded_at"],
+                    }
+                    for org_urn, org in index_stats["organizations"].items()
+                },
+                "refreshedAt": index_stats["refreshed_at"],
+            }
+        
         return json.dumps(node_info, indent=2)
         
     except Exception as e:
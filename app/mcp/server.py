@@ -66,6 +66,15 @@ class MCPServer:
             """Context manager for managing session manager lifecycle."""
             logger.info("Starting MCP Discovery Node...")
             
+            from app.db.base import SessionLocal
+            from app.services.search.pgvector_search import check_quantized_index
+
+            session = SessionLocal()
+            try:
+                check_quantized_index(session)
+            finally:
+                session.close()
+            
             # Start session manager
             async with self.session_manager.run():
                 logger.info("MCP Discovery Node started with StreamableHTTP and Redis event store!")
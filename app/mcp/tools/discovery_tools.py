@@ -1,12 +1,21 @@
 import logging
 import json
-from typing import List
+from contextlib import aclosing
+from typing import List, Optional
 
 import mcp.types as types
 from mcp.server.lowlevel import Server
 
+from app.core.config import settings
 from app.core.logging import get_logger
+from app.core.metrics import metrics_endpoint, time_search_stage
 from app.core.dependencies import SearchServiceFactory, ProductServiceFactory
+from app.services.search.filters import SearchFilters
+from app.services.search.batch import search_batch
+from app.services.search.executor import run_in_search_executor
+from app.services.search.pagination import BatchQuery, search_page
+from app.services.search.streaming import SearchStream
+from app.services.search.result_cache import get_search_result_cache
 from app.utils.formatters import format_product_search_response
 
 logger = get_logger(__name__)
@@ -24,7 +33,7 @@ def register_discovery_tools(
         return [
             types.Tool(
                 name="search-products",
-                description="Search for products using hybrid vector search",
+                description="Search for products using hybrid vector search. When the request carries a progressToken, ranked candidates and enriched items are also streamed as progress notifications while the search runs",
                 inputSchema={
                     "type": "object",
                     "required": ["query"],
@@ -37,6 +46,81 @@ def register_discovery_tools(
                             "type": "number",
                             "description": "Maximum number of results (default: 10)",
                             "default": 10
+                        },
+                        "price_min": {
+                            "type": "number",
+                            "description": "Only products with an offer at or above this price"
+                        },
+                        "price_max": {
+                            "type": "number",
+                            "description": "Only products with an offer at or below this price"
+                        },
+                        "brand": {
+                            "type": "string",
+                            "description": "Brand name"
+                        },
+                        "category": {
+                            "type": "string",
+                            "description": "Category name"
+                        },
+                        "availability": {
+                            "type": "string",
+                            "description": "Offer availability, e.g. InStock"
+                        },
+                        "organization_urn": {
+                            "type": "string",
+                            "description": "Only products from this organization (URN)"
+                        },
+                        "cursor": {
+                            "type": "string",
+                            "description": "cmp:nextCursor from a previous search-products result, to get the next page"
+                        },
+                        "collapse_variants": {
+                            "type": "boolean",
+                            "description": "Return one product per product group, with cmp:variantCount (default: false)",
+                            "default": False
+                        }
+                    }
+                }
+            ),
+            types.Tool(
+                name="search-products-batch",
+                description="Run several product searches at once, e.g. one sub-query per category. Cheaper than calling search-products repeatedly",
+                inputSchema={
+                    "type": "object",
+                    "required": ["queries"],
+                    "properties": {
+                        "queries": {
+                            "type": "array",
+                            "description": f"Searches to run, at most {settings.SEARCH_BATCH_MAX_QUERIES}; results come back in the same order",
+                            "minItems": 1,
+                            "maxItems": settings.SEARCH_BATCH_MAX_QUERIES,
+                            "items": {
+                                "type": "object",
+                                "required": ["query"],
+                                "properties": {
+                                    "query": {
+                                        "type": "string",
+                                        "description": "Search query for products"
+                                    },
+                                    "limit": {
+                                        "type": "number",
+                                        "description": "Maximum number of results (default: 10)",
+                                        "default": 10
+                                    },
+                                    "price_min": {"type": "number"},
+                                    "price_max": {"type": "number"},
+                                    "brand": {"type": "string"},
+                                    "category": {"type": "string"},
+                                    "availability": {"type": "string"},
+                                    "organization_urn": {"type": "string"}
+                                }
+                            }
+                        },
+                        "collapse_variants": {
+                            "type": "boolean",
+                            "description": "Return one product per product group, with cmp:variantCount (default: false)",
+                            "default": False
                         }
                     }
                 }
@@ -83,7 +167,11 @@ def register_discovery_tools(
         
         try:
             if name == "search-products":
-                return _handle_search_products(
+                return await _handle_search_products(
+                    search_service_factory, arguments, ctx
+                )
+            elif name == "search-products-batch":
+                return await _handle_search_products_batch(
                     search_service_factory, arguments, ctx
                 )
             elif name == "get-product-details":
@@ -111,29 +199,93 @@ def register_discovery_tools(
             ]
 
 
-def _handle_search_products(
+async def _handle_search_products(
     search_service_factory: SearchServiceFactory, 
     arguments: dict, 
     ctx
 ) -> List[types.TextContent]:
     """Handle product search requests"""
+    with metrics_endpoint("mcp:search_products"), time_search_stage("total"):
+        return await _search_products(search_service_factory, arguments, ctx)
+
+
+async def _search_products(
+    search_service_factory: SearchServiceFactory, arguments: dict, ctx=None
+) -> List[types.TextContent]:
     query = arguments["query"]
-    limit = arguments.get("limit", 10)
+    limit = max(1, min(int(arguments.get("limit", 10)), 100))
+    cursor = arguments.get("cursor")
+    collapse_variants = bool(arguments.get("collapse_variants", False))
+    filters = SearchFilters(
+        price_min=arguments.get("price_min"),
+        price_max=arguments.get("price_max"),
+        brand=arguments.get("brand"),
+        category=arguments.get("category"),
+        availability=arguments.get("availability"),
+        organization_urn=arguments.get("organization_urn"),
+    )
     
-    # Send progress notification
-    # Note: We can't use async ctx.session.send_log_message in sync function
-    logger.info(f"Searching for products: '{query}'")
+    logger.info(f"Searching for products: '{query}' {filters.to_dict()}")
+    
+    cache = get_search_result_cache()
+    cache_key = None
+    if cache:
+        # Key generation and lookup may call Redis, so keep them off the event loop
+        cache_key, cached = await run_in_search_executor(
+            cache.lookup,
+            query,
+            limit,
+            filters,
+            cursor=cursor,
+            collapse_variants=collapse_variants,
+        )
+        if cached is not None:
+            return [
+                types.TextContent(
+                    type="text",
+                    text=json.dumps(cached, indent=2)
+                )
+            ]
+    
+    progress_token = ctx.meta.progressToken if ctx is not None and ctx.meta else None
+    if progress_token is not None:
+        stream = await _stream_search_products(
+            search_service_factory, ctx, progress_token, query, limit, cursor, filters,
+            collapse_variants,
+        )
+        if not stream.results:
+            return [
+                types.TextContent(
+                    type="text",
+                    text=f"No products found for query: '{query}'"
+                )
+            ]
+        with time_search_stage("formatting"):
+            response_data = format_product_search_response(
+                stream.results,
+                degraded=bool(stream.degraded),
+                next_cursor=stream.page.next_cursor,
+                offset=stream.page.offset,
+            )
+            response_text = json.dumps(response_data, indent=2)
+        if cache_key and not stream.degraded:
+            await run_in_search_executor(cache.set, cache_key, response_data)
+        return [
+            types.TextContent(
+                type="text",
+                text=response_text
+            )
+        ]
     
     # Create service with proper session management
-    for search_service in search_service_factory.create_with_cleanup():
+    for search_service in search_service_factory.create_with_cleanup(collapse_variants):
         # Perform search
-        results = search_service.search_products(
-            query=query,
-            top_k=limit
+        page = await search_page(
+            search_service, query, limit, cursor=cursor, filters=filters
         )
         
         # Format results
-        if not results:
+        if not page.results:
             return [
                 types.TextContent(
                     type="text",
@@ -141,10 +293,17 @@ def _handle_search_products(
                 )
             ]
         
-        response_data = format_product_search_response(results)
-    
-    # Convert dictionary to JSON string for MCP TextContent
-        response_text = json.dumps(response_data, indent=2)
+        with time_search_stage("formatting"):
+            response_data = format_product_search_response(
+                page.results,
+                degraded=bool(search_service.degraded_retrievers),
+                next_cursor=page.next_cursor,
+                offset=page.offset,
+            )
+            # Convert dictionary to JSON string for MCP TextContent
+            response_text = json.dumps(response_data, indent=2)
+        if cache_key and not search_service.degraded_retrievers:
+            await run_in_search_executor(cache.set, cache_key, response_data)
        
         return [
             types.TextContent(
@@ -154,6 +313,94 @@ def _handle_search_products(
         ]
 
 
+async def _handle_search_products_batch(
+    search_service_factory: SearchServiceFactory,
+    arguments: dict,
+    ctx
+) -> List[types.TextContent]:
+    """Handle batch product search requests"""
+    with metrics_endpoint("mcp:search_products_batch"), time_search_stage("total"):
+        queries = [_batch_query(item) for item in arguments["queries"]]
+        if len(queries) > settings.SEARCH_BATCH_MAX_QUERIES:
+            return [
+                types.TextContent(
+                    type="text",
+                    text=f"At most {settings.SEARCH_BATCH_MAX_QUERIES} queries per batch"
+                )
+            ]
+        
+        logger.info(f"Batch searching for {len(queries)} queries")
+        
+        collapse_variants = bool(arguments.get("collapse_variants", False))
+        sessions = search_service_factory.create_with_cleanup(collapse_variants)
+        try:
+            responses, _ = await search_batch(
+                queries, lambda: next(sessions), collapse_variants=collapse_variants
+            )
+        finally:
+            sessions.close()
+        
+        with time_search_stage("formatting"):
+            response_text = json.dumps({"results": responses}, indent=2)
+        return [
+            types.TextContent(
+                type="text",
+                text=response_text
+            )
+        ]
+
+
+def _batch_query(arguments: dict) -> BatchQuery:
+    """Build one batch query from search-products style arguments"""
+    return BatchQuery(
+        query=arguments["query"],
+        limit=max(1, min(int(arguments.get("limit", 10)), 100)),
+        filters=SearchFilters(
+            price_min=arguments.get("price_min"),
+            price_max=arguments.get("price_max"),
+            brand=arguments.get("brand"),
+            category=arguments.get("category"),
+            availability=arguments.get("availability"),
+            organization_urn=arguments.get("organization_urn"),
+        ),
+    )
+
+
+async def _stream_search_products(
+    search_service_factory: SearchServiceFactory,
+    ctx,
+    progress_token,
+    query: str,
+    limit: int,
+    cursor: Optional[str],
+    filters: SearchFilters,
+    collapse_variants: bool = False,
+) -> SearchStream:
+    """
+    Run a search, sending each stream event to the client as a progress
+    notification whose message is the event as JSON.
+
+    Returns the finished stream. A cancelled request stops the stream and
+    releases its database session.
+    """
+    stream = search_service_factory.create_stream(
+        query, limit, collapse_variants=collapse_variants, cursor=cursor, filters=filters
+    )
+    total = None
+    async with aclosing(stream.events()) as events:
+        async for event, data in events:
+            if event == "candidates":
+                total = len(data["itemListElement"])
+            await ctx.session.send_progress_notification(
+                progress_token,
+                progress=len(stream.results),
+                total=total,
+                message=json.dumps({"event": event, **data}),
+                related_request_id=ctx.request_id,
+            )
+    return stream
+
+
 def _handle_get_product_details(
     product_service_factory: ProductServiceFactory,
     arguments: dict,
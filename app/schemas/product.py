@@ -59,6 +59,9 @@ class ProductCreate(ProductBase):
     raw_data: Optional[Dict[str, Any]] = Field(
         None, description="Full JSON-LD representation"
     )
+    media: List[Dict[str, Any]] = Field(
+        default_factory=list, description="Media objects extracted from raw_data"
+    )
     offers: Optional[OfferBase] = Field(None, description="Offer information")
     additional_properties: Optional[List[PropertyValueBase]] = Field(
         None, description="Additional product properties"
@@ -77,6 +80,7 @@ class ProductUpdate(BaseModel):
     urn: Optional[str] = None
     variant_attributes: Optional[Dict[str, Any]] = None
     raw_data: Optional[Dict[str, Any]] = None
+    media: Optional[List[Dict[str, Any]]] = None
     offers: Optional[OfferBase] = None
     additional_properties: Optional[List[PropertyValueBase]] = None
     category_id: Optional[UUID] = None
@@ -90,6 +94,7 @@ class ProductInDB(ProductBase):
     created_at: datetime
     updated_at: datetime
     raw_data: Optional[Dict[str, Any]] = None
+    media: Optional[List[Dict[str, Any]]] = None
     category: Optional[CategoryResponse] = None
     offers: List[OfferResponse] = []
 
@@ -113,9 +118,17 @@ class ProductForVector(BaseModel):
     category_name: Optional[str] = Field(None, description="Category name")
     price: Optional[float] = Field(None, description="Product price")
     availability: Optional[str] = Field(None, description="Availability status")
+    price_min: Optional[float] = Field(None, description="Lowest price across offers")
+    price_max: Optional[float] = Field(None, description="Highest price across offers")
+    offer_availability: List[str] = Field(
+        default_factory=list, description="Availability statuses across offers"
+    )
     product_group_id: Optional[str] = Field(
         None, description="Product group ID as string"
     )
+    organization_urn: Optional[str] = Field(
+        None, description="URN of the organization that owns the product"
+    )
     variant_attrs: Dict[str, Any] = Field(
         default_factory=dict, description="Variant attributes"
     )
@@ -123,6 +136,8 @@ class ProductForVector(BaseModel):
     @classmethod
     def from_product_with_relations(cls, product) -> "ProductForVector":
         """Create ProductForVector from a Product model with loaded relations"""
+        offers = product.offers or []
+        prices = [offer.price for offer in offers if offer.price is not None]
         return cls(
             id=str(product.id),
             urn=product.urn,
@@ -132,9 +147,15 @@ class ProductForVector(BaseModel):
             category_name=product.category.name if product.category else None,
             price=product.offers[0].price if product.offers else None,
             availability=product.offers[0].availability if product.offers else None,
+            price_min=min(prices) if prices else None,
+            price_max=max(prices) if prices else None,
+            offer_availability=sorted(
+                {offer.availability for offer in offers if offer.availability}
+            ),
             product_group_id=(
                 str(product.product_group_id) if product.product_group_id else None
             ),
+            organization_urn=product.organization.urn if product.organization else None,
             variant_attrs=product.variant_attributes or {},
         )
 
@@ -158,6 +179,16 @@ class ProductSearchResponse(BaseModel):
     cmp_nodeVersion: Optional[str] = Field(
         None, alias="cmp:nodeVersion", description="Node version"
     )
+    cmp_degraded: bool = Field(
+        False,
+        alias="cmp:degraded",
+        description="True when a hybrid retriever was unavailable and results come from the remaining one",
+    )
+    cmp_nextCursor: Optional[str] = Field(
+        None,
+        alias="cmp:nextCursor",
+        description="Opaque cursor for the next page of results, absent on the last page",
+    )
     datePublished: Optional[str] = Field(
         None, description="Publication date in ISO format"
     )
@@ -319,3 +350,52 @@ class ProductByUrnResponse(BaseModel):
                 ],
             }
         }
+
+
+class BatchSearchQuery(BaseModel):
+    """One query of a batch product search"""
+
+    q: str = Field(..., min_length=1, max_length=500, description="Search query")
+    limit: int = Field(default=20, ge=1, le=100, description="Number of results")
+    price_min: Optional[float] = Field(
+        None, ge=0, description="Only products with an offer at or above this price"
+    )
+    price_max: Optional[float] = Field(
+        None, ge=0, description="Only products with an offer at or below this price"
+    )
+    brand: Optional[str] = Field(None, description="Brand name")
+    category: Optional[str] = Field(None, description="Category name")
+    availability: Optional[str] = Field(None, description="Offer availability")
+    organization_urn: Optional[str] = Field(
+        None, description="Only products from this organization (URN)"
+    )
+
+
+class BatchSearchRequest(BaseModel):
+    """Several product searches answered in one request"""
+
+    queries: List[BatchSearchQuery] = Field(
+        ..., min_length=1, description="Queries, answered in the same order"
+    )
+    collapse_variants: bool = Field(
+        False,
+        description="Return one product per product group, with `cmp:variantCount`",
+    )
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "queries": [
+                    {"q": "running shoes", "limit": 5, "category": "Footwear"},
+                    {"q": "running socks", "limit": 5, "price_max": 20},
+                ]
+            }
+        }
+
+
+class BatchSearchResponse(BaseModel):
+    """Batch product search response, one ItemList per query"""
+
+    results: List[ProductSearchResponse] = Field(
+        ..., description="Search results for each query, in request order"
+    )
@@ -35,6 +35,9 @@ class ProductGroupCreate(ProductGroupBase):
     raw_data: Optional[Dict[str, Any]] = Field(
         None, description="Full JSON-LD representation"
     )
+    media: List[Dict[str, Any]] = Field(
+        default_factory=list, description="Media objects extracted from raw_data"
+    )
 
 
 class ProductGroupUpdate(BaseModel):
@@ -49,6 +52,7 @@ class ProductGroupUpdate(BaseModel):
     brand_id: Optional[UUID] = None
     urn: Optional[str] = None
     raw_data: Optional[Dict[str, Any]] = None
+    media: Optional[List[Dict[str, Any]]] = None
     category_id: Optional[UUID] = None
     organization_id: Optional[UUID] = None
 
@@ -60,6 +64,7 @@ class ProductGroupInDB(ProductGroupBase):
     created_at: datetime
     updated_at: datetime
     raw_data: Optional[Dict[str, Any]] = None
+    media: Optional[List[Dict[str, Any]]] = None
     category: Optional[CategoryResponse] = None
 
     model_config = {"from_attributes": True}
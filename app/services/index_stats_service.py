@@ -0,0 +1,156 @@
+# app/services/index_stats_service.py
+import json
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from sqlalchemy import text
+
+from app.core.cache import get_redis_client
+from app.core.config import settings
+from app.db.base import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+INDEX_STATS_REDIS_KEY = "cmp:index_stats"
+
+# The snapshot row shared by the worker and the API processes
+_STORE_SQL = text(
+    """
+    INSERT INTO index_stats_snapshots (name, snapshot)
+    VALUES ('latest', CAST(:snapshot AS jsonb))
+    ON CONFLICT (name) DO UPDATE SET snapshot = EXCLUDED.snapshot, updated_at = now()
+    """
+)
+_LOAD_SQL = text("SELECT snapshot FROM index_stats_snapshots WHERE name = 'latest'")
+
+
+class IndexStatsService:
+    """Service for computing search index statistics off the request path"""
+
+    def __init__(self, db_session):
+        self.db_session = db_session
+
+    def compute(self) -> Dict[str, Any]:
+        """
+        Compute embedded product counts per organization and overall.
+
+        This scans the products table and is meant to run from the worker,
+        never from a request.
+        """
+        rows = self.db_session.execute(
+            text(
+                """
+                SELECT
+                    o.urn AS org_urn,
+                    COUNT(*) AS embedded_products,
+                    MAX(p.embedded_at) AS last_embedded_at
+                FROM products p
+                JOIN organizations o ON o.id = p.organization_id
+                WHERE p.embedding IS NOT NULL
+                GROUP BY o.urn
+                """
+            )
+        ).fetchall()
+
+        organizations = {}
+        last_embedded_at = None
+        for row in rows:
+            organizations[row.org_urn] = {
+                "embedded_products": row.embedded_products,
+                "last_embedded_at": _isoformat(row.last_embedded_at),
+            }
+            if row.last_embedded_at and (
+                last_embedded_at is None or row.last_embedded_at > last_embedded_at
+            ):
+                last_embedded_at = row.last_embedded_at
+
+        return {
+            "vector_provider": settings.VECTOR_PROVIDER,
+            "embedded_products": sum(
+                org["embedded_products"] for org in organizations.values()
+            ),
+            "last_embedded_at": _isoformat(last_embedded_at),
+            "organizations": organizations,
+            "refreshed_at": datetime.now(timezone.utc).isoformat(),
+        }
+
+
+def _isoformat(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+def _store_snapshot(db_session, snapshot: Dict[str, Any]):
+    """Save the snapshot row, then cache it in Redis if configured"""
+    db_session.execute(_STORE_SQL, {"snapshot": json.dumps(snapshot)})
+    db_session.commit()
+
+    redis_client = get_redis_client()
+    if redis_client is None:
+        return
+    try:
+        redis_client.set(INDEX_STATS_REDIS_KEY, json.dumps(snapshot))
+    except Exception as e:
+        logger.warning(f"Failed to store index stats in Redis: {e}")
+
+
+def _load_snapshot() -> Optional[Dict[str, Any]]:
+    """Read the snapshot row, a primary key lookup"""
+    db_session = SessionLocal()
+    try:
+        return db_session.execute(_LOAD_SQL).scalar()
+    finally:
+        db_session.close()
+
+
+def refresh_index_stats() -> Dict[str, Any]:
+    """Recompute index statistics and publish the snapshot"""
+    db_session = SessionLocal()
+    try:
+        snapshot = IndexStatsService(db_session).compute()
+        _store_snapshot(db_session, snapshot)
+    finally:
+        db_session.close()
+
+    logger.info(
+        f"Refreshed index stats: {snapshot['embedded_products']} embedded products "
+        f"across {len(snapshot['organizations'])} organizations"
+    )
+    return snapshot
+
+
+def _is_stale(snapshot: Dict[str, Any]) -> bool:
+    refreshed_at = datetime.fromisoformat(snapshot["refreshed_at"])
+    age = datetime.now(timezone.utc) - refreshed_at
+    return age.total_seconds() > settings.INDEX_STATS_MAX_AGE
+
+
+def get_index_stats() -> Optional[Dict[str, Any]]:
+    """
+    Get the latest index statistics snapshot without scanning the catalog.
+
+    Reads the snapshot cached in Redis when available, otherwise the
+    snapshot row the worker stored in the database. Snapshots are only
+    computed by the worker (``stats:refresh_index`` and after ingestion); one
+    older than INDEX_STATS_MAX_AGE is returned with ``stale`` set rather than
+    refreshed here. Blocks on Redis or the database, so async callers run it
+    in a thread.
+    """
+    snapshot = None
+    redis_client = get_redis_client()
+    if redis_client is not None:
+        try:
+            raw = redis_client.get(INDEX_STATS_REDIS_KEY)
+            if raw:
+                snapshot = json.loads(raw)
+        except Exception as e:
+            logger.warning(f"Failed to read index stats from Redis: {e}")
+    if snapshot is None:
+        try:
+            snapshot = _load_snapshot()
+        except Exception as e:
+            logger.warning(f"Failed to read index stats from the database: {e}")
+    if snapshot is None:
+        return None
+
+    return dict(snapshot, stale=_is_stale(snapshot))
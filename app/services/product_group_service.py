@@ -9,6 +9,7 @@ from app.schemas.product_group import (
     ProductGroupUpdate,
     ProductGroupInDB,
 )
+from app.utils.media import extract_media
 
 logger = logging.getLogger(__name__)
 
@@ -147,6 +148,7 @@ class ProductGroupService:
             brand_id=brand_id,
             urn=urn,
             raw_data=product_group_data,
+            media=extract_media(product_group_data),
             category_id=category_id,
             organization_id=organization_id,
         )
@@ -210,6 +212,7 @@ class ProductGroupService:
                 brand_id=brand_id,
                 urn=urn,
                 raw_data=pg_data,
+                media=extract_media(pg_data),
                 category_id=category.id,
                 organization_id=organization_id,
             )
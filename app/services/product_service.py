@@ -3,6 +3,7 @@ from typing import List, Optional, Dict, Any
 from uuid import UUID
 import logging
 from app.db.repositories.product_repository import ProductRepository
+from app.db.repositories.product_search_card_repository import ProductSearchCardRepository
 from app.services.category_service import CategoryService
 from app.services.product_group_service import ProductGroupService
 from app.schemas.product import (
@@ -12,6 +13,7 @@ from app.schemas.product import (
     PropertyValueBase,
 )
 from app.db.models.brand import Brand
+from app.utils.media import extract_media
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +24,7 @@ class ProductService:
     def __init__(self, db_session):
         self.db_session = db_session
         self.product_repo = ProductRepository(db_session)
+        self.search_card_repo = ProductSearchCardRepository(db_session)
         self.category_service = CategoryService(db_session)
         self.product_group_service = ProductGroupService(db_session)
 
@@ -264,6 +267,7 @@ class ProductService:
             urn=urn,
             variant_attributes=variant_attributes,
             raw_data=product_data,
+            media=self._extract_product_media(product_data, product_group),
             additional_properties=additional_properties,
             category_id=category_id,
             organization_id=organization_id,
@@ -315,6 +319,21 @@ class ProductService:
         # Very basic implementation - for production, use a proper slugify library
         return text.lower().replace(" ", "-").replace("&", "").replace("_", "-")
 
+    def refresh_search_cards(self, product_ids: List[UUID]) -> int:
+        """Rebuild the search cards of the given products and commit"""
+        refreshed = self.search_card_repo.refresh(product_ids)
+        self.db_session.commit()
+        return refreshed
+
+    def _extract_product_media(
+        self, product_data: Dict[str, Any], product_group: Optional[Any]
+    ) -> List[Dict[str, Any]]:
+        """Media of a product JSON-LD, falling back to its product group's media"""
+        media = extract_media(product_data)
+        if not media and product_group is not None and product_group.media:
+            media = list(product_group.media)
+        return media
+
     def bulk_process_products(
         self, products_data: List[Dict[str, Any]], brand_id: UUID, category_name: str, batch_size: int = 1000
     ) -> List[ProductInDB]:
@@ -391,6 +410,7 @@ class ProductService:
                 urn=urn,
                 variant_attributes=variant_attributes,
                 raw_data=product_data,
+                media=self._extract_product_media(product_data, product_group),
                 additional_properties=additional_properties,
                 category_id=category.id,
                 organization_id=organization_id,
@@ -1,4 +1,5 @@
 from .factory import SearchServiceFactory
 from .base import BaseSearchService
+from .filters import SearchFilters
 
-__all__ = ["SearchServiceFactory", "BaseSearchService"]
\ No newline at end of file
+__all__ = ["SearchServiceFactory", "BaseSearchService", "SearchFilters"]
@@ -1,6 +1,11 @@
 from abc import ABC, abstractmethod
 from typing import List, Dict, Any, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
+
+from app.core.metrics import time_search_stage
+from .executor import run_in_search_executor
+from .filters import SearchFilters
+from .rerank import get_reranker
 
 @dataclass
 class SearchResult:
@@ -21,6 +26,9 @@ class SearchResult:
     product_description: Optional[str] = None
     product_url: Optional[str] = None
     product_media: Optional[List[Dict[str, Any]]] = None
+    # Set when variants are collapsed: matching variants of the product's group
+    variant_count: Optional[int] = None
+    product_group_urn: Optional[str] = None
 
 
 class BaseSearchService(ABC):
@@ -28,6 +36,10 @@ class BaseSearchService(ABC):
     
     def __init__(self, db_session):
         self.db_session = db_session
+        # Names of retrievers that failed or timed out during the last search
+        self.degraded_retrievers: List[str] = []
+        # Return one product per product group (see ``collapse_by_group``)
+        self.collapse_variants = False
     
     @abstractmethod
     def search_products(
@@ -36,6 +48,127 @@ class BaseSearchService(ABC):
         top_k: int = 20,
         alpha: float = 0.7,
         include_metadata: bool = True,
+        filters: Optional[SearchFilters] = None,
+    ) -> List[SearchResult]:
+        """Search for products, optionally restricted by structured filters"""
+        pass
+    
+    async def asearch_products(
+        self,
+        query: str,
+        top_k: int = 20,
+        alpha: float = 0.7,
+        include_metadata: bool = True,
+        filters: Optional[SearchFilters] = None,
+    ) -> List[SearchResult]:
+        """Search for products without blocking the event loop.
+        
+        The default implementation runs ``search_products`` in the bounded
+        search thread pool. Services with async clients can override it.
+        """
+        return await run_in_search_executor(
+            self.search_products, query, top_k, alpha, include_metadata, filters
+        )
+    
+    def retrieve_candidates(
+        self,
+        query: str,
+        top_k: int = 100,
+        alpha: float = 0.7,
+        filters: Optional[SearchFilters] = None,
+    ) -> List[SearchResult]:
+        """Rank up to top_k candidates for the query.
+        
+        Candidates only need ``id`` and the scores; ``enrich_results`` loads
+        product details for the slice that is actually returned. The default
+        implementation returns fully enriched results.
+        """
+        return self.search_products(query, top_k, alpha, True, filters)
+    
+    async def aretrieve_candidates(
+        self,
+        query: str,
+        top_k: int = 100,
+        alpha: float = 0.7,
+        filters: Optional[SearchFilters] = None,
     ) -> List[SearchResult]:
-        """Search for products"""
-        pass
\ No newline at end of file
+        """Async variant of ``retrieve_candidates``"""
+        return await run_in_search_executor(
+            self.retrieve_candidates, query, top_k, alpha, filters
+        )
+    
+    def rerank(self, candidates: List[SearchResult]) -> List[SearchResult]:
+        """Re-order fused candidates before they are paged.
+        
+        The default implementation applies the configured re-ranking model
+        (SEARCH_RERANK_ENABLED), which only uses features already present on
+        the candidates. Services can override it with their own stage.
+        """
+        reranker = get_reranker()
+        if reranker is None:
+            return candidates
+        with time_search_stage("rerank"):
+            return reranker.rerank(candidates)
+    
+    def enrich_results(self, candidates: List[SearchResult]) -> List[SearchResult]:
+        """Load product details for ranked candidates, keeping their order"""
+        return candidates
+    
+    async def aenrich_results(self, candidates: List[SearchResult]) -> List[SearchResult]:
+        """Async variant of ``enrich_results``"""
+        return await run_in_search_executor(self.enrich_results, candidates)
+    
+    async def aretrieve_candidates_batch(
+        self,
+        queries: List[str],
+        top_k: int = 100,
+        filters: Optional[List[Optional[SearchFilters]]] = None,
+    ) -> List[List[SearchResult]]:
+        """Rank candidates for several queries, one list per query.
+        
+        The default implementation ranks the queries one after another in a
+        single search pool job, since the database session is not thread safe.
+        """
+        filters = filters or [None] * len(queries)
+        
+        def retrieve_all():
+            return [
+                self.retrieve_candidates(query, top_k, filters=query_filters)
+                for query, query_filters in zip(queries, filters)
+            ]
+        
+        return await run_in_search_executor(retrieve_all)
+    
+    async def aenrich_results_batch(
+        self, pages: List[List[SearchResult]]
+    ) -> List[List[SearchResult]]:
+        """Enrich several result pages with one lookup for the union of their products.
+        
+        Each result keeps its own scores. Results whose product details cannot
+        be loaded are dropped, as with ``enrich_results`` on pgvector.
+        """
+        unique: Dict[str, SearchResult] = {}
+        for page in pages:
+            for candidate in page:
+                unique.setdefault(candidate.id, candidate)
+        if not unique:
+            return [[] for _ in pages]
+        
+        enriched = await self.aenrich_results(list(unique.values()))
+        details = {result.id: result for result in enriched}
+        return [
+            [
+                replace(
+                    details[c.id],
+                    score=c.score,
+                    dense_score=c.dense_score,
+                    sparse_score=c.sparse_score,
+                    variant_count=c.variant_count,
+                    product_group_urn=c.product_group_urn,
+                    metadata=dict(details[c.id].metadata),
+                )
+                for c in page
+                if c.id in details
+            ]
+            for page in pages
+        ]
@@ -0,0 +1,65 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.core.metrics import time_search_stage
+from app.utils.formatters import format_product_search_response
+from .base import BaseSearchService
+from .executor import run_in_search_executor
+from .pagination import BatchQuery, search_pages
+from .result_cache import get_search_result_cache
+
+
+async def search_batch(
+    queries: List[BatchQuery],
+    create_service: Callable[[], BaseSearchService],
+    collapse_variants: bool = False,
+) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """
+    Answer several searches with one embedding call, one ranking pass and one
+    enrichment lookup.
+
+    Queries with a cached first page are served from the search result cache
+    and share its entries with single searches; the search service is only
+    created when at least one query misses. ``collapse_variants`` must match
+    the mode of the services ``create_service`` returns.
+
+    Returns:
+        Tuple of (formatted ItemList response per query, in order; names of
+        retrievers that were unavailable)
+    """
+    responses: List[Optional[Dict[str, Any]]] = [None] * len(queries)
+    keys: List[Optional[str]] = [None] * len(queries)
+    cache = get_search_result_cache()
+    if cache:
+        # Key generation and lookups may call Redis, so keep them off the event loop
+        lookups = await run_in_search_executor(
+            lambda: [
+                cache.lookup(
+                    q.query, q.limit, q.filters, cursor=None, collapse_variants=collapse_variants
+                )
+                for q in queries
+            ]
+        )
+        for i, (key, response) in enumerate(lookups):
+            keys[i], responses[i] = key, response
+
+    misses = [i for i, response in enumerate(responses) if response is None]
+    degraded: List[str] = []
+    if misses:
+        search_service = create_service()
+        pages = await search_pages(search_service, [queries[i] for i in misses])
+        degraded = search_service.degraded_retrievers
+
+        with time_search_stage("formatting"):
+            for i, page in zip(misses, pages):
+                responses[i] = format_product_search_response(
+                    page.results, degraded=bool(degraded), next_cursor=page.next_cursor
+                )
+
+        # Degraded results are not cached so a recovered retriever is used right away
+        if cache and not degraded:
+            entries = [(keys[i], responses[i]) for i in misses if keys[i]]
+            await run_in_search_executor(
+                lambda: [cache.set(key, response) for key, response in entries]
+            )
+
+    return responses, degraded
@@ -0,0 +1,29 @@
+from typing import Dict, List
+
+from .base import SearchResult
+
+
+def collapse_by_group(candidates: List[SearchResult], top_k: int) -> List[SearchResult]:
+    """
+    Keep the best ranked product of each product group.
+
+    Candidates are grouped on ``metadata["product_group_id"]`` (products
+    without a group stand alone) and each representative's ``variant_count``
+    is set to the number of its group's variants among the candidates.
+
+    Returns:
+        Up to top_k representatives, in rank order
+    """
+    representatives: Dict[str, SearchResult] = {}
+    counts: Dict[str, int] = {}
+    for candidate in candidates:
+        group = (candidate.metadata or {}).get("product_group_id") or candidate.id
+        group = str(group)
+        counts[group] = counts.get(group, 0) + 1
+        representatives.setdefault(group, candidate)
+
+    collapsed = []
+    for group, candidate in representatives.items():
+        candidate.variant_count = counts[group]
+        collapsed.append(candidate)
+    return collapsed[:top_k]
@@ -0,0 +1,163 @@
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+import asyncio
+import contextvars
+import functools
+import logging
+import threading
+import time
+
+from app.core.config import settings
+from app.core.metrics import SEARCH_FALLBACKS, time_search_stage
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_executor: Optional[ThreadPoolExecutor] = None
+_retriever_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_search_executor() -> ThreadPoolExecutor:
+    """Get the bounded thread pool used to run blocking search I/O.
+
+    The pool is sized by SEARCH_MAX_CONCURRENCY, which defaults to the
+    database pool size so offloaded searches never queue on connections.
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=max(1, settings.SEARCH_MAX_CONCURRENCY),
+                    thread_name_prefix="search",
+                )
+    return _executor
+
+
+def get_retriever_executor() -> ThreadPoolExecutor:
+    """Get the thread pool used to fan out retriever calls within one search.
+
+    This is kept separate from the search pool so a search that is itself
+    running in the search pool can never deadlock waiting on its retrievers.
+    """
+    global _retriever_executor
+    if _retriever_executor is None:
+        with _executor_lock:
+            if _retriever_executor is None:
+                _retriever_executor = ThreadPoolExecutor(
+                    max_workers=max(2, settings.SEARCH_RETRIEVER_CONCURRENCY),
+                    thread_name_prefix="retriever",
+                )
+    return _retriever_executor
+
+
+def fan_out(
+    calls: Dict[str, Callable[[], T]], timeouts: Dict[str, float]
+) -> Tuple[Dict[str, T], List[str]]:
+    """Run retriever calls concurrently, each bounded by its own timeout.
+
+    Args:
+        calls: Retriever name to zero-argument callable
+        timeouts: Retriever name to timeout in seconds, measured from submission
+
+    Returns:
+        Tuple of (results for the retrievers that succeeded, names of the
+        retrievers that failed or timed out)
+    """
+    executor = get_retriever_executor()
+    start = time.monotonic()
+    # Each call runs in a copy of the caller's context so request-scoped
+    # context variables (metrics labels, timings) are visible to it
+    futures = {
+        name: executor.submit(contextvars.copy_context().run, call)
+        for name, call in calls.items()
+    }
+
+    results: Dict[str, T] = {}
+    failed: List[str] = []
+    for name, future in futures.items():
+        remaining = max(0.0, start + timeouts[name] - time.monotonic())
+        try:
+            results[name] = future.result(timeout=remaining)
+        except FutureTimeoutError:
+            # The call cannot be interrupted; it finishes in the background and is discarded
+            future.cancel()
+            logger.warning(f"Retriever '{name}' timed out after {timeouts[name]:.2f}s")
+            failed.append(name)
+        except Exception as e:
+            logger.warning(f"Retriever '{name}' failed: {e}")
+            failed.append(name)
+    return results, failed
+
+
+def search_dense_and_sparse(
+    repository,
+    query: str,
+    fetch_k: int,
+    alpha: float = 0.7,
+    include_metadata: bool = True,
+    metadata_filter: Optional[Dict[str, Any]] = None,
+    backend: str = "pinecone",
+) -> Tuple[Any, Any, List[str]]:
+    """Query a repository's dense and sparse indices concurrently.
+
+    Each retriever runs under its own timeout and records its duration as a
+    search stage. If one fails or times out its results are treated as empty
+    and its name is returned in the list of degraded retrievers.
+
+    Raises:
+        RuntimeError: If both retrievers fail
+    """
+    args = (query, fetch_k, alpha, include_metadata)
+    if metadata_filter is not None:
+        args += (metadata_filter,)
+
+    def timed(stage: str, func: Callable[..., T]) -> Callable[[], T]:
+        def call():
+            with time_search_stage(stage, backend=backend):
+                return func(*args)
+        return call
+
+    results, degraded = fan_out(
+        {
+            "dense": timed("dense", repository._search_dense_index),
+            "sparse": timed("sparse", repository._search_sparse_index),
+        },
+        {
+            "dense": settings.PINECONE_DENSE_TIMEOUT,
+            "sparse": settings.PINECONE_SPARSE_TIMEOUT,
+        },
+    )
+    if not results:
+        raise RuntimeError("Both dense and sparse retrievers failed")
+    if degraded:
+        logger.warning(f"Degraded search, unavailable retrievers: {degraded}")
+        for name in degraded:
+            SEARCH_FALLBACKS.labels(backend=backend, reason=f"{name}_unavailable").inc()
+    return (
+        results.get("dense", {"results": []}),
+        results.get("sparse", {"results": []}),
+        degraded,
+    )
+
+
+async def run_in_search_executor(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking callable in the search thread pool without blocking the event loop"""
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(
+        get_search_executor(), functools.partial(context.run, func, *args, **kwargs)
+    )
+
+
+def shutdown_search_executor():
+    """Shut down the search thread pools, waiting for in-flight searches"""
+    global _executor, _retriever_executor
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
+    if _retriever_executor is not None:
+        _retriever_executor.shutdown(wait=False, cancel_futures=True)
+        _retriever_executor = None
@@ -5,6 +5,7 @@ from app.core.config import settings
 from .base import BaseSearchService
 from .pinecone_search import PineconeSearchService
 from .pgvector_search import PgVectorSearchService
+from .local_search import LocalSearchService
 
 logger = logging.getLogger(__name__)
 
@@ -15,15 +16,17 @@ class SearchServiceFactory:
     _services = {
         "pinecone": PineconeSearchService,
         "pgvector": PgVectorSearchService,
+        "local": LocalSearchService,
     }
     
     @classmethod
-    def create(cls, db_session) -> BaseSearchService:
+    def create(cls, db_session, collapse_variants: bool = False) -> BaseSearchService:
         """
         Create a search service instance based on VECTOR_PROVIDER setting
         
         Args:
             db_session: Database session
+            collapse_variants: Return one product per product group
             
         Returns:
             BaseSearchService instance
@@ -39,7 +42,9 @@ class SearchServiceFactory:
         service_class = cls._services[provider]
         logger.info(f"Creating search service for provider: {provider}")
         
-        return service_class(db_session)
+        service = service_class(db_session)
+        service.collapse_variants = collapse_variants
+        return service
     
     @classmethod
     def register_service(cls, provider: str, service_class: Type[BaseSearchService]):
@@ -0,0 +1,111 @@
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Optional, Tuple
+
+
+@dataclass
+class SearchFilters:
+    """Structured search filters pushed down into the vector query"""
+
+    price_min: Optional[float] = None
+    price_max: Optional[float] = None
+    brand: Optional[str] = None
+    category: Optional[str] = None
+    availability: Optional[str] = None
+    organization_urn: Optional[str] = None
+
+    def is_empty(self) -> bool:
+        """True when no filter is set"""
+        return all(value is None for value in asdict(self).values())
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Set filters only, e.g. for logging and cache keys"""
+        return {key: value for key, value in asdict(self).items() if value is not None}
+
+
+def to_sql(filters: SearchFilters, alias: str = "p") -> Tuple[str, Dict[str, Any]]:
+    """
+    Build a SQL predicate over the products table for the given filters.
+
+    Brand and category match names case-insensitively. Price and
+    availability must be satisfied by the same offer.
+
+    Args:
+        filters: Search filters
+        alias: Alias of the products table in the surrounding query
+
+    Returns:
+        Tuple of (predicate joined with AND, bind parameters); the predicate
+        is "TRUE" when no filter is set
+    """
+    clauses = []
+    params: Dict[str, Any] = {}
+
+    if filters.brand is not None:
+        clauses.append(
+            f"{alias}.brand_id IN (SELECT id FROM brands WHERE lower(name) = lower(:filter_brand))"
+        )
+        params["filter_brand"] = filters.brand
+
+    if filters.category is not None:
+        clauses.append(
+            f"{alias}.category_id IN (SELECT id FROM categories WHERE lower(name) = lower(:filter_category))"
+        )
+        params["filter_category"] = filters.category
+
+    if filters.organization_urn is not None:
+        clauses.append(
+            f"{alias}.organization_id IN (SELECT id FROM organizations WHERE urn = :filter_org_urn)"
+        )
+        params["filter_org_urn"] = filters.organization_urn
+
+    offer_clauses = []
+    if filters.price_min is not None:
+        offer_clauses.append("o.price >= :filter_price_min")
+        params["filter_price_min"] = filters.price_min
+    if filters.price_max is not None:
+        offer_clauses.append("o.price <= :filter_price_max")
+        params["filter_price_max"] = filters.price_max
+    if filters.availability is not None:
+        offer_clauses.append("o.availability = :filter_availability")
+        params["filter_availability"] = filters.availability
+    if offer_clauses:
+        clauses.append(
+            f"EXISTS (SELECT 1 FROM offers o WHERE o.product_id = {alias}.id AND "
+            + " AND ".join(offer_clauses)
+            + ")"
+        )
+
+    return (" AND ".join(clauses) or "TRUE"), params
+
+
+def to_pinecone_filter(filters: SearchFilters) -> Optional[Dict[str, Any]]:
+    """
+    Build a Pinecone metadata filter for the given filters.
+
+    Matches the metadata written by VectorService._add_metadata and follows
+    to_sql: brand and category match the lower-cased names, and price and
+    availability match any of the product's offers. The metadata keeps only
+    the price range across offers, so when a price range and availability are
+    combined they may be satisfied by different offers, and a range that
+    falls between two offers' prices still matches. Returns None when no
+    filter is set.
+    """
+    conditions: Dict[str, Any] = {}
+
+    # Some offer is at least price_min (the highest price is) and some offer
+    # is at most price_max (the lowest price is)
+    if filters.price_min is not None:
+        conditions["price_max"] = {"$gte": filters.price_min}
+    if filters.price_max is not None:
+        conditions["price_min"] = {"$lte": filters.price_max}
+
+    if filters.brand is not None:
+        conditions["brand_lower"] = {"$eq": filters.brand.lower()}
+    if filters.category is not None:
+        conditions["category_lower"] = {"$eq": filters.category.lower()}
+    if filters.availability is not None:
+        conditions["offer_availability"] = {"$in": [filters.availability]}
+    if filters.organization_urn is not None:
+        conditions["organization_urn"] = {"$eq": filters.organization_urn}
+
+    return conditions or None
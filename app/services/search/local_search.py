@@ -0,0 +1,101 @@
+from typing import List, Optional
+import time
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.metrics import time_search_stage
+from app.vectors.providers.local import get_local_vector_provider
+from .base import SearchResult
+from .collapse import collapse_by_group
+from .executor import run_in_search_executor
+from .filters import SearchFilters, to_pinecone_filter
+from .pgvector_search import PgVectorSearchService
+
+logger = get_logger(__name__)
+
+
+class LocalSearchService(PgVectorSearchService):
+    """
+    Handles similarity search against the in-process NumPy vector index.
+
+    Ranking needs no database round trip; only the returned page is enriched
+    with product details from the database, the same way as pgvector.
+    """
+
+    def search_products(
+        self,
+        query: str,
+        top_k: int = 20,
+        alpha: float = 0.7,
+        include_metadata: bool = True,
+        filters: Optional[SearchFilters] = None,
+    ) -> List[SearchResult]:
+        """Search for products in the local vector index"""
+        start_time = time.time()
+        logger.info(f"🔍 Searching local vector index for query: '{query}'")
+
+        query_embedding = self._get_query_embedding(query)
+        results = self._search_and_enrich(query_embedding, top_k, filters)
+
+        logger.info(
+            f"✅ Search completed in {time.time() - start_time:.3f}s, found {len(results)} results"
+        )
+        return results
+
+    async def asearch_products(
+        self,
+        query: str,
+        top_k: int = 20,
+        alpha: float = 0.7,
+        include_metadata: bool = True,
+        filters: Optional[SearchFilters] = None,
+    ) -> List[SearchResult]:
+        """Search for products in the local vector index without blocking the event loop"""
+        start_time = time.time()
+        logger.info(f"🔍 Searching local vector index for query: '{query}'")
+
+        query_embedding = await self._aget_query_embedding(query)
+        results = await run_in_search_executor(
+            self._search_and_enrich, query_embedding, top_k, filters
+        )
+
+        logger.info(
+            f"✅ Search completed in {time.time() - start_time:.3f}s, found {len(results)} results"
+        )
+        return results
+
+    def _search_and_enrich(
+        self,
+        embedding: List[float],
+        top_k: int,
+        filters: Optional[SearchFilters] = None,
+    ) -> List[SearchResult]:
+        return self.enrich_results(self._search_candidates(embedding, top_k, filters))
+
+    def _search_candidates(
+        self,
+        embedding: List[float],
+        top_k: int,
+        filters: Optional[SearchFilters] = None,
+        query: Optional[str] = None,
+    ) -> List[SearchResult]:
+        """Rank products by exact inner product in the local index"""
+        metadata_filter = to_pinecone_filter(filters) if filters else None
+        rank_k = top_k * settings.SEARCH_COLLAPSE_FETCH_FACTOR if self.collapse_variants else top_k
+        with time_search_stage("retrieval"):
+            hits = get_local_vector_provider().search_by_vector(
+                settings.LOCAL_VECTOR_INDEX, embedding, rank_k, filter=metadata_filter
+            )
+        candidates = [
+            SearchResult(
+                id=hit.id,
+                score=hit.score,
+                metadata=dict(hit.metadata or {}),
+                dense_score=hit.score,
+            )
+            for hit in hits
+            if hit.metadata and hit.metadata.get("product_id")
+        ]
+        if self.collapse_variants:
+            candidates = collapse_by_group(candidates, top_k)
+        return candidates
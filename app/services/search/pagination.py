@@ -0,0 +1,319 @@
+import base64
+import binascii
+import hashlib
+import json
+import logging
+import uuid
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from app.core.cache import LRUCache, get_redis_client
+from app.core.config import settings
+from app.core.metrics import SEARCH_CACHE_REQUESTS, SEARCH_FALLBACKS
+from .base import BaseSearchService, SearchResult
+from .executor import run_in_search_executor
+from .filters import SearchFilters
+from .rerank import rerank_config
+
+logger = logging.getLogger(__name__)
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a search cursor is malformed or belongs to another search"""
+
+
+@dataclass
+class SearchPage:
+    """One page of enriched search results"""
+
+    results: List[SearchResult]
+    offset: int = 0
+    next_cursor: Optional[str] = None
+    total_candidates: int = 0
+
+
+def _search_fingerprint(
+    query: str, filters: Optional[SearchFilters], collapse_variants: bool = False
+) -> str:
+    """
+    Short digest tying a cursor to the query, filters and ranking mode
+    (variant collapsing and re-ranking model) it was issued for
+    """
+    payload = json.dumps(
+        {
+            "q": " ".join(query.lower().split()),
+            "filters": filters.to_dict() if filters else {},
+            "backend": settings.VECTOR_PROVIDER,
+            "collapse_variants": collapse_variants,
+            "rerank": rerank_config(),
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def encode_cursor(candidates_id: str, offset: int, fingerprint: str) -> str:
+    """Encode the position in a cached candidate list as an opaque token"""
+    raw = json.dumps({"c": candidates_id, "o": offset, "f": fingerprint})
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, int, str]:
+    """
+    Decode a cursor produced by ``encode_cursor``.
+
+    Returns:
+        Tuple of (candidate list id, offset, search fingerprint)
+
+    Raises:
+        InvalidCursorError: If the cursor cannot be decoded
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return str(data["c"]), int(data["o"]), str(data["f"])
+    except (binascii.Error, ValueError, KeyError, TypeError, UnicodeError) as e:
+        raise InvalidCursorError(f"Invalid cursor: {e}")
+
+
+class CandidateStore:
+    """
+    Two-tier store for fused candidate rankings, so later pages can be
+    served without re-embedding the query or re-querying the index.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1000,
+        ttl_seconds: int = 900,
+        redis_client=None,
+        key_prefix: str = "cmp:candidates",
+    ):
+        self.local = LRUCache(max_size=max_size, ttl_seconds=ttl_seconds)
+        self.redis = redis_client
+        self.ttl_seconds = ttl_seconds
+        self.key_prefix = key_prefix
+
+    def put(self, candidates: List[SearchResult]) -> str:
+        """Store a ranking and return its id"""
+        candidates_id = uuid.uuid4().hex
+        payload = [
+            {
+                "id": c.id,
+                "score": c.score,
+                "metadata": c.metadata,
+                "dense_score": c.dense_score,
+                "sparse_score": c.sparse_score,
+                "variant_count": c.variant_count,
+                "product_group_urn": c.product_group_urn,
+            }
+            for c in candidates
+        ]
+        self.local.set(candidates_id, payload)
+
+        if self.redis is not None:
+            try:
+                self.redis.set(
+                    f"{self.key_prefix}:{candidates_id}",
+                    json.dumps(payload, default=str),
+                    ex=self.ttl_seconds or None,
+                )
+            except Exception as e:
+                logger.warning(f"Candidate store Redis write failed: {e}")
+        return candidates_id
+
+    def get(self, candidates_id: str) -> Optional[List[SearchResult]]:
+        """Return a stored ranking as fresh SearchResult objects, or None if expired"""
+        payload = self.local.get(candidates_id)
+        if payload is None and self.redis is not None:
+            try:
+                raw = self.redis.get(f"{self.key_prefix}:{candidates_id}")
+            except Exception as e:
+                logger.warning(f"Candidate store Redis lookup failed: {e}")
+                raw = None
+            if raw:
+                payload = json.loads(raw)
+                self.local.set(candidates_id, payload)
+
+        if payload is None:
+            return None
+        # Enrichment mutates results, so never hand out the stored objects
+        return [SearchResult(**dict(item, metadata=dict(item["metadata"]))) for item in payload]
+
+
+_candidate_store: Optional[CandidateStore] = None
+
+
+def get_candidate_store() -> CandidateStore:
+    """Get the process-wide candidate store"""
+    global _candidate_store
+    if _candidate_store is None:
+        _candidate_store = CandidateStore(
+            max_size=settings.SEARCH_CURSOR_CACHE_SIZE,
+            ttl_seconds=settings.SEARCH_CURSOR_TTL,
+            redis_client=get_redis_client(),
+        )
+    return _candidate_store
+
+
+def check_cursor(
+    cursor: str,
+    query: str,
+    filters: Optional[SearchFilters] = None,
+    collapse_variants: bool = False,
+) -> Tuple[str, int]:
+    """
+    Decode a cursor and check that it was issued for this query, filters and
+    ranking mode.
+
+    Returns:
+        Tuple of (candidate list id, offset)
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed or was issued for a
+            different query, filters or ranking mode
+    """
+    candidates_id, offset, cursor_fingerprint = decode_cursor(cursor)
+    if cursor_fingerprint != _search_fingerprint(query, filters, collapse_variants):
+        raise InvalidCursorError("Cursor does not match this query and filters")
+    if offset < 0:
+        raise InvalidCursorError("Invalid cursor offset")
+    return candidates_id, offset
+
+
+async def rank_page(
+    search_service: BaseSearchService,
+    query: str,
+    limit: int,
+    cursor: Optional[str] = None,
+    filters: Optional[SearchFilters] = None,
+) -> SearchPage:
+    """
+    Return one page of ranked, not yet enriched candidates for a search.
+
+    The first page ranks up to SEARCH_CANDIDATE_POOL candidates, re-ranks
+    them (``BaseSearchService.rerank``) and stores the ranking. Following
+    pages slice the stored ranking; if it has expired the candidates are
+    ranked again and the same offset is served.
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed or was issued for a
+            different query, filters or ranking mode
+    """
+    fingerprint = _search_fingerprint(query, filters, search_service.collapse_variants)
+    store = get_candidate_store()
+
+    offset = 0
+    candidates = None
+    candidates_id = None
+    if cursor:
+        candidates_id, offset = check_cursor(
+            cursor, query, filters, search_service.collapse_variants
+        )
+        # The store may call Redis, so keep it off the event loop
+        candidates = await run_in_search_executor(store.get, candidates_id)
+        SEARCH_CACHE_REQUESTS.labels(
+            cache="cursor", result="miss" if candidates is None else "hit"
+        ).inc()
+        if candidates is None:
+            logger.info("Search cursor expired, ranking candidates again")
+            SEARCH_FALLBACKS.labels(
+                backend=settings.VECTOR_PROVIDER, reason="cursor_expired"
+            ).inc()
+
+    if candidates is None:
+        pool_size = max(limit, settings.SEARCH_CANDIDATE_POOL)
+        candidates = search_service.rerank(
+            await search_service.aretrieve_candidates(query, top_k=pool_size, filters=filters)
+        )
+        candidates_id = await run_in_search_executor(store.put, candidates)
+
+    next_offset = offset + limit
+    next_cursor = (
+        encode_cursor(candidates_id, next_offset, fingerprint)
+        if next_offset < len(candidates)
+        else None
+    )
+    return SearchPage(
+        results=candidates[offset : offset + limit],
+        offset=offset,
+        next_cursor=next_cursor,
+        total_candidates=len(candidates),
+    )
+
+
+async def search_page(
+    search_service: BaseSearchService,
+    query: str,
+    limit: int,
+    cursor: Optional[str] = None,
+    filters: Optional[SearchFilters] = None,
+) -> SearchPage:
+    """
+    Return one page of enriched results for a search.
+
+    Ranks the page like ``rank_page`` and enriches only its ``limit`` results.
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed or was issued for a
+            different query or filters
+    """
+    page = await rank_page(search_service, query, limit, cursor=cursor, filters=filters)
+    if page.results:
+        page.results = await search_service.aenrich_results(page.results)
+    return page
+
+
+@dataclass
+class BatchQuery:
+    """One query of a batch search"""
+
+    query: str
+    limit: int = 20
+    filters: Optional[SearchFilters] = None
+
+
+async def search_pages(
+    search_service: BaseSearchService, queries: List[BatchQuery]
+) -> List[SearchPage]:
+    """
+    Return the first page of enriched results for each of several searches.
+
+    The queries are ranked together (``aretrieve_candidates_batch``) and the
+    union of the returned products is enriched in one lookup. Each ranking is
+    stored like a ``search_page`` first page, so ``next_cursor`` continues a
+    query through the single search endpoint.
+    """
+    pool_size = max(max(q.limit for q in queries), settings.SEARCH_CANDIDATE_POOL)
+    rankings = await search_service.aretrieve_candidates_batch(
+        [q.query for q in queries], top_k=pool_size, filters=[q.filters for q in queries]
+    )
+    rankings = [search_service.rerank(candidates) for candidates in rankings]
+    results = await search_service.aenrich_results_batch(
+        [candidates[: q.limit] for q, candidates in zip(queries, rankings)]
+    )
+
+    store = get_candidate_store()
+    # Only rankings with a following page are stored, in one executor job
+    paged = [
+        i for i, (q, candidates) in enumerate(zip(queries, rankings)) if q.limit < len(candidates)
+    ]
+    stored = await run_in_search_executor(lambda: [store.put(rankings[i]) for i in paged])
+    stored_ids = dict(zip(paged, stored))
+    pages = []
+    for i, (q, candidates, page_results) in enumerate(zip(queries, rankings, results)):
+        next_cursor = None
+        if i in stored_ids:
+            next_cursor = encode_cursor(
+                stored_ids[i],
+                q.limit,
+                _search_fingerprint(q.query, q.filters, search_service.collapse_variants),
+            )
+        pages.append(
+            SearchPage(
+                results=page_results,
+                next_cursor=next_cursor,
+                total_candidates=len(candidates),
+            )
+        )
+    return pages
@@ -2,19 +2,136 @@ from typing import List, Dict, Any, Optional
 import time
 import logging
 from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
 import numpy as np
 
 from app.core.config import settings
 from app.core.logging import get_logger
+from app.core.metrics import SEARCH_FALLBACKS, time_search_stage
 from app.db.repositories.product_repository import ProductRepository
+from app.db.repositories.product_search_card_repository import OFFERS_JSON_SQL
+from app.embeddings import (
+    aget_query_embedding,
+    aget_query_embeddings,
+    get_query_embedding,
+    truncate_embedding,
+)
 from .base import BaseSearchService, SearchResult
+from .executor import run_in_search_executor
+from .filters import SearchFilters, to_sql
+from .rerank import get_reranker
+from .semantic_cache import get_semantic_cache, semantic_partition
 
 logger = get_logger(__name__)
 
+# Lexical query matching the search_tsv trigger: English stems for prose,
+# unstemmed tokens for SKUs and brand names
+_TSQUERY_SQL = (
+    "websearch_to_tsquery('english', :text_query) || "
+    "websearch_to_tsquery('simple', :text_query)"
+)
+
+# Raises hnsw.ef_search for the current transaction without lowering a larger
+# configured value; an HNSW index scan returns at most ef_search rows
+_EF_SEARCH_SQL = (
+    "SELECT set_config('hnsw.ef_search', "
+    "CAST(GREATEST(CAST(current_setting('hnsw.ef_search', true) AS int), :ef_search) AS text), "
+    "true)"
+)
+
+# Upper bound pgvector accepts for hnsw.ef_search
+_MAX_EF_SEARCH = 1000
+
+# HNSW expression index each PGVECTOR_QUANTIZATION mode searches, by name
+QUANTIZED_INDEXES = {
+    "halfvec": (
+        "idx_products_embedding_halfvec",
+        "hnsw ((embedding::halfvec({dimension})) halfvec_cosine_ops)",
+    ),
+    "binary": (
+        "idx_products_embedding_binary",
+        "hnsw ((binary_quantize(embedding)::bit({dimension})) bit_hamming_ops)",
+    ),
+}
+
+
+def quantized_index_sql(mode: str) -> str:
+    """CREATE INDEX statement for a quantization mode at EMBEDDING_DIMENSION"""
+    name, method = QUANTIZED_INDEXES[mode]
+    return (
+        f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON products "
+        f"USING {method.format(dimension=settings.EMBEDDING_DIMENSION)}"
+    )
+
+
+def check_quantized_index(db_session):
+    """
+    Fail fast when PGVECTOR_QUANTIZATION has no index to search.
+
+    Without the expression index the quantized candidate pass silently
+    becomes a sequential scan over every product, so the API refuses to
+    start instead.
+
+    Raises:
+        RuntimeError: If the configured mode's index is missing or was built
+            for another EMBEDDING_DIMENSION
+    """
+    mode = settings.PGVECTOR_QUANTIZATION
+    if settings.VECTOR_PROVIDER != "pgvector" or mode not in QUANTIZED_INDEXES:
+        return
+
+    name, _ = QUANTIZED_INDEXES[mode]
+    definition = db_session.execute(
+        text("SELECT indexdef FROM pg_indexes WHERE tablename = 'products' AND indexname = :name"),
+        {"name": name},
+    ).scalar()
+    cast = "halfvec" if mode == "halfvec" else "bit"
+    if definition is None or f"::{cast}({settings.EMBEDDING_DIMENSION})" not in definition:
+        raise RuntimeError(
+            f"PGVECTOR_QUANTIZATION={mode} needs the {name} index for "
+            f"EMBEDDING_DIMENSION={settings.EMBEDDING_DIMENSION}"
+            f"{'' if definition is None else f', found: {definition}'}. "
+            f"Build it with: {quantized_index_sql(mode)}"
+        )
+
+
+# Product details for the rows of a ``ranked`` (id, score, dense_score,
+# sparse_score) CTE from the denormalized search cards, which hold
+# pre-extracted media and all offers, cheapest first. Products whose card has
+# not been built yet (or that have no brand or category, which cards require)
+# are read from the base tables instead of being dropped.
+_DETAILS_SQL = f"""
+            SELECT 
+                p.urn as id,
+                p.id as product_id,
+                r.score,
+                r.dense_score,
+                r.sparse_score,
+                coalesce(sc.name, p.name) as name,
+                coalesce(sc.description, p.description) as description,
+                coalesce(sc.url, p.url) as url,
+                coalesce(sc.brand_name, b.name) as brand_name,
+                coalesce(sc.category_name, c.name) as category_name,
+                coalesce(sc.media, p.media, '[]'::jsonb) as media,
+                coalesce(sc.offers, po.offers, '[]'::jsonb) as offers
+            FROM ranked r
+            JOIN products p ON p.id = r.id
+            LEFT JOIN product_search_cards sc ON sc.product_id = r.id
+            LEFT JOIN brands b ON b.id = p.brand_id AND sc.product_id IS NULL
+            LEFT JOIN categories c ON c.id = p.category_id AND sc.product_id IS NULL
+            LEFT JOIN LATERAL ({OFFERS_JSON_SQL}
+                AND sc.product_id IS NULL
+            ) po ON true
+            ORDER BY r.score DESC
+"""
+
 
 class PgVectorSearchService(BaseSearchService):
     """Handles similarity search using pgvector"""
     
+    # Whether the server supports hnsw.iterative_scan (pgvector >= 0.8), probed once
+    _iterative_scan_supported: Optional[bool] = None
+    
     def __init__(self, db_session):
         super().__init__(db_session)
         self.product_repository = ProductRepository(db_session)
@@ -25,6 +142,7 @@ class PgVectorSearchService(BaseSearchService):
         top_k: int = 20,
         alpha: float = 0.7,
         include_metadata: bool = True,
+        filters: Optional[SearchFilters] = None,
     ) -> List[SearchResult]:
         """Search for products using pgvector similarity search"""
         
@@ -35,8 +153,8 @@ class PgVectorSearchService(BaseSearchService):
             # Get embedding for query
             query_embedding = self._get_query_embedding(query)
             
-            # Perform similarity search
-            results = self._search_by_embedding(query_embedding, top_k)
+            # Perform hybrid similarity search
+            results = self._search_by_embedding(query_embedding, top_k, filters, query)
             
             total_time = time.time() - start_time
             logger.info(f"✅ Search completed in {total_time:.3f}s, found {len(results)} results")
@@ -48,92 +166,524 @@ class PgVectorSearchService(BaseSearchService):
             logger.error(f"❌ Search failed after {total_time:.3f}s: {str(e)}")
             raise
     
-    def _get_query_embedding(self, query: str) -> List[float]:
-        """Get embedding for query text using OpenAI"""
-        if not settings.EMBEDDING_API_KEY:
-            logger.warning("No embedding API key, using random embedding for testing")
-            return np.random.rand(settings.EMBEDDING_DIMENSION).tolist()
+    async def asearch_products(
+        self,
+        query: str,
+        top_k: int = 20,
+        alpha: float = 0.7,
+        include_metadata: bool = True,
+        filters: Optional[SearchFilters] = None,
+    ) -> List[SearchResult]:
+        """Search for products using pgvector without blocking the event loop
+        
+        The query embedding is fetched with the async pooled client; the
+        blocking database query runs in the bounded search thread pool.
+        """
         
         try:
-            import openai
-            client = openai.OpenAI(api_key=settings.EMBEDDING_API_KEY)
+            start_time = time.time()
+            logger.info(f"🔍 Searching pgvector for query: '{query}'")
             
-            logger.info(f"Getting embedding for query: '{query}' using {settings.EMBEDDING_MODEL_NAME}")
+            query_embedding = await self._aget_query_embedding(query)
             
-            response = client.embeddings.create(
-                model=settings.EMBEDDING_MODEL_NAME,
-                input=query
+            results = await run_in_search_executor(
+                self._search_by_embedding, query_embedding, top_k, filters, query
             )
             
-            embedding = response.data[0].embedding
-            logger.info(f"Successfully got embedding with dimension: {len(embedding)}")
+            total_time = time.time() - start_time
+            logger.info(f"✅ Search completed in {total_time:.3f}s, found {len(results)} results")
+            
+            return results
+            
+        except Exception as e:
+            total_time = time.time() - start_time
+            logger.error(f"❌ Search failed after {total_time:.3f}s: {str(e)}")
+            raise
+    
+    def retrieve_candidates(
+        self,
+        query: str,
+        top_k: int = 100,
+        alpha: float = 0.7,
+        filters: Optional[SearchFilters] = None,
+    ) -> List[SearchResult]:
+        """Rank up to top_k products for the query without loading their details"""
+        query_embedding = self._get_query_embedding(query)
+        partition = self._semantic_partition(top_k, filters)
+        cached = self._semantic_get(query_embedding, partition)
+        if cached is not None:
+            return cached
+        
+        candidates = self._search_candidates(query_embedding, top_k, filters, query)
+        self._semantic_set(query_embedding, partition, candidates)
+        return candidates
+    
+    async def aretrieve_candidates(
+        self,
+        query: str,
+        top_k: int = 100,
+        alpha: float = 0.7,
+        filters: Optional[SearchFilters] = None,
+    ) -> List[SearchResult]:
+        """Async variant of ``retrieve_candidates``"""
+        query_embedding = await self._aget_query_embedding(query)
+        partition = None
+        if get_semantic_cache() is not None:
+            # Reading the catalog generation may call Redis
+            partition = await run_in_search_executor(self._semantic_partition, top_k, filters)
+        cached = self._semantic_get(query_embedding, partition)
+        if cached is not None:
+            return cached
+        
+        candidates = await run_in_search_executor(
+            self._search_candidates, query_embedding, top_k, filters, query
+        )
+        self._semantic_set(query_embedding, partition, candidates)
+        return candidates
+    
+    async def aretrieve_candidates_batch(
+        self,
+        queries: List[str],
+        top_k: int = 100,
+        filters: Optional[List[Optional[SearchFilters]]] = None,
+    ) -> List[List[SearchResult]]:
+        """
+        Rank candidates for several queries, embedding them in one provider call.
+        
+        The ranking statements run back to back on one pooled connection.
+        """
+        filters = filters or [None] * len(queries)
+        embeddings = await self._aget_query_embeddings(queries)
+        partitions = [None] * len(queries)
+        if get_semantic_cache() is not None:
+            # Reading the catalog generation may call Redis
+            partitions = await run_in_search_executor(
+                lambda: [self._semantic_partition(top_k, query_filters) for query_filters in filters]
+            )
+        rankings = [
+            self._semantic_get(embedding, partition)
+            for embedding, partition in zip(embeddings, partitions)
+        ]
+        
+        def search_misses():
+            for i, (query, embedding, query_filters) in enumerate(zip(queries, embeddings, filters)):
+                if rankings[i] is None:
+                    rankings[i] = self._search_candidates(embedding, top_k, query_filters, query)
+                    self._semantic_set(embedding, partitions[i], rankings[i])
+        
+        if any(ranking is None for ranking in rankings):
+            await run_in_search_executor(search_misses)
+        return rankings
+    
+    def enrich_results(self, candidates: List[SearchResult]) -> List[SearchResult]:
+        """Load product details and offers for ranked candidates, keeping their order"""
+        if not candidates:
+            return []
+        
+        ranked_sql = """
+            WITH ranked AS (
+                SELECT *
+                FROM unnest(
+                    CAST(:ids AS uuid[]),
+                    CAST(:scores AS float8[]),
+                    CAST(:dense_scores AS float8[]),
+                    CAST(:sparse_scores AS float8[])
+                ) AS r(id, score, dense_score, sparse_score)
+            )"""
+        with time_search_stage("enrichment"):
+            rows = self.db_session.execute(
+                text(ranked_sql + _DETAILS_SQL),
+                {
+                    "ids": [c.metadata["product_id"] for c in candidates],
+                    "scores": [c.score for c in candidates],
+                    "dense_scores": [c.dense_score for c in candidates],
+                    "sparse_scores": [c.sparse_score for c in candidates],
+                },
+            ).fetchall()
+        results = self._rows_to_results(rows)
+        
+        # Group fields come from ranking, not from the product details
+        by_id = {c.id: c for c in candidates}
+        for result in results:
+            candidate = by_id.get(result.id)
+            if candidate is not None:
+                result.variant_count = candidate.variant_count
+                result.product_group_urn = candidate.product_group_urn
+        return results
+    
+    def _semantic_partition(
+        self, top_k: int, filters: Optional[SearchFilters] = None
+    ) -> Optional[str]:
+        """Semantic cache partition for a search, or None to bypass the cache"""
+        # Fallback embeddings are random, so they must neither match nor be stored
+        if "embedding" in self.degraded_retrievers or get_semantic_cache() is None:
+            return None
+        return semantic_partition(top_k, filters, self.collapse_variants)
+    
+    def _semantic_get(
+        self, embedding: List[float], partition: Optional[str]
+    ) -> Optional[List[SearchResult]]:
+        """Ranking of a near-duplicate query from the semantic cache, or None"""
+        cache = get_semantic_cache()
+        if partition is None or cache is None:
+            return None
+        with time_search_stage("semantic_cache"):
+            return cache.get(embedding, partition)
+    
+    def _semantic_set(
+        self, embedding: List[float], partition: Optional[str], candidates: List[SearchResult]
+    ):
+        cache = get_semantic_cache()
+        if partition is not None and cache is not None:
+            cache.set(embedding, partition, candidates)
+    
+    def _get_query_embedding(self, query: str) -> List[float]:
+        """Get embedding for query text from the shared embedding provider (cached)"""
+        try:
+            logger.debug("Getting embedding for query: '%s' using %s", query, settings.EMBEDDING_MODEL_NAME)
+            embedding = get_query_embedding(query)
+            logger.debug("Got embedding with dimension: %d", len(embedding))
+            return embedding
             
+        except Exception as e:
+            logger.error(f"Failed to get query embedding: {e}")
+            SEARCH_FALLBACKS.labels(
+                backend=settings.VECTOR_PROVIDER, reason="embedding_failure"
+            ).inc()
+            self.degraded_retrievers = ["embedding"]
+            # Fallback to random for testing
+            return np.random.rand(settings.EMBEDDING_DIMENSION).tolist()
+    
+    async def _aget_query_embedding(self, query: str) -> List[float]:
+        """Async variant of ``_get_query_embedding``"""
+        try:
+            logger.debug("Getting embedding for query: '%s' using %s", query, settings.EMBEDDING_MODEL_NAME)
+            embedding = await aget_query_embedding(query)
+            logger.debug("Got embedding with dimension: %d", len(embedding))
             return embedding
             
         except Exception as e:
             logger.error(f"Failed to get query embedding: {e}")
+            SEARCH_FALLBACKS.labels(
+                backend=settings.VECTOR_PROVIDER, reason="embedding_failure"
+            ).inc()
+            self.degraded_retrievers = ["embedding"]
             # Fallback to random for testing
             return np.random.rand(settings.EMBEDDING_DIMENSION).tolist()
     
-    def _search_by_embedding(self, embedding: List[float], top_k: int) -> List[SearchResult]:
-        """Search products by embedding similarity"""
+    async def _aget_query_embeddings(self, queries: List[str]) -> List[List[float]]:
+        """Batch variant of ``_aget_query_embedding``"""
+        try:
+            return await aget_query_embeddings(queries)
+        except Exception as e:
+            logger.error(f"Failed to get query embeddings: {e}")
+            SEARCH_FALLBACKS.labels(
+                backend=settings.VECTOR_PROVIDER, reason="embedding_failure"
+            ).inc()
+            self.degraded_retrievers = ["embedding"]
+            # Fallback to random for testing
+            return [np.random.rand(settings.EMBEDDING_DIMENSION).tolist() for _ in queries]
+    
+    def _search_by_embedding(
+        self,
+        embedding: List[float],
+        top_k: int,
+        filters: Optional[SearchFilters] = None,
+        query: Optional[str] = None,
+    ) -> List[SearchResult]:
+        """Search products by embedding similarity, fused with lexical matches for ``query``"""
         
-        logger.info(f"Searching with embedding dimension: {len(embedding)}, top_k: {top_k}")
+        logger.debug("Searching with embedding dimension: %d, top_k: %d", len(embedding), top_k)
         
-        # First check if we have any products with embeddings
-        count_query = text("SELECT COUNT(*) FROM products WHERE embedding IS NOT NULL")
-        count = self.db_session.execute(count_query).scalar()
-        logger.info(f"Total products with embeddings: {count}")
+        # Step 1 picks the top-k products, step 2 attaches all offers per
+        # product, so top_k counts distinct products
+        ranked_sql, params = self._ranked_cte(embedding, top_k, filters, query)
+        # Ranking and details are one statement here, timed as retrieval
+        with time_search_stage("retrieval"):
+            rows = self.db_session.execute(text(ranked_sql + _DETAILS_SQL), params).fetchall()
         
-        # Build the similarity search query
-        query_sql = text("""
-            SELECT 
-                p.urn as id,
-                p.id as product_id,
-                1 - (p.embedding <=> CAST(:embedding AS vector)) as score,
-                p.name,
-                p.description,
-                p.url,
-                b.name as brand_name,
-                c.name as category_name,
-                o.price,
-                o.price_currency,
-                o.availability,
-                o.inventory_level,
-                o.seller_id,
-                p.raw_data
-            FROM products p
-            JOIN brands b ON p.brand_id = b.id
-            JOIN categories c ON p.category_id = c.id
-            LEFT JOIN offers o ON o.product_id = p.id
-            WHERE p.embedding IS NOT NULL
-            ORDER BY p.embedding <=> CAST(:embedding AS vector)
-            LIMIT :limit
-        """)
+        logger.debug("Found %d results from pgvector search", len(rows))
+        
+        return self._rows_to_results(rows)
+    
+    def _search_candidates(
+        self,
+        embedding: List[float],
+        top_k: int,
+        filters: Optional[SearchFilters] = None,
+        query: Optional[str] = None,
+    ) -> List[SearchResult]:
+        """
+        Rank products like ``_search_by_embedding`` without loading their details.
+        
+        With ``collapse_variants`` the ranking is over-fetched by
+        SEARCH_COLLAPSE_FETCH_FACTOR and reduced in the same statement to the
+        best ranked variant of each product group, with the group's number of
+        ranked variants and its URN looked up once per group.
+        """
+        rank_k = top_k * settings.SEARCH_COLLAPSE_FETCH_FACTOR if self.collapse_variants else top_k
+        ranked_sql, params = self._ranked_cte(embedding, rank_k, filters, query)
+        source = "ranked"
+        group_columns = "NULL AS variant_count, NULL AS product_group_urn"
+        group_join = ""
+        if self.collapse_variants:
+            ranked_sql += """,
+            grouped AS (
+                SELECT
+                    r.*,
+                    p.product_group_id,
+                    row_number() OVER (
+                        PARTITION BY coalesce(p.product_group_id, p.id) ORDER BY r.score DESC, r.id
+                    ) AS group_rank,
+                    count(*) OVER (PARTITION BY coalesce(p.product_group_id, p.id)) AS variant_count
+                FROM ranked r
+                JOIN products p ON p.id = r.id
+            ),
+            collapsed AS (
+                SELECT *
+                FROM grouped
+                WHERE group_rank = 1
+                ORDER BY score DESC
+                LIMIT :collapse_limit
+            )"""
+            params["collapse_limit"] = top_k
+            source = "collapsed"
+            group_columns = "r.variant_count, pg.urn AS product_group_urn"
+            group_join = "LEFT JOIN product_groups pg ON pg.id = r.product_group_id"
+        
+        # Re-ranking reads offer features from the search cards in the same statement
+        rerank = get_reranker() is not None
+        with time_search_stage("retrieval"):
+            rows = self.db_session.execute(
+                text(ranked_sql + f"""
+                SELECT p.urn AS id, r.id AS product_id, r.score, r.dense_score, r.sparse_score,
+                       {group_columns},
+                       {"sc.offers" if rerank else "NULL"} AS offers
+                FROM {source} r
+                JOIN products p ON p.id = r.id
+                {group_join}
+                {"LEFT JOIN product_search_cards sc ON sc.product_id = r.id" if rerank else ""}
+                ORDER BY r.score DESC
+            """),
+                params,
+            ).fetchall()
+        
+        return [
+            SearchResult(
+                id=row.id,
+                score=float(row.score),
+                metadata=(
+                    {"product_id": str(row.product_id), "offers": row.offers}
+                    if row.offers is not None
+                    else {"product_id": str(row.product_id)}
+                ),
+                dense_score=self._optional_float(row.dense_score),
+                sparse_score=self._optional_float(row.sparse_score),
+                variant_count=row.variant_count,
+                product_group_urn=row.product_group_urn,
+            )
+            for row in rows
+        ]
+    
+    @staticmethod
+    def _optional_float(value) -> Optional[float]:
+        return float(value) if value is not None else None
+    
+    def _ranked_cte(
+        self,
+        embedding: List[float],
+        top_k: int,
+        filters: Optional[SearchFilters] = None,
+        query: Optional[str] = None,
+    ):
+        """
+        Build the ``ranked`` CTE (product id, score, dense_score, sparse_score).
+        
+        With a query and PGVECTOR_HYBRID_SEARCH on, the vector and full-text
+        retrievers run in the same statement and are fused with Reciprocal
+        Rank Fusion (k = SEARCH_RRF_K), so score is the RRF score. Otherwise
+        score is the cosine similarity.
+        """
+        nearest_sql, params = self._nearest_cte(embedding, top_k, filters)
+        
+        if not (query and query.strip() and settings.PGVECTOR_HYBRID_SEARCH):
+            return nearest_sql + """,
+            ranked AS (
+                SELECT
+                    n.id,
+                    1 - n.distance AS score,
+                    1 - n.distance AS dense_score,
+                    CAST(NULL AS float8) AS sparse_score
+                FROM nearest n
+            )""", params
         
-        rows = self.db_session.execute(
-            query_sql,
-            {"embedding": embedding, "limit": top_k}
-        ).fetchall()
+        filter_sql = "TRUE"
+        if filters and not filters.is_empty():
+            filter_sql, _ = to_sql(filters)
+        params.update({"text_query": query, "rrf_k": settings.SEARCH_RRF_K})
+        
+        ranked_sql = nearest_sql + f""",
+            lexical AS (
+                SELECT p.id, ts_rank_cd(p.search_tsv, q.tsquery) AS text_score
+                FROM products p, (SELECT {_TSQUERY_SQL} AS tsquery) q
+                WHERE p.search_tsv @@ q.tsquery AND {filter_sql}
+                ORDER BY text_score DESC
+                LIMIT :limit
+            ),
+            dense_ranks AS (
+                SELECT id, 1 - distance AS score, row_number() OVER (ORDER BY distance) AS rank
+                FROM nearest
+            ),
+            lexical_ranks AS (
+                SELECT id, text_score AS score, row_number() OVER (ORDER BY text_score DESC) AS rank
+                FROM lexical
+            ),
+            ranked AS (
+                SELECT
+                    coalesce(d.id, l.id) AS id,
+                    CAST(
+                        coalesce(1.0 / (:rrf_k + d.rank), 0) + coalesce(1.0 / (:rrf_k + l.rank), 0)
+                        AS float8
+                    ) AS score,
+                    d.score AS dense_score,
+                    CAST(l.score AS float8) AS sparse_score
+                FROM dense_ranks d
+                FULL OUTER JOIN lexical_ranks l ON l.id = d.id
+                ORDER BY score DESC
+                LIMIT :limit
+            )"""
+        return ranked_sql, params
+    
+    def _nearest_cte(
+        self,
+        embedding: List[float],
+        top_k: int,
+        filters: Optional[SearchFilters] = None,
+    ):
+        """Build the ``nearest`` CTE (product id, distance) and its parameters"""
+        where = "p.embedding IS NOT NULL"
+        params = {"embedding": embedding, "limit": top_k}
+        exact_scan = False
+        if filters and not filters.is_empty():
+            filter_sql, filter_params = to_sql(filters)
+            where = f"{where} AND {filter_sql}"
+            params.update(filter_params)
+            exact_scan = self._is_selective(where, filter_params)
+            if not exact_scan:
+                self._enable_iterative_scan()
+            logger.info(
+                f"Filtered search {filters.to_dict()} using "
+                f"{'exact' if exact_scan else 'index'} scan"
+            )
+        
+        if exact_scan:
+            # MATERIALIZED keeps the planner from using the HNSW index, so the
+            # few matching rows are ranked exactly
+            nearest_sql = f"""
+            WITH candidates AS MATERIALIZED (
+                SELECT p.id, p.embedding
+                FROM products p
+                WHERE {where}
+            ),
+            nearest AS (
+                SELECT
+                    c.id,
+                    c.embedding <=> CAST(:embedding AS vector) AS distance
+                FROM candidates c
+                ORDER BY distance
+                LIMIT :limit
+            )"""
+        elif settings.PGVECTOR_PREFIX_SEARCH and settings.EMBEDDING_PREFIX_DIMENSION:
+            params["embedding_prefix"] = truncate_embedding(
+                embedding, settings.EMBEDDING_PREFIX_DIMENSION
+            )
+            nearest_sql = self._two_stage_nearest_sql(
+                "p.embedding_prefix <=> CAST(:embedding_prefix AS vector)",
+                f"{where} AND p.embedding_prefix IS NOT NULL",
+                params,
+                top_k,
+            )
+        elif settings.PGVECTOR_QUANTIZATION in ("halfvec", "binary"):
+            nearest_sql = self._quantized_nearest_sql(where, params, top_k)
+        else:
+            # A candidate pool larger than the default ef_search would be cut short
+            self._raise_ef_search(top_k)
+            nearest_sql = f"""
+            WITH nearest AS (
+                SELECT
+                    p.id,
+                    p.embedding <=> CAST(:embedding AS vector) AS distance
+                FROM products p
+                WHERE {where}
+                ORDER BY p.embedding <=> CAST(:embedding AS vector)
+                LIMIT :limit
+            )"""
+        return nearest_sql, params
+    
+    def _quantized_nearest_sql(self, where: str, params: Dict[str, Any], top_k: int) -> str:
+        """
+        Two-pass ``nearest`` CTE: an ANN pass over the quantized expression
+        index picks top_k * PGVECTOR_RERANK_FACTOR candidates, which are then
+        re-ranked exactly against the full-precision embeddings.
         
-        logger.info(f"Found {len(rows)} results from pgvector search")
+        The ORDER BY expressions must match ``QUANTIZED_INDEXES`` for the
+        planner to use them; ``check_quantized_index`` verifies the index
+        exists at startup.
+        """
+        dimension = settings.EMBEDDING_DIMENSION
+        if settings.PGVECTOR_QUANTIZATION == "halfvec":
+            order_by = (
+                f"p.embedding::halfvec({dimension}) <=> CAST(:embedding AS halfvec({dimension}))"
+            )
+        else:
+            order_by = (
+                f"binary_quantize(p.embedding)::bit({dimension}) <~> "
+                f"binary_quantize(CAST(:embedding AS vector))"
+            )
+        return self._two_stage_nearest_sql(order_by, where, params, top_k)
+    
+    def _two_stage_nearest_sql(
+        self, order_by: str, where: str, params: Dict[str, Any], top_k: int
+    ) -> str:
+        """``nearest`` CTE that re-ranks the first top_k * PGVECTOR_RERANK_FACTOR rows by ``order_by`` exactly"""
+        params["candidate_limit"] = top_k * max(settings.PGVECTOR_RERANK_FACTOR, 1)
+        self._raise_ef_search(params["candidate_limit"])
         
-        # Convert to SearchResult objects
+        return f"""
+            WITH candidates AS (
+                SELECT p.id, p.embedding
+                FROM products p
+                WHERE {where}
+                ORDER BY {order_by}
+                LIMIT :candidate_limit
+            ),
+            nearest AS (
+                SELECT
+                    c.id,
+                    c.embedding <=> CAST(:embedding AS vector) AS distance
+                FROM candidates c
+                ORDER BY distance
+                LIMIT :limit
+            )"""
+    
+    def _rows_to_results(self, rows) -> List[SearchResult]:
+        """Convert product detail rows to SearchResult objects"""
         results = []
         for row in rows:
-            # Extract media from raw_data
-            media = []
-            if row.raw_data:
-                media = self._extract_media_from_jsonld(row.raw_data)
+            # Offers are ordered by price, so the first one is the lowest
+            offers = row.offers or []
+            best_offer = offers[0] if offers else {}
             
             result = SearchResult(
                 id=row.id,
                 score=float(row.score),
+                dense_score=self._optional_float(row.dense_score),
+                sparse_score=self._optional_float(row.sparse_score),
                 metadata={
                     "brand": row.brand_name,
                     "category": row.category_name,
-                    "price": float(row.price) if row.price else None,
-                    "availability": row.availability
+                    "price": best_offer.get("price"),
+                    "availability": best_offer.get("availability")
                 },
                 product_name=row.name,
                 product_urn=row.id,
@@ -141,58 +691,76 @@ class PgVectorSearchService(BaseSearchService):
                 product_category=row.category_name,
                 product_description=row.description,
                 product_url=row.url,
-                product_media=media
+                product_media=row.media or []
             )
             
             # Add offer information
-            if row.price:
-                result.product_price = float(row.price)
-                result.product_offers = [{
-                    "price": float(row.price),
-                    "currency": row.price_currency,
-                    "availability": row.availability,
-                    "inventory_level": row.inventory_level,
-                    "seller_id": str(row.seller_id) if row.seller_id else None
-                }]
+            if offers:
+                result.product_price = best_offer.get("price")
+                result.product_offers = offers
             
             results.append(result)
         
         return results
     
-    def _extract_media_from_jsonld(self, jsonld: dict) -> List[Dict[str, Any]]:
-        """Extract media information from JSON-LD raw_data"""
-        media = []
-        
-        # Check for @cmp:media field
-        if "@cmp:media" in jsonld:
-            cmp_media = jsonld["@cmp:media"]
-            if isinstance(cmp_media, list):
-                for item in cmp_media:
-                    if isinstance(item, dict) and item.get("@type") == "ImageObject":
-                        media.append({
-                            "type": "image",
-                            "url": item.get("url"),
-                            "caption": item.get("caption", ""),
-                            "width": item.get("width"),
-                            "height": item.get("height")
-                        })
-            elif isinstance(cmp_media, dict) and cmp_media.get("@type") == "ImageObject":
-                media.append({
-                    "type": "image",
-                    "url": cmp_media.get("url"),
-                    "caption": cmp_media.get("caption", ""),
-                    "width": cmp_media.get("width"),
-                    "height": cmp_media.get("height")
-                })
-        
-        # Also check for direct image field
-        if "image" in jsonld and isinstance(jsonld["image"], str):
-            media.append({
-                "type": "image",
-                "url": jsonld["image"],
-                "caption": "",
-                "width": None,
-                "height": None
-            })
-        
-        return media
\ No newline at end of file
+    def _is_selective(self, where: str, params: Dict[str, Any]) -> bool:
+        """
+        Check whether a filter matches few enough products for an exact scan.
+        
+        The probe stops after PGVECTOR_EXACT_SCAN_THRESHOLD + 1 rows, so it is
+        cheap for broad filters, and for narrow ones it costs about the same
+        as the exact scan it enables.
+        """
+        threshold = settings.PGVECTOR_EXACT_SCAN_THRESHOLD
+        if threshold <= 0:
+            return False
+        
+        probe_sql = text(f"""
+            SELECT COUNT(*) FROM (
+                SELECT 1 FROM products p WHERE {where} LIMIT :probe_limit
+            ) matches
+        """)
+        matches = self.db_session.execute(
+            probe_sql, {**params, "probe_limit": threshold + 1}
+        ).scalar()
+        return matches <= threshold
+    
+    def _raise_ef_search(self, rows: int):
+        """
+        Let the HNSW scan return up to ``rows`` rows.
+        
+        An HNSW index scan stops after hnsw.ef_search candidates (40 by
+        default), so a larger LIMIT is silently cut short. The setting is
+        raised for the current transaction only and never lowered.
+        """
+        self.db_session.execute(
+            text(_EF_SEARCH_SQL), {"ef_search": min(rows, _MAX_EF_SEARCH)}
+        )
+    
+    def _enable_iterative_scan(self):
+        """
+        Let the HNSW scan keep going until enough rows pass the filter.
+        
+        Without this a filtered HNSW query returns at most ef_search candidates
+        before filtering, so selective filters can return fewer than top_k rows.
+        """
+        mode = settings.PGVECTOR_ITERATIVE_SCAN
+        if mode not in ("relaxed_order", "strict_order"):
+            return
+        if PgVectorSearchService._iterative_scan_supported is False:
+            return
+        
+        statement = text(f"SET LOCAL hnsw.iterative_scan = {mode}")
+        if PgVectorSearchService._iterative_scan_supported:
+            self.db_session.execute(statement)
+            return
+        
+        # First use: probe support in a savepoint so older pgvector versions
+        # don't abort the surrounding transaction
+        try:
+            with self.db_session.begin_nested():
+                self.db_session.execute(statement)
+            PgVectorSearchService._iterative_scan_supported = True
+        except DBAPIError as e:
+            logger.warning(f"hnsw.iterative_scan not supported, requires pgvector >= 0.8: {e}")
+            PgVectorSearchService._iterative_scan_supported = False
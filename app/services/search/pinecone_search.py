@@ -1,9 +1,17 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+import asyncio
+import logging
 import time
+from app.core.config import settings
 from app.core.logging import get_logger
+from app.core.metrics import time_search_stage
 from app.db.repositories.vector_repository import VectorRepository
 from app.db.repositories.product_repository import ProductRepository
+from app.db.repositories.product_search_card_repository import ProductSearchCardRepository
 from .base import BaseSearchService, SearchResult
+from .collapse import collapse_by_group
+from .executor import run_in_search_executor, search_dense_and_sparse
+from .filters import SearchFilters, to_pinecone_filter
 
 logger = get_logger(__name__)
 
@@ -15,6 +23,7 @@ class PineconeSearchService(BaseSearchService):
         super().__init__(db_session)
         self.vector_repository = VectorRepository()
         self.product_repository = ProductRepository(db_session)
+        self.search_card_repository = ProductSearchCardRepository(db_session)
 
     def search_products(
         self,
@@ -22,43 +31,18 @@ class PineconeSearchService(BaseSearchService):
         top_k: int = 20,
         alpha: float = 0.7,
         include_metadata: bool = True,
+        filters: Optional[SearchFilters] = None,
     ):
         """Search for products using Pinecone's dense and sparse indices"""
 
         try:
-            # Reduced fetch multiplier since inference is faster
-            fetch_k = min(top_k * 2, 50)
-            logger.info(
-                f"🔍 Querying Pinecone indices with Inference API (fetch_k={fetch_k})..."
-            )
             start_time = time.time()
-            dense_results = self.vector_repository._search_dense_index(
-                query, fetch_k, alpha, include_metadata
-            )
-            sparse_results = self.vector_repository._search_sparse_index(
-                query, fetch_k, alpha, include_metadata
+            merged_results = self.retrieve_candidates(
+                query, top_k, alpha, filters, include_metadata
             )
 
-            logger.info(f"🔍 DEBUG: Dense results type: {type(dense_results)}")
-            logger.info(f"🔍 DEBUG: Sparse results type: {type(sparse_results)}")
-
-            dense_hits = self._hits(dense_results)
-            sparse_hits = self._hits(sparse_results)
-            
-            logger.info(f"🔍 DEBUG: Dense hits count: {len(dense_hits)}")
-            logger.info(f"🔍 DEBUG: Sparse hits count: {len(sparse_hits)}")
-            merged_results = self.rrf_merge(dense_hits, sparse_hits, k=60, top_k=20)
-
             # #Optional database enrichment
-            if merged_results:
-                logger.info("🔗 Enriching with database data...")
-                enrich_start = time.time()
-                enriched_results = self._enrich_with_product_data(merged_results)
-                enrich_time = time.time() - enrich_start
-                logger.info(f"✅ Database enrichment completed in {enrich_time:.3f}s")
-            else:
-                enriched_results = merged_results
-                enrich_time = 0
+            enriched_results = self.enrich_results(merged_results)
 
             total_time = time.time() - start_time
             logger.info(f"✅ Search completed in {total_time:.3f}s")
@@ -68,42 +52,110 @@ class PineconeSearchService(BaseSearchService):
             logger.error(f"❌ Search failed after {total_time:.3f}s: {str(e)}")
             raise
 
+    def retrieve_candidates(
+        self,
+        query: str,
+        top_k: int = 100,
+        alpha: float = 0.7,
+        filters: Optional[SearchFilters] = None,
+        include_metadata: bool = True,
+    ) -> List[SearchResult]:
+        """Rank up to top_k products by RRF over the dense and sparse indices"""
+        candidates, self.degraded_retrievers = self._rank_candidates(
+            query, top_k, alpha, filters, include_metadata
+        )
+        return candidates
+
+    async def aretrieve_candidates_batch(
+        self,
+        queries: List[str],
+        top_k: int = 100,
+        filters: Optional[List[Optional[SearchFilters]]] = None,
+    ) -> List[List[SearchResult]]:
+        """
+        Rank candidates for several queries concurrently.
+
+        Pinecone embeds the query text itself and ranking needs no database
+        session, so each query runs as its own search pool job.
+        ``degraded_retrievers`` lists the retrievers that failed for any query.
+        """
+        filters = filters or [None] * len(queries)
+        ranked = await asyncio.gather(
+            *[
+                run_in_search_executor(self._rank_candidates, query, top_k, 0.7, query_filters)
+                for query, query_filters in zip(queries, filters)
+            ]
+        )
+        self.degraded_retrievers = sorted({name for _, degraded in ranked for name in degraded})
+        return [candidates for candidates, _ in ranked]
+
+    def _rank_candidates(
+        self,
+        query: str,
+        top_k: int,
+        alpha: float,
+        filters: Optional[SearchFilters] = None,
+        include_metadata: bool = True,
+    ) -> Tuple[List[SearchResult], List[str]]:
+        """Rank candidates for one query, returning them with the degraded retriever names"""
+        rank_k = top_k * settings.SEARCH_COLLAPSE_FETCH_FACTOR if self.collapse_variants else top_k
+        # Over-fetch small pages so fusion has enough overlap to work with
+        fetch_k = max(rank_k, min(rank_k * 2, 50))
+        logger.info(
+            f"🔍 Querying Pinecone indices with Inference API (fetch_k={fetch_k})..."
+        )
+        metadata_filter = to_pinecone_filter(filters) if filters else None
+        dense_results, sparse_results, degraded = search_dense_and_sparse(
+            self.vector_repository, query, fetch_k, alpha, include_metadata, metadata_filter
+        )
+
+        dense_hits = self._hits(dense_results)
+        sparse_hits = self._hits(sparse_results)
+        logger.debug("🔍 Dense hits: %d, sparse hits: %d", len(dense_hits), len(sparse_hits))
+        with time_search_stage("fusion"):
+            candidates = self.rrf_merge(
+                dense_hits, sparse_hits, k=settings.SEARCH_RRF_K, top_k=rank_k
+            )
+            if self.collapse_variants:
+                candidates = collapse_by_group(candidates, top_k)
+        return candidates, degraded
+
+    def enrich_results(self, candidates: List[SearchResult]) -> List[SearchResult]:
+        """Enrich ranked candidates with database product data"""
+        if not candidates:
+            return candidates
+
+        logger.info("🔗 Enriching with database data...")
+        enrich_start = time.time()
+        with time_search_stage("enrichment"):
+            enriched_results = self._enrich_with_product_data(candidates)
+        enrich_time = time.time() - enrich_start
+        logger.info(f"✅ Database enrichment completed in {enrich_time:.3f}s")
+        return enriched_results
+
     def _hits(self, resp):
         """
         Return list of {'id', 'score', 'metadata'} with all product fields from Pinecone
         """
-        logger.info(f"🔍 DEBUG: _hits input type: {type(resp)}")
-
         if hasattr(resp, "result") and hasattr(resp.result, "hits"):
             # SearchRecordsResponse object
             raw = resp.result.hits
-            logger.info(
-                f"🔍 DEBUG: Using SearchRecordsResponse format, raw hits: {len(raw) if raw else 0}"
-            )
-            # Log the first hit to see its structure
-            if raw and len(raw) > 0:
-                logger.info(f"🔍 DEBUG: First hit type: {type(raw[0])}")
-                logger.info(f"🔍 DEBUG: First hit attrs: {dir(raw[0]) if hasattr(raw[0], '__dict__') else 'N/A'}")
-                # Try to get the actual data
+            # Dumping the first hit is expensive, only do it when debugging
+            if raw and logger.isEnabledFor(logging.DEBUG):
                 first_hit = raw[0]
-                if hasattr(first_hit, 'to_dict'):
-                    logger.info(f"🔍 DEBUG: First hit as dict: {first_hit.to_dict()}")
-                if hasattr(first_hit, '_data_store'):
-                    logger.info(f"🔍 DEBUG: First hit data store: {first_hit._data_store}")
+                logger.debug(
+                    "🔍 SearchRecordsResponse with %d hits, first hit: %s",
+                    len(raw),
+                    first_hit.to_dict() if hasattr(first_hit, "to_dict") else first_hit,
+                )
         elif hasattr(resp, "data") and hasattr(resp.data, "result"):
             # SearchResponse object
             raw = resp.data.result.hits
-            logger.info(
-                f"🔍 DEBUG: Using SearchResponse format, raw hits: {len(raw) if raw else 0}"
-            )
         elif isinstance(resp, dict) and "results" in resp:
             # Dict response from Pinecone inference
             raw = resp.get("results", [])
-            logger.info(
-                f"🔍 DEBUG: Using dict response format, raw hits: {len(raw)}"
-            )
         else:
-            logger.warning(f"🔍 DEBUG: Unknown response format, resp attrs: {dir(resp) if hasattr(resp, '__dict__') else 'N/A'}")
+            logger.warning("Unknown Pinecone response format: %s", type(resp).__name__)
             return []
 
         formatted = []
@@ -124,7 +176,7 @@ class PineconeSearchService(BaseSearchService):
                         }
                     )
                 else:
-                    logger.warning(f"🔍 DEBUG: Hit with null id at index {i}")
+                    logger.warning("Pinecone hit with null id at index %d", i)
             elif hasattr(h, "hit"):
                 # SearchResultHit object
                 hit_data = h.hit
@@ -137,7 +189,7 @@ class PineconeSearchService(BaseSearchService):
                         }
                     )
                 else:
-                    logger.warning(f"🔍 DEBUG: Null hit data at index {i}")
+                    logger.warning("Null Pinecone hit data at index %d", i)
             elif isinstance(h, dict):
                 # Direct dict format
                 if h.get("id") is not None:
@@ -149,25 +201,25 @@ class PineconeSearchService(BaseSearchService):
                         }
                     )
                 else:
-                    logger.warning(f"🔍 DEBUG: Dict hit without id at index {i}")
+                    logger.warning("Pinecone dict hit without id at index %d", i)
             else:
                 logger.warning(
-                    f"🔍 DEBUG: Unknown hit format at index {i}: {type(h)}, attrs: {dir(h) if hasattr(h, '__dict__') else str(h)}"
+                    "Unknown Pinecone hit format at index %d: %s", i, type(h).__name__
                 )
 
-        logger.info(
-            f"🔍 DEBUG: _hits returning {len(formatted)} formatted results"
-        )
-        # Extract just the first 3 IDs for logging
-        sample_ids = [r["id"] for r in formatted[:3]]
-        logger.info(f"🔍 DEBUG: Sample IDs: {sample_ids}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "🔍 Parsed %d hits, sample ids: %s",
+                len(formatted),
+                [r["id"] for r in formatted[:3]],
+            )
         return formatted
 
     def rrf_merge(self, dense_hits, sparse_hits, k=60, top_k=20):
         """
         Reciprocal Rank Fusion to merge dense and sparse results
         """
-        logger.info(f"Merging {len(dense_hits)} dense and {len(sparse_hits)} sparse hits")
+        logger.debug("Merging %d dense and %d sparse hits", len(dense_hits), len(sparse_hits))
         scores = {}
 
         # Score dense results
@@ -233,47 +285,9 @@ class PineconeSearchService(BaseSearchService):
                     SearchResult(id=id, score=score_data, metadata={})
                 )
 
-        logger.info(f"Merged into {len(merged)} final results")
+        logger.debug("Merged into %d final results", len(merged))
         return merged
 
-    def _extract_media_from_jsonld(self, jsonld: dict) -> List[Dict[str, Any]]:
-        """Extract media information from JSON-LD raw_data"""
-        media = []
-        
-        # Check for @cmp:media field
-        if "@cmp:media" in jsonld:
-            cmp_media = jsonld["@cmp:media"]
-            if isinstance(cmp_media, list):
-                for item in cmp_media:
-                    if isinstance(item, dict) and item.get("@type") == "ImageObject":
-                        media.append({
-                            "type": "image",
-                            "url": item.get("url"),
-                            "caption": item.get("caption", ""),
-                            "width": item.get("width"),
-                            "height": item.get("height")
-                        })
-            elif isinstance(cmp_media, dict) and cmp_media.get("@type") == "ImageObject":
-                media.append({
-                    "type": "image", 
-                    "url": cmp_media.get("url"),
-                    "caption": cmp_media.get("caption", ""),
-                    "width": cmp_media.get("width"),
-                    "height": cmp_media.get("height")
-                })
-        
-        # Also check for direct image field
-        if "image" in jsonld and isinstance(jsonld["image"], str):
-            media.append({
-                "type": "image",
-                "url": jsonld["image"],
-                "caption": "",
-                "width": None,
-                "height": None
-            })
-        
-        return media
-
     def _enrich_with_product_data(self, search_results: List[SearchResult]) -> List[SearchResult]:
         """
         Enrich search results with database product information
@@ -286,46 +300,33 @@ class PineconeSearchService(BaseSearchService):
         """
         # Extract URNs
         urns = [result.id for result in search_results]
-        logger.info(f"🔍 Enriching {len(urns)} results, sample URNs: {urns[:3]}")
+        logger.debug("🔍 Enriching %d results, sample URNs: %s", len(urns), urns[:3])
         
-        # Batch fetch products by URN
-        products = self.product_repository.get_products_by_urns(urns)
-        logger.info(f"🔍 Found {len(products)} products in database")
+        # One indexed lookup on the denormalized search cards
+        cards = self.search_card_repository.get_by_urns(urns)
+        logger.debug("🔍 Found %d products in database", len(cards))
         
-        # Create URN to product mapping
-        urn_to_product = {p.urn: p for p in products}
+        # Create URN to card mapping
+        urn_to_card = {card.urn: card for card in cards}
         
         # Enrich results
         enriched = []
         for result in search_results:
-            product = urn_to_product.get(result.id)
-            if product:
-                # Extract media from raw_data if available
-                media = []
-                if product.raw_data:
-                    media = self._extract_media_from_jsonld(product.raw_data)
-                
+            card = urn_to_card.get(result.id)
+            if card:
                 # Build enriched result
-                result.product_name = product.name
-                result.product_urn = product.urn
-                result.product_brand = product.brand.name if product.brand else None
-                result.product_category = product.category.name if product.category else None
-                result.product_description = product.description
-                result.product_url = product.url
-                result.product_media = media
+                result.product_name = card.name
+                result.product_urn = card.urn
+                result.product_brand = card.brand_name
+                result.product_category = card.category_name
+                result.product_description = card.description
+                result.product_url = card.url
+                result.product_media = card.media or []
                 
-                # Add offer information
-                if product.offers:
-                    result.product_price = product.offers[0].price
-                    result.product_offers = [
-                        {
-                            "price": offer.price,
-                            "currency": offer.price_currency,
-                            "availability": offer.availability,
-                            "inventory_level": offer.inventory_level
-                        }
-                        for offer in product.offers
-                    ]
+                # Add offer information, cheapest first
+                if card.offers:
+                    result.product_price = card.offers[0]["price"]
+                    result.product_offers = card.offers
                 
                 enriched.append(result)
             else:
@@ -0,0 +1,171 @@
+import logging
+import math
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+import numpy as np
+
+from app.core.config import settings
+
+if TYPE_CHECKING:
+    from .base import SearchResult
+
+logger = logging.getLogger(__name__)
+
+# Feature columns, each scaled to [0, 1] within the candidate set
+RERANK_FEATURES = (
+    "score",  # fused retrieval score
+    "in_stock",  # best offer is available to buy
+    "price_percentile",  # 0 for the cheapest candidate, 1 for the most expensive
+    "delivery_days",  # est_delivery_max_days
+    "inventory",  # log-scaled inventory_level
+    "warranty",  # warranty_months
+)
+
+_IN_STOCK = {"instock", "limitedavailability", "onlineonly", "instoreonly"}
+
+
+def parse_weights(spec: str) -> Dict[str, float]:
+    """
+    Parse "feature=weight,..." into a weight per feature.
+
+    Raises:
+        ValueError: If a feature is unknown or a weight is not a number
+    """
+    weights = {}
+    for part in spec.split(","):
+        if not part.strip():
+            continue
+        name, _, value = part.partition("=")
+        name = name.strip()
+        if name not in RERANK_FEATURES:
+            raise ValueError(f"Unknown re-ranking feature: {name}")
+        weights[name] = float(value)
+    return weights
+
+
+def _is_in_stock(availability: Optional[str]) -> bool:
+    if not availability:
+        return False
+    value = str(availability).rsplit("/", 1)[-1].replace("_", "").lower()
+    return value in _IN_STOCK
+
+
+def _best_offer(offers: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    # Card offers are sorted cheapest first; prefer the cheapest one in stock
+    for offer in offers:
+        if _is_in_stock(offer.get("availability")):
+            return offer
+    return offers[0] if offers else None
+
+
+def _number(value) -> float:
+    try:
+        return float(value) if value is not None else math.nan
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def candidate_features(candidate: "SearchResult") -> List[float]:
+    """
+    Raw feature values of a candidate, NaN where unknown.
+
+    Reads the search-card offers the pgvector ranking query returns in
+    ``metadata["offers"]`` (or the offers of an already enriched candidate),
+    else the price and availability stored with the vectors.
+    """
+    metadata = candidate.metadata or {}
+    offers = metadata.get("offers") or candidate.product_offers
+    if offers:
+        offer = _best_offer(offers) or {}
+    else:
+        offer = {"price": metadata.get("price"), "availability": metadata.get("availability")}
+    availability = offer.get("availability")
+    return [
+        candidate.score,
+        float(_is_in_stock(availability)) if availability else math.nan,
+        _number(offer.get("price")),
+        _number(offer.get("est_delivery_max_days")),
+        math.log1p(max(_number(offer.get("inventory_level")), 0.0))
+        if offer.get("inventory_level") is not None
+        else math.nan,
+        _number(offer.get("warranty_months")),
+    ]
+
+
+class LinearReranker:
+    """
+    Re-orders fused candidates by a linear model over retrieval and offer features.
+
+    Features are scaled to [0, 1] within the candidate set (the retrieval
+    score relative to the best one, price as a percentile rank, the others
+    min-max), and unknown values take the
+    column's mean so they neither help nor hurt a candidate. The new score
+    is the weighted sum; ties keep the retrieval order.
+    """
+
+    def __init__(self, weights: Dict[str, float]):
+        self.weights = np.array([weights.get(name, 0.0) for name in RERANK_FEATURES])
+
+    def scale(self, raw: np.ndarray) -> np.ndarray:
+        """Scale a (candidates x features) matrix of raw values column-wise to [0, 1]"""
+        features = np.full(raw.shape, 0.5)
+        known = ~np.isnan(raw)
+        for j, name in enumerate(RERANK_FEATURES):
+            column, mask = raw[:, j], known[:, j]
+            if not mask.any():
+                continue
+            values = column[mask]
+            if name == "price_percentile":
+                # Rank of each price among the known prices, equal prices sharing
+                # their average rank
+                ordered = np.sort(values)
+                first = np.searchsorted(ordered, values, side="left")
+                last = np.searchsorted(ordered, values, side="right") - 1
+                scaled = (first + last) / (2 * max(len(values) - 1, 1))
+            elif name == "score":
+                # Relative to the best candidate, so small score gaps stay small
+                high = values.max()
+                scaled = values / high if high > 0 else np.ones(len(values))
+            else:
+                low, high = values.min(), values.max()
+                scaled = (values - low) / (high - low) if high > low else np.full(len(values), 0.5)
+            features[mask, j] = scaled
+            features[~mask, j] = scaled.mean()
+        return features
+
+    def rerank(self, candidates: List["SearchResult"]) -> List["SearchResult"]:
+        """Return the candidates in model order, with ``score`` set to the model score"""
+        if len(candidates) < 2:
+            return candidates
+        raw = np.array([candidate_features(c) for c in candidates], dtype=np.float64)
+        scores = self.scale(raw) @ self.weights
+        order = np.argsort(-scores, kind="stable")
+        reranked = []
+        for i in order:
+            candidate = candidates[i]
+            candidate.score = float(scores[i])
+            reranked.append(candidate)
+        return reranked
+
+
+def rerank_config() -> Optional[str]:
+    """Canonical form of the active re-ranking weights, or None if re-ranking is disabled"""
+    if not settings.SEARCH_RERANK_ENABLED:
+        return None
+    weights = parse_weights(settings.SEARCH_RERANK_WEIGHTS)
+    return ",".join(f"{name}={weights[name]:g}" for name in RERANK_FEATURES if name in weights)
+
+
+_reranker: Optional[LinearReranker] = None
+
+
+def get_reranker() -> Optional[LinearReranker]:
+    """Get the configured re-ranking model, or None if re-ranking is disabled"""
+    global _reranker
+    if not settings.SEARCH_RERANK_ENABLED:
+        return None
+
+    if _reranker is None:
+        _reranker = LinearReranker(parse_weights(settings.SEARCH_RERANK_WEIGHTS))
+        logger.info(f"Search re-ranking enabled with weights {settings.SEARCH_RERANK_WEIGHTS}")
+    return _reranker
@@ -0,0 +1,217 @@
+import hashlib
+import json
+import logging
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from app.core.cache import LRUCache, get_redis_client
+from app.core.config import settings
+from app.core.metrics import SEARCH_CACHE_REQUESTS
+from .filters import SearchFilters
+from .rerank import rerank_config
+
+logger = logging.getLogger(__name__)
+
+
+class SearchResultCache:
+    """
+    Two-tier cache for formatted search responses.
+
+    Entries are keyed on (backend, top_k, filters, normalized query) plus a
+    catalog generation. Ingestion bumps the generation of the organization it
+    touched and the global one, so entries are never served across a catalog
+    change: unfiltered queries follow the global generation, queries filtered
+    to one organization follow that organization's generation.
+
+    Generations live in Redis so API replicas and the worker share them.
+    Without a Redis client they are only visible within this process, which
+    is enough for tests and single-process tools but not for the API, so
+    get_search_result_cache() only enables the cache when Redis is configured.
+
+    make_key(), get() and set() may block on Redis; async callers go through
+    lookup() and set() in the search executor.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 5000,
+        ttl_seconds: int = 3600,
+        redis_client=None,
+        key_prefix: str = "cmp:search",
+    ):
+        self.local = LRUCache(max_size=max_size, ttl_seconds=ttl_seconds)
+        self.redis = redis_client
+        self.ttl_seconds = ttl_seconds
+        self.key_prefix = key_prefix
+        self._generations: Dict[str, int] = {}
+        self._generations_lock = threading.Lock()
+        self.local_hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def normalize_query(text: str) -> str:
+        """Lower-case and collapse whitespace so trivial variants share an entry"""
+        return " ".join(text.lower().split())
+
+    def _generation_key(self, scope: str) -> str:
+        return f"{self.key_prefix}:generation:{scope}"
+
+    def get_generation(self, scope: str = "all") -> Optional[int]:
+        """
+        Current catalog generation for a scope ("all" or an organization URN).
+
+        Returns None when the shared generation cannot be read, in which case
+        the cache must be bypassed.
+        """
+        if self.redis is not None:
+            try:
+                value = self.redis.get(self._generation_key(scope))
+                return int(value) if value else 0
+            except Exception as e:
+                logger.warning(f"Search cache generation lookup failed: {e}")
+                return None
+        return self._generations.get(scope, 0)
+
+    def bump_generation(self, org_urn: Optional[str] = None):
+        """Invalidate cached results for an organization and all unfiltered results"""
+        scopes = ["all"] + ([org_urn] if org_urn else [])
+
+        with self._generations_lock:
+            for scope in scopes:
+                self._generations[scope] = self._generations.get(scope, 0) + 1
+
+        if self.redis is not None:
+            try:
+                pipe = self.redis.pipeline()
+                for scope in scopes:
+                    pipe.incr(self._generation_key(scope))
+                pipe.execute()
+            except Exception as e:
+                logger.warning(f"Search cache generation bump failed: {e}")
+
+        logger.info(f"Invalidated search result cache for {', '.join(scopes)}")
+
+    def make_key(
+        self,
+        query: str,
+        top_k: int,
+        filters: Optional[SearchFilters] = None,
+        backend: Optional[str] = None,
+        **extra: Any,
+    ) -> Optional[str]:
+        """Build the cache key for a search, or None if the generation is unavailable"""
+        filter_values = filters.to_dict() if filters else {}
+        scope = filter_values.get("organization_urn", "all")
+        payload = json.dumps(
+            {
+                "q": self.normalize_query(query),
+                "top_k": top_k,
+                "filters": filter_values,
+                "backend": backend or settings.VECTOR_PROVIDER,
+                "rerank": rerank_config(),
+                **extra,
+            },
+            sort_keys=True,
+        )
+        generation = self.get_generation(scope)
+        if generation is None:
+            return None
+        digest = hashlib.sha1(payload.encode("utf-8")).hexdigest()
+        return f"{self.key_prefix}:{generation}:{digest}"
+
+    def lookup(
+        self,
+        query: str,
+        top_k: int,
+        filters: Optional[SearchFilters] = None,
+        backend: Optional[str] = None,
+        **extra: Any,
+    ) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """
+        Build the key for a search and read it in one call.
+
+        Returns:
+            Tuple of (cache key or None if the cache must be bypassed, cached
+            payload or None on a miss)
+        """
+        key = self.make_key(query, top_k, filters, backend, **extra)
+        return key, (self.get(key) if key else None)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a cached response payload, or None on a miss"""
+        payload = self.local.get(key)
+        if payload is not None:
+            self.local_hits += 1
+            SEARCH_CACHE_REQUESTS.labels(cache="search_result", result="hit").inc()
+            return payload
+
+        if self.redis is not None:
+            try:
+                raw = self.redis.get(key)
+            except Exception as e:
+                logger.warning(f"Search cache Redis lookup failed: {e}")
+                raw = None
+
+            if raw:
+                payload = json.loads(raw)
+                self.local.set(key, payload)
+                self.redis_hits += 1
+                SEARCH_CACHE_REQUESTS.labels(cache="search_result", result="hit").inc()
+                return payload
+
+        self.misses += 1
+        SEARCH_CACHE_REQUESTS.labels(cache="search_result", result="miss").inc()
+        return None
+
+    def set(self, key: str, payload: Dict[str, Any]):
+        """Store a response payload in both tiers"""
+        self.local.set(key, payload)
+
+        if self.redis is not None:
+            try:
+                self.redis.set(key, json.dumps(payload), ex=self.ttl_seconds or None)
+            except Exception as e:
+                logger.warning(f"Search cache Redis write failed: {e}")
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters for both tiers"""
+        return {
+            "local_hits": self.local_hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "size": len(self.local),
+        }
+
+
+_search_result_cache: Optional[SearchResultCache] = None
+
+
+def get_search_result_cache() -> Optional[SearchResultCache]:
+    """
+    Get the process-wide search result cache, or None if caching is disabled.
+
+    The cache also needs CACHE_REDIS_URL: ingestion runs in the worker, and
+    its generation bumps only reach the API processes through Redis.
+    """
+    global _search_result_cache
+    if not settings.SEARCH_CACHE_ENABLED:
+        return None
+
+    if _search_result_cache is None:
+        redis_client = get_redis_client()
+        if redis_client is None:
+            return None
+        _search_result_cache = SearchResultCache(
+            max_size=settings.SEARCH_CACHE_SIZE,
+            ttl_seconds=settings.SEARCH_CACHE_TTL,
+            redis_client=redis_client,
+        )
+    return _search_result_cache
+
+
+def invalidate_search_results(org_urn: Optional[str] = None):
+    """Invalidate cached search results after a catalog change"""
+    cache = get_search_result_cache()
+    if cache is not None:
+        cache.bump_generation(org_urn)
@@ -0,0 +1,203 @@
+import json
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.metrics import SEARCH_CACHE_REQUESTS
+from .base import SearchResult
+from .filters import SearchFilters
+from .result_cache import get_search_result_cache
+
+logger = logging.getLogger(__name__)
+
+
+class SemanticQueryCache:
+    """
+    In-process cache of candidate rankings keyed by query embedding.
+
+    A search whose query embedding is within ``threshold`` cosine similarity
+    of a cached query with the same top_k, filters, backend and catalog
+    generation reuses that query's ranking, so paraphrases ("wireless
+    earbuds", "bluetooth earbuds wireless") skip the index query.
+
+    The unit-normalized query vectors live in one preallocated matrix and a
+    lookup is a single matrix-vector product over it. When full, the least
+    recently used slot is overwritten. Entries from an older catalog
+    generation never match and are evicted as they age.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 2048,
+        threshold: float = 0.95,
+        ttl_seconds: int = 3600,
+    ):
+        self.max_size = max_size
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self._vectors: Optional[np.ndarray] = None
+        self._partitions: List[Optional[str]] = [None] * max_size
+        self._values: List[Optional[List[Dict[str, Any]]]] = [None] * max_size
+        self._last_used = np.zeros(max_size, dtype=np.float64)
+        self._expires_at = np.zeros(max_size, dtype=np.float64)
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def partition(
+        top_k: int,
+        filters: Optional[SearchFilters] = None,
+        backend: Optional[str] = None,
+        generation: int = 0,
+        collapse_variants: bool = False,
+    ) -> str:
+        """Key of the entries a search may be answered from"""
+        return json.dumps(
+            {
+                "top_k": top_k,
+                "filters": filters.to_dict() if filters else {},
+                "backend": backend or settings.VECTOR_PROVIDER,
+                "generation": generation,
+                "collapse_variants": collapse_variants,
+            },
+            sort_keys=True,
+        )
+
+    @staticmethod
+    def _normalize(embedding: List[float]) -> Optional[np.ndarray]:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = float(np.linalg.norm(vector))
+        if not norm:
+            return None
+        return vector / norm
+
+    def get(self, embedding: List[float], partition: str) -> Optional[List[SearchResult]]:
+        """Return the ranking of the most similar cached query, or None on a miss"""
+        vector = self._normalize(embedding)
+        with self._lock:
+            index = None
+            if vector is not None and self._size and self._vectors.shape[1] == vector.shape[0]:
+                similarities = self._vectors[: self._size] @ vector
+                now = time.monotonic()
+                for i in np.argsort(similarities)[::-1]:
+                    if similarities[i] < self.threshold:
+                        break
+                    if self._partitions[i] == partition and self._expires_at[i] > now:
+                        index = int(i)
+                        break
+
+            if index is None:
+                self.misses += 1
+                SEARCH_CACHE_REQUESTS.labels(cache="semantic", result="miss").inc()
+                return None
+
+            self._last_used[index] = time.monotonic()
+            payload = self._values[index]
+            self.hits += 1
+        SEARCH_CACHE_REQUESTS.labels(cache="semantic", result="hit").inc()
+        logger.debug("Semantic cache hit with similarity %.4f", similarities[index])
+        # Enrichment mutates results, so never hand out the stored objects
+        return [SearchResult(**dict(item, metadata=dict(item["metadata"]))) for item in payload]
+
+    def set(self, embedding: List[float], partition: str, candidates: List[SearchResult]):
+        """Store a query's ranking, overwriting the least recently used slot when full"""
+        vector = self._normalize(embedding)
+        if vector is None or self.max_size <= 0:
+            return
+        payload = [
+            {
+                "id": c.id,
+                "score": c.score,
+                "metadata": dict(c.metadata),
+                "dense_score": c.dense_score,
+                "sparse_score": c.sparse_score,
+                "variant_count": c.variant_count,
+                "product_group_urn": c.product_group_urn,
+            }
+            for c in candidates
+        ]
+
+        with self._lock:
+            if self._vectors is None or self._vectors.shape[1] != vector.shape[0]:
+                # First entry, or the embedding model changed
+                self._vectors = np.zeros((self.max_size, vector.shape[0]), dtype=np.float32)
+                self._size = 0
+
+            if self._size < self.max_size:
+                index = self._size
+                self._size += 1
+            else:
+                index = int(np.argmin(self._last_used))
+
+            now = time.monotonic()
+            self._vectors[index] = vector
+            self._partitions[index] = partition
+            self._values[index] = payload
+            self._last_used[index] = now
+            self._expires_at[index] = now + self.ttl_seconds if self.ttl_seconds else np.inf
+
+    def clear(self):
+        """Remove all entries"""
+        with self._lock:
+            self._size = 0
+            self._partitions = [None] * self.max_size
+            self._values = [None] * self.max_size
+
+    def __len__(self) -> int:
+        return self._size
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and current size"""
+        return {"hits": self.hits, "misses": self.misses, "size": self._size}
+
+
+_semantic_cache: Optional[SemanticQueryCache] = None
+
+
+def get_semantic_cache() -> Optional[SemanticQueryCache]:
+    """
+    Get the process-wide semantic query cache, or None if disabled.
+
+    Catalog generations come from the search result cache, so the semantic
+    tier is only used when that cache is enabled too. Hybrid rankings depend
+    on the query's lexical terms, which a near-duplicate embedding does not
+    imply, so the cache is also off with PGVECTOR_HYBRID_SEARCH.
+    """
+    global _semantic_cache
+    if not (settings.SEARCH_SEMANTIC_CACHE_ENABLED and settings.SEARCH_CACHE_ENABLED):
+        return None
+    if settings.PGVECTOR_HYBRID_SEARCH:
+        return None
+
+    if _semantic_cache is None:
+        _semantic_cache = SemanticQueryCache(
+            max_size=settings.SEARCH_SEMANTIC_CACHE_SIZE,
+            threshold=settings.SEARCH_SEMANTIC_CACHE_THRESHOLD,
+            ttl_seconds=settings.SEARCH_CACHE_TTL,
+        )
+    return _semantic_cache
+
+
+def semantic_partition(
+    top_k: int, filters: Optional[SearchFilters] = None, collapse_variants: bool = False
+) -> Optional[str]:
+    """
+    Partition for a search at the current catalog generation, or None if the
+    generation cannot be read and the cache must be bypassed.
+    """
+    result_cache = get_search_result_cache()
+    if result_cache is None:
+        return None
+    scope = (filters.to_dict() if filters else {}).get("organization_urn", "all")
+    generation = result_cache.get_generation(scope)
+    if generation is None:
+        return None
+    return SemanticQueryCache.partition(
+        top_k, filters, generation=generation, collapse_variants=collapse_variants
+    )
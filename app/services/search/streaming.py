@@ -0,0 +1,118 @@
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.utils.formatters import format_search_result_item
+from .base import BaseSearchService, SearchResult
+from .filters import SearchFilters
+from .pagination import SearchPage, rank_page
+
+logger = logging.getLogger(__name__)
+
+# (event name, payload)
+SearchEvent = Tuple[str, Dict[str, Any]]
+
+
+class SearchStream:
+    """
+    One search page delivered as a sequence of events.
+
+    ``candidates`` lists the ranked product URNs and scores as soon as
+    retrieval finishes, ``items`` carries formatted ListItems each time a
+    batch of SEARCH_STREAM_BATCH_SIZE products has been enriched, and
+    ``done`` closes the page.
+
+    The stream opens its own database session and closes it when iteration
+    ends, including when the consumer stops early (client disconnect). Work
+    already handed to the search thread pool cannot be interrupted, so the
+    session is then closed once that step completes.
+    """
+
+    def __init__(
+        self,
+        query: str,
+        limit: int,
+        session_factory: Callable[[], Any],
+        service_factory: Callable[[Any], BaseSearchService],
+        cursor: Optional[str] = None,
+        filters: Optional[SearchFilters] = None,
+        batch_size: Optional[int] = None,
+    ):
+        self.query = query
+        self.limit = limit
+        self.cursor = cursor
+        self.filters = filters
+        self.batch_size = max(1, batch_size or settings.SEARCH_STREAM_BATCH_SIZE)
+        self._session_factory = session_factory
+        self._service_factory = service_factory
+        self.page: Optional[SearchPage] = None
+        # Enriched results streamed so far, in rank order
+        self.results: List[SearchResult] = []
+        self.degraded: List[str] = []
+
+    async def events(self) -> AsyncIterator[SearchEvent]:
+        session = self._session_factory()
+        pending: Optional[asyncio.Future] = None
+
+        async def step(awaitable: Awaitable):
+            # Shielded so a cancelled consumer leaves the step running to completion
+            # instead of closing the session under a pool thread still using it
+            nonlocal pending
+            pending = asyncio.ensure_future(awaitable)
+            return await asyncio.shield(pending)
+
+        try:
+            search_service = self._service_factory(session)
+            page = await step(
+                rank_page(
+                    search_service, self.query, self.limit,
+                    cursor=self.cursor, filters=self.filters,
+                )
+            )
+            self.page = page
+            self.degraded = search_service.degraded_retrievers
+            yield "candidates", {
+                "itemListElement": [
+                    {
+                        "@type": "ListItem",
+                        "position": page.offset + i + 1,
+                        "item": {"@id": c.id, "cmp:searchScore": c.score},
+                    }
+                    for i, c in enumerate(page.results)
+                ],
+                "cmp:totalResults": len(page.results),
+                "cmp:degraded": bool(self.degraded),
+                "cmp:nextCursor": page.next_cursor,
+            }
+
+            positions = {c.id: page.offset + i + 1 for i, c in enumerate(page.results)}
+            for start in range(0, len(page.results), self.batch_size):
+                batch = page.results[start : start + self.batch_size]
+                enriched = await step(search_service.aenrich_results(batch))
+                self.results.extend(enriched)
+                yield "items", {
+                    "itemListElement": [
+                        {
+                            "@type": "ListItem",
+                            "position": positions.get(result.id),
+                            "item": format_search_result_item(result),
+                        }
+                        for result in enriched
+                    ]
+                }
+
+            yield "done", {"cmp:totalResults": len(self.results)}
+        finally:
+            if pending is not None and not pending.done():
+                logger.info("Search stream abandoned, closing its session after the current step")
+                pending.add_done_callback(lambda future: _close_after(future, session))
+            else:
+                session.close()
+
+
+def _close_after(future: asyncio.Future, session):
+    # Retrieve the outcome so an abandoned step's error is not reported as unhandled
+    if not future.cancelled() and future.exception() is not None:
+        logger.warning(f"Abandoned search step failed: {future.exception()}")
+    session.close()
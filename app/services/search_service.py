@@ -3,6 +3,7 @@ from dataclasses import dataclass
 from app.core.logging import get_logger
 from app.db.repositories.vector_repository_native import VectorRepository
 from app.db.repositories.product_repository import ProductRepository
+from app.services.search.executor import search_dense_and_sparse
 import time
 
 logger = get_logger(__name__)
@@ -36,6 +37,8 @@ class SearchService:
         self.db_session = db_session
         self.vector_repository = VectorRepository()
         self.product_repository = ProductRepository(db_session)
+        # Names of retrievers that failed or timed out during the last search
+        self.degraded_retrievers: List[str] = []
 
     def search_products(
         self,
@@ -53,11 +56,8 @@ class SearchService:
                 f"🔍 Querying Pinecone indices with Inference API (fetch_k={fetch_k})..."
             )
             start_time = time.time()
-            dense_results = self.vector_repository._search_dense_index(
-                query, fetch_k, alpha, include_metadata
-            )
-            sparse_results = self.vector_repository._search_sparse_index(
-                query, fetch_k, alpha, include_metadata
+            dense_results, sparse_results, self.degraded_retrievers = search_dense_and_sparse(
+                self.vector_repository, query, fetch_k, alpha, include_metadata
             )
 
             # logger.debug(f"🔍 DEBUG: Dense results: {dense_results}")
@@ -90,30 +90,28 @@ class SearchService:
         """
         Return list of {'id', 'score', 'metadata'} with all product fields from Pinecone
         """
-        logger.info(f"🔍 DEBUG: _hits input type: {type(resp)}")
+        logger.debug("🔍 _hits input type: %s", type(resp))
 
         if hasattr(resp, "result") and hasattr(resp.result, "hits"):
             # SearchRecordsResponse object
             raw = resp.result.hits
-            logger.debug(
-                f"🔍 DEBUG: Using SearchRecordsResponse format, raw hits: {len(raw)}"
-            )
+            logger.debug("🔍 Using SearchRecordsResponse format, raw hits: %s", len(raw))
         elif isinstance(resp, dict):
             if "matches" in resp:
                 raw = resp["matches"]
-                logger.debug(f"🔍 DEBUG: Using 'matches' format, raw hits: {len(raw)}")
+                logger.debug("🔍 Using 'matches' format, raw hits: %s", len(raw))
             elif "result" in resp and "hits" in resp["result"]:
                 raw = resp["result"]["hits"]
-                logger.debug(
-                    f"🔍 DEBUG: Using 'result.hits' format, raw hits: {len(raw)}"
-                )
+                logger.debug("🔍 Using 'result.hits' format, raw hits: %s", len(raw))
+            elif "results" in resp:
+                # pgvector repository format
+                raw = resp["results"]
+                logger.debug("🔍 Using 'results' format, raw hits: %s", len(raw))
             else:
-                logger.error(
-                    f"🔍 DEBUG: Unexpected response shape: {resp.keys() if isinstance(resp, dict) else 'Not a dict'}"
-                )
+                logger.error("Unexpected response shape: %s", list(resp.keys()))
                 raise ValueError("Unexpected response shape")
         else:
-            logger.error(f"🔍 DEBUG: Unexpected response type: {type(resp)}")
+            logger.error("Unexpected response type: %s", type(resp).__name__)
             raise ValueError("Unexpected response type")
 
         hits = []
@@ -133,8 +131,8 @@ class SearchService:
             }
             hits.append(hit_data)
 
-        logger.info(f"🔍 DEBUG: _hits output: {len(hits)} hits")
-        logger.info(f"🔍 DEBUG: First hit: {hits[0] if hits else 'None'}")
+        logger.debug("🔍 _hits output: %s hits", len(hits))
+        logger.debug("🔍 First hit: %s", hits[0] if hits else 'None')
 
         return hits
 
@@ -143,14 +141,10 @@ class SearchService:
         Merge via RRF: score = Σ 1/(k + rank)
         """
         logger.debug(
-            f"🔍 DEBUG: RRF merge input - dense_hits: {len(dense_hits)}, sparse_hits: {len(sparse_hits)}"
-        )
-        logger.debug(
-            f"🔍 DEBUG: First dense hit: {dense_hits[0] if dense_hits else 'None'}"
-        )
-        logger.debug(
-            f"🔍 DEBUG: First sparse hit: {sparse_hits[0] if sparse_hits else 'None'}"
+            "🔍 RRF merge input - dense_hits: %s, sparse_hits: %s", len(dense_hits), len(sparse_hits)
         )
+        logger.debug("🔍 First dense hit: %s", dense_hits[0] if dense_hits else 'None')
+        logger.debug("🔍 First sparse hit: %s", sparse_hits[0] if sparse_hits else 'None')
 
         fused = {}
         for rank, hit in enumerate(dense_hits, 1):
@@ -175,10 +169,8 @@ class SearchService:
                 )
             )
 
-        logger.info(f"🔍 DEBUG: RRF merge output - {len(search_results)} results")
-        logger.info(
-            f"🔍 DEBUG: First merged result: {search_results[0] if search_results else 'None'}"
-        )
+        logger.debug("🔍 RRF merge output - %s results", len(search_results))
+        logger.debug("🔍 First merged result: %s", search_results[0] if search_results else 'None')
 
         return search_results
 
@@ -190,7 +182,7 @@ class SearchService:
             return search_results
 
         try:
-            logger.info(f"🔍 DEBUG: Enriching {len(search_results)} results")
+            logger.debug("🔍 Enriching %s results", len(search_results))
 
             # Extract product IDs - handle both SearchResult objects and dictionaries
             product_ids = []
@@ -202,46 +194,38 @@ class SearchService:
                     # Dictionary
                     product_ids.append(result.get("id"))
 
-            logger.info(
-                f"🔍 DEBUG: Extracted product IDs: {product_ids[:5]}..."
-            )  # Show first 5
+            logger.debug("🔍 Extracted product IDs: %s...", product_ids[:5])  # Show first 5
 
             products = self.product_repository.get_products_by_urns(product_ids)
 
-            logger.info(f"🔍 DEBUG: Found {len(products)} products in database")
+            logger.debug("🔍 Found %s products in database", len(products))
 
             # Check if offers are being loaded
             total_offers = 0
             for product in products:
                 if hasattr(product, "offers") and product.offers:
                     total_offers += len(product.offers)
-                    logger.info(
-                        f"🔍 DEBUG: Product {product.id} has {len(product.offers)} offers"
-                    )
+                    logger.debug("🔍 Product %s has %s offers", product.id, len(product.offers))
                 else:
-                    logger.info(
-                        f"🔍 DEBUG: Product {product.id} has no offers (offers attribute: {hasattr(product, 'offers')})"
+                    logger.debug(
+                        "🔍 Product %s has no offers (offers attribute: %s)", product.id, hasattr(product, 'offers')
                     )
 
-            logger.info(f"🔍 DEBUG: Total offers found: {total_offers}")
+            logger.debug("🔍 Total offers found: %s", total_offers)
 
             # Create mapping
             product_map = {}
             for product in products:
-                # Extract media from product JSON-LD first, then fallback to product group
-                media = self._extract_media_from_jsonld(product.raw_data)
-                if not media and product.product_group:
-                    media = self._extract_media_from_jsonld(
-                        product.product_group.raw_data
-                    )
+                # Media is extracted at ingestion, with the product group fallback applied
+                media = list(product.media or [])
 
                 # Get brand name from the loaded brand relationship
                 brand_name = product.brand.name if product.brand else None
 
                 # Extract prices from offers
                 prices = []
-                logger.info(
-                    f"🔍 DEBUG: Product {product.id} has {len(product.offers) if product.offers else 0} offers"
+                logger.debug(
+                    "🔍 Product %s has %s offers", product.id, len(product.offers) if product.offers else 0
                 )
                 if product.offers:
                     # Use a set to track unique offers to avoid duplicates
@@ -256,8 +240,11 @@ class SearchService:
                         )
                         if offer_key not in seen_offers:
                             seen_offers.add(offer_key)
-                            logger.info(
-                                f"🔍 DEBUG: Offer: price={offer.price}, currency={offer.price_currency}, availability={offer.availability}"
+                            logger.debug(
+                                "🔍 Offer: price=%s, currency=%s, availability=%s",
+                                offer.price,
+                                offer.price_currency,
+                                offer.availability,
                             )
                             offer_data = {
                                 "price": offer.price,
@@ -296,11 +283,14 @@ class SearchService:
 
                             prices.append(offer_data)
                         else:
-                            logger.info(
-                                f"🔍 DEBUG: Skipping duplicate offer: price={offer.price}, currency={offer.price_currency}, availability={offer.availability}"
+                            logger.debug(
+                                "🔍 Skipping duplicate offer: price=%s, currency=%s, availability=%s",
+                                offer.price,
+                                offer.price_currency,
+                                offer.availability,
                             )
                 else:
-                    logger.info(f"🔍 DEBUG: No offers found for product {product.id}")
+                    logger.debug("🔍 No offers found for product %s", product.id)
 
                 product_map[product.urn] = {
                     "name": product.name,
@@ -313,20 +303,16 @@ class SearchService:
                     "media": media,
                 }
 
-            logger.info(
-                f"🔍 DEBUG: Product map keys: {list(product_map.keys())[:5]}..."
-            )  # Show first 5
+            logger.debug("🔍 Product map keys: %s...", list(product_map.keys())[:5])  # Show first 5
 
             # Enrich results
             for result in search_results:
                 result_id = result.id if hasattr(result, "id") else result.get("id")
-                logger.info(f"🔍 DEBUG: Processing result ID: {result_id}")
+                logger.debug("🔍 Processing result ID: %s", result_id)
                 if result_id in product_map:
                     data = product_map[result_id]
-                    logger.info(
-                        f"🔍 DEBUG: Found product data for {result_id}: {data['name']}"
-                    )
-                    logger.info(f"🔍 DEBUG: Offers data: {data.get('prices', [])}")
+                    logger.debug("🔍 Found product data for %s: %s", result_id, data['name'])
+                    logger.debug("🔍 Offers data: %s", data.get('prices', []))
                     if hasattr(result, "product_name"):
                         # SearchResult object
                         result.product_name = data["name"]
@@ -340,9 +326,7 @@ class SearchService:
                         result.product_description = data["description"]
                         result.product_url = data["url"]
                         result.product_media = data["media"]
-                        logger.info(
-                            f"🔍 DEBUG: Set product_offers to: {result.product_offers}"
-                        )
+                        logger.debug("🔍 Set product_offers to: %s", result.product_offers)
                     else:
                         # Dictionary
                         result["product_name"] = data["name"]
@@ -356,11 +340,9 @@ class SearchService:
                         result["product_description"] = data["description"]
                         result["product_url"] = data["url"]
                         result["product_media"] = data["media"]
-                        logger.info(
-                            f"🔍 DEBUG: Set product_offers to: {result.get('product_offers')}"
-                        )
+                        logger.debug("🔍 Set product_offers to: %s", result.get('product_offers'))
                 else:
-                    logger.info(f"🔍 DEBUG: No product data found for {result_id}")
+                    logger.debug("🔍 No product data found for %s", result_id)
 
                 # Also extract fields from Pinecone metadata as fallback if database enrichment failed
                 if hasattr(result, "metadata") and result.metadata:
@@ -388,59 +370,3 @@ class SearchService:
         except Exception as e:
             logger.error(f"Error enriching product data: {str(e)}")
             return search_results
-
-    def _extract_media_from_jsonld(
-        self, jsonld: Dict[str, Any]
-    ) -> List[Dict[str, Any]]:
-        """Extract media information from JSON-LD data"""
-        try:
-            if not jsonld:
-                return []
-
-            media_items = []
-            
-            # Check for @cmp:media in the main JSON-LD
-            if "@cmp:media" in jsonld:
-                media = jsonld["@cmp:media"]
-                if isinstance(media, list):
-                    media_items.extend(media)
-                elif isinstance(media, dict):
-                    media_items.append(media)
-            
-            # Check for image field (common in both Product and ProductGroup)
-            if "image" in jsonld:
-                images = jsonld["image"]
-                if isinstance(images, list):
-                    for img in images:
-                        if isinstance(img, dict):
-                            media_items.append(img)
-                        elif isinstance(img, str):
-                            media_items.append({"@type": "ImageObject", "url": img})
-                elif isinstance(images, dict):
-                    media_items.append(images)
-                elif isinstance(images, str):
-                    media_items.append({"@type": "ImageObject", "url": images})
-
-            # Check for @cmp:media in offers
-            offers = jsonld.get("offers", {})
-            if isinstance(offers, dict) and "@cmp:media" in offers:
-                media = offers["@cmp:media"]
-                if isinstance(media, list):
-                    media_items.extend(media)
-                elif isinstance(media, dict):
-                    media_items.append(media)
-
-            # Check for @cmp:media in nested structures
-            for key, value in jsonld.items():
-                if key not in ["@cmp:media", "image", "offers"] and isinstance(value, dict) and "@cmp:media" in value:
-                    media = value["@cmp:media"]
-                    if isinstance(media, list):
-                        media_items.extend(media)
-                    elif isinstance(media, dict):
-                        media_items.append(media)
-
-            return media_items
-
-        except Exception as e:
-            logger.error(f"Error extracting media from JSON-LD: {str(e)}")
-            return []
@@ -2,6 +2,7 @@ import time
 import logging
 from uuid import UUID
 from app.core.config import settings
+from app.core.metrics import INGESTION_ITEMS, INGESTION_STAGE_SECONDS
 from app.db.repositories.product_repository import ProductRepository
 from app.db.repositories.vector_repository_native import VectorRepository
 from app.schemas.product import ProductForVector
@@ -64,13 +65,28 @@ class VectorService:
         return canonical_text
 
     def _add_metadata(self, product: ProductForVector) -> dict:
-        """Add metadata to the product"""
+        """
+        Add metadata to the product.
+
+        Besides the display fields, the metadata carries the fields
+        to_pinecone_filter matches on: lower-cased brand and category names,
+        the price range and the availability statuses across all offers.
+        """
         metadata = {
+            "product_id": product.id,
             "price": product.price,
             "availability": product.availability,
             "brand": product.brand_name,
             "category": product.category_name,
+            "brand_lower": product.brand_name.lower() if product.brand_name else None,
+            "category_lower": (
+                product.category_name.lower() if product.category_name else None
+            ),
+            "price_min": product.price_min,
+            "price_max": product.price_max,
+            "offer_availability": product.offer_availability,
             "product_group_id": product.product_group_id,
+            "organization_urn": product.organization_urn,
         }
         return metadata
 
@@ -111,9 +127,10 @@ class VectorService:
             logger.debug(
                 f"Fetching products with offset={offset}, batch_size={settings.PINECONE_BATCH_SIZE}, org_id={org_id}"
             )
-            products = self.product_repository.get_products_for_vector(
-                offset, settings.PINECONE_BATCH_SIZE, org_id
-            )
+            with INGESTION_STAGE_SECONDS.labels(stage="vector_fetch").time():
+                products = self.product_repository.get_products_for_vector(
+                    offset, settings.PINECONE_BATCH_SIZE, org_id
+                )
             if not products:
                 logger.info(
                     f"No more products to process. Exiting loop at offset={offset}."
@@ -125,7 +142,8 @@ class VectorService:
                 f"Processing batch {batch_num}: {len(products)} products (offset={offset})"
             )
             result.total_products += len(products)
-            records = self._prepare_records(products)
+            with INGESTION_STAGE_SECONDS.labels(stage="vector_prepare").time():
+                records = self._prepare_records(products)
             logger.debug(f"Prepared {len(records)} records for upsert.")
 
             # Try dense index
@@ -133,7 +151,8 @@ class VectorService:
                 logger.info(
                     f"Upserting {len(records)} records into dense index (batch {batch_num})"
                 )
-                self.vector_repository.upsert_products_into_dense_index(records, db=self.db_session)
+                with INGESTION_STAGE_SECONDS.labels(stage="vector_dense_upsert").time():
+                    self.vector_repository.upsert_products_into_dense_index(records, db=self.db_session)
                 logger.info(
                     f"Dense index: successfully processed {len(records)} records (batch {batch_num})"
                 )
@@ -148,7 +167,8 @@ class VectorService:
                 logger.info(
                     f"Upserting {len(records)} records into sparse index (batch {batch_num})"
                 )
-                self.vector_repository.upsert_products_into_sparse_index(records)
+                with INGESTION_STAGE_SECONDS.labels(stage="vector_sparse_upsert").time():
+                    self.vector_repository.upsert_products_into_sparse_index(records)
                 logger.info(
                     f"Sparse index: successfully processed {len(records)} records (batch {batch_num})"
                 )
@@ -160,6 +180,7 @@ class VectorService:
 
             if result.dense_index_success and result.sparse_index_success:
                 result.successful_records += len(records)
+                INGESTION_ITEMS.labels(kind="vectors").inc(len(records))
                 logger.info(
                     f"Batch {batch_num} processed successfully: {len(records)} records"
                 )
@@ -167,6 +188,7 @@ class VectorService:
                 logger.warning(
                     f"Batch {batch_num} had errors. See result.errors for details."
                 )
+                INGESTION_ITEMS.labels(kind="vectors_failed").inc(len(records))
 
             offset += settings.PINECONE_BATCH_SIZE
 
@@ -1,4 +1,4 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Union
 from app.services.search_service import SearchResult
 from datetime import datetime, timezone
 
@@ -7,38 +7,6 @@ import logging
 logger = logging.getLogger(__name__)
 
 
-def _extract_media_from_raw_data(raw_data: Dict[str, Any]) -> List[Dict[str, Any]]:
-    """Extract media information from raw JSON-LD data."""
-    if not raw_data:
-        return []
-    
-    media_items = []
-    
-    # Check for @cmp:media
-    if "@cmp:media" in raw_data:
-        media = raw_data["@cmp:media"]
-        if isinstance(media, list):
-            media_items.extend(media)
-        elif isinstance(media, dict):
-            media_items.append(media)
-    
-    # Check for image field
-    if "image" in raw_data:
-        images = raw_data["image"]
-        if isinstance(images, list):
-            for img in images:
-                if isinstance(img, dict):
-                    media_items.append(img)
-                elif isinstance(img, str):
-                    media_items.append({"@type": "ImageObject", "url": img})
-        elif isinstance(images, dict):
-            media_items.append(images)
-        elif isinstance(images, str):
-            media_items.append({"@type": "ImageObject", "url": images})
-    
-    return media_items
-
-
 def format_product_group_item(
     product_group: Any,
     brand: Optional[Any] = None,
@@ -81,9 +49,9 @@ def format_product_group_item(
             "name": brand.name
         }
     
-    # Add media/images if available in raw_data
-    if hasattr(product_group, 'raw_data') and product_group.raw_data:
-        media = _extract_media_from_raw_data(product_group.raw_data)
+    # Add media/images extracted at ingestion
+    if getattr(product_group, 'media', None):
+        media = product_group.media
         if media:
             # Separate images from other media
             images = []
@@ -254,8 +222,8 @@ def format_product_item(
     
     # Add media/images
     media_to_process = product_media or []
-    if not media_to_process and product and hasattr(product, 'raw_data') and product.raw_data:
-        media_to_process = _extract_media_from_raw_data(product.raw_data)
+    if not media_to_process and product is not None:
+        media_to_process = getattr(product, 'media', None) or []
     
     if media_to_process:
         images = []
@@ -321,53 +289,80 @@ def format_product_item(
     return item
 
 
-def format_product_search_response(products: List[SearchResult]) -> Dict[str, Any]:
+def format_search_result_item(result: Union[SearchResult, Dict[str, Any]]) -> Dict[str, Any]:
+    """Format one search result (SearchResult or dictionary) as a Product item"""
+    if hasattr(result, "id"):
+        # SearchResult object
+        item = format_product_item(
+            product=None,  # Search results don't have full product objects
+            product_urn=result.product_urn,
+            product_name=result.product_name,
+            product_brand=result.product_brand,
+            product_category=result.product_category,
+            product_offers=result.product_offers,
+            product_description=result.product_description,
+            product_url=result.product_url,
+            product_media=result.product_media,
+            score=result.score
+        )
+        return _add_variant_group(item, result.product_group_urn, result.variant_count)
+    # Dictionary
+    item = format_product_item(
+        product=None,
+        product_urn=result.get("product_urn"),
+        product_name=result.get("product_name"),
+        product_brand=result.get("product_brand"),
+        product_category=result.get("product_category"),
+        product_offers=result.get("product_offers"),
+        product_description=result.get("product_description"),
+        product_url=result.get("product_url"),
+        product_media=result.get("product_media"),
+        score=result.get("score")
+    )
+    return _add_variant_group(item, result.get("product_group_urn"), result.get("variant_count"))
+
+
+def _add_variant_group(
+    item: Dict[str, Any], product_group_urn: Optional[str], variant_count: Optional[int]
+) -> Dict[str, Any]:
+    """Add the product group of a collapsed search result and its matching variant count"""
+    if product_group_urn and "isVariantOf" not in item:
+        item["isVariantOf"] = {"@type": "ProductGroup", "@id": product_group_urn}
+    if variant_count is not None:
+        item["cmp:variantCount"] = variant_count
+    return item
+
+
+def format_product_search_response(
+    products: List[SearchResult],
+    degraded: bool = False,
+    next_cursor: Optional[str] = None,
+    offset: int = 0,
+) -> Dict[str, Any]:
     """
     Format product search results into standardized JSON response.
     Uses the modular format_product_item function.
+
+    ``degraded`` marks results produced with one of the hybrid retrievers
+    unavailable. ``offset`` is the rank of the first result when serving a
+    later page, and ``next_cursor`` is returned when more results follow.
     """
     item_list_elements = []
     has_cmp_namespace = False
     
     for i, result in enumerate(products):
-        logger.info(f"🔍 DEBUG: Processing result {i}: type={type(result)}")
-        
-        # Extract product data
-        if hasattr(result, "id"):
-            # SearchResult object
-            product_item = format_product_item(
-                product=None,  # Search results don't have full product objects
-                product_urn=result.product_urn,
-                product_name=result.product_name,
-                product_brand=result.product_brand,
-                product_category=result.product_category,
-                product_offers=result.product_offers,
-                product_description=result.product_description,
-                product_url=result.product_url,
-                product_media=result.product_media,
-                score=result.score
-            )
-        else:
-            # Dictionary
-            product_item = format_product_item(
-                product=None,
-                product_urn=result.get("product_urn"),
-                product_name=result.get("product_name"),
-                product_brand=result.get("product_brand"),
-                product_category=result.get("product_category"),
-                product_offers=result.get("product_offers"),
-                product_description=result.get("product_description"),
-                product_url=result.get("product_url"),
-                product_media=result.get("product_media"),
-                score=result.get("score")
-            )
+        product_item = format_search_result_item(result)
         
         # Check if we need the cmp namespace
-        if "@cmp:media" in product_item or "cmp:searchScore" in product_item:
+        if (
+            "@cmp:media" in product_item
+            or "cmp:searchScore" in product_item
+            or "cmp:variantCount" in product_item
+        ):
             has_cmp_namespace = True
         
         # Create list item
-        list_item = {"@type": "ListItem", "position": i + 1, "item": product_item}
+        list_item = {"@type": "ListItem", "position": offset + i + 1, "item": product_item}
         item_list_elements.append(list_item)
     
     # Set appropriate context
@@ -388,6 +383,8 @@ def format_product_search_response(products: List[SearchResult]) -> Dict[str, An
         "itemListElement": item_list_elements,
         "cmp:totalResults": len(products),
         "cmp:nodeVersion": "v1.0.0",
+        "cmp:degraded": degraded,
+        "cmp:nextCursor": next_cursor,
         "datePublished": datetime.now(timezone.utc).isoformat(),
     }
     
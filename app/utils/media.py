@@ -0,0 +1,46 @@
+from typing import Any, Dict, List, Optional
+
+
+def _as_media_object(item: Any) -> Optional[Dict[str, Any]]:
+    """Return a media dict, wrapping bare URLs as ImageObjects"""
+    if isinstance(item, dict):
+        return item
+    if isinstance(item, str) and item:
+        return {"@type": "ImageObject", "url": item}
+    return None
+
+
+def extract_media(raw_data: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Extract the media objects of a Product or ProductGroup JSON-LD document.
+
+    Collects ``@cmp:media`` followed by ``image``, each of which may be a single
+    value or a list. Bare image URLs are wrapped as ImageObjects, anything else
+    that is not an object is dropped and repeated URLs are kept only once.
+
+    This runs once at ingestion and the result is stored in the ``media``
+    column, so search never has to walk ``raw_data``.
+    """
+    if not raw_data:
+        return []
+
+    media_items = []
+    seen_urls = set()
+    for key in ("@cmp:media", "image"):
+        values = raw_data.get(key)
+        if values is None:
+            continue
+        if not isinstance(values, list):
+            values = [values]
+        for value in values:
+            media = _as_media_object(value)
+            if media is None:
+                continue
+            url = media.get("url")
+            if url:
+                if url in seen_urls:
+                    continue
+                seen_urls.add(url)
+            media_items.append(media)
+
+    return media_items
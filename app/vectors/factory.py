@@ -3,6 +3,7 @@ import logging
 
 from .base import VectorProvider
 from .providers.pinecone import PineconeProvider
+from .providers.local import LocalVectorProvider
 
 logger = logging.getLogger(__name__)
 
@@ -12,6 +13,7 @@ class VectorProviderFactory:
     
     _providers = {
         "pinecone": PineconeProvider,
+        "local": LocalVectorProvider,
     }
     
     @classmethod
@@ -1,3 +1,4 @@
 from .pinecone import PineconeProvider
+from .local import LocalVectorProvider
 
-__all__ = ["PineconeProvider"]
\ No newline at end of file
+__all__ = ["PineconeProvider", "LocalVectorProvider"]
\ No newline at end of file
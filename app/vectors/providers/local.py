@@ -0,0 +1,722 @@
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, List, Dict, Any, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: writers are only serialized within one process
+    fcntl = None
+
+import numpy as np
+
+from ..base import VectorProvider
+from ..types import VectorRecord, SearchResult, IndexConfig, SearchType
+
+logger = logging.getLogger(__name__)
+
+_SUPPORTED_METRICS = ("cosine", "dotproduct")
+
+
+def _contains_any(allowed: set, value: Any) -> bool:
+    """Pinecone semantics: a list-valued field matches if any of its elements does"""
+    if isinstance(value, list):
+        return any(item in allowed for item in value)
+    return value in allowed
+
+
+class _LocalIndex:
+    """
+    One index/namespace pair: a memory-mapped row-major matrix of vectors plus
+    a JSON manifest with the row -> id mapping, metadata and tombstones.
+
+    Rows are append-only. Upserting an existing id tombstones its old row and
+    appends a new one; deletes only tombstone. Each write appends one entry
+    to a JSON-lines log next to the manifest instead of rewriting it, and the
+    manifest is rewritten as a snapshot (starting a new log) only when the
+    log outgrows it or on compaction, which keeps the cost of persisting a
+    batch proportional to the batch. Compaction rewrites the matrix without
+    dead rows. Writers in any process are serialized by an exclusive lock on
+    a lock file next to the manifest and catch up with other processes'
+    writes before writing; readers pick up changes by watching the manifest
+    and replaying new log entries.
+    """
+
+    def __init__(
+        self,
+        base_path: str,
+        dtype: np.dtype,
+        metric: str = "cosine",
+        dimension: Optional[int] = None,
+        block_size: int = 65536,
+        compact_ratio: float = 0.2,
+        reload_interval: float = 1.0,
+    ):
+        self.base_path = base_path
+        self.vectors_path = f"{base_path}.vectors"
+        self.manifest_path = f"{base_path}.json"
+        self.lock_path = f"{base_path}.lock"
+        self.dtype = dtype
+        self.metric = metric
+        self.dimension = dimension
+        self.block_size = block_size
+        self.compact_ratio = compact_ratio
+        self.reload_interval = reload_interval
+
+        self.lock = threading.RLock()
+        self.vectors: Optional[np.memmap] = None
+        self.capacity = 0
+        self.count = 0
+        self.ids: List[str] = []
+        self.metadata: List[Dict[str, Any]] = []
+        self.id_to_row: Dict[str, int] = {}
+        self.alive = np.zeros(0, dtype=bool)
+        self.tombstones = 0
+        self.version = 0
+        self._columns: Dict[Tuple[str, bool], np.ndarray] = {}
+        self._columns_version = -1
+        self._manifest_mtime: Optional[int] = None
+        self._manifest_size = 0
+        self._log_generation = 0
+        self._log_offset = 0
+        self._last_check = 0.0
+        self._lock_file = None
+        self._write_depth = 0
+
+        self._load()
+
+    # Persistence
+
+    @property
+    def log_path(self) -> str:
+        return f"{self.base_path}.{self._log_generation}.log"
+
+    def _load(self):
+        """Load the index from disk if it exists: the manifest, then its log"""
+        if not os.path.exists(self.manifest_path):
+            return
+
+        with open(self.manifest_path) as f:
+            manifest = json.load(f)
+
+        self.dimension = manifest["dimension"]
+        self.dtype = np.dtype(manifest["dtype"])
+        self.metric = manifest["metric"]
+        self.capacity = manifest["capacity"]
+        self.count = manifest["count"]
+        self.ids = manifest["ids"]
+        self.metadata = manifest["metadata"]
+        self._log_generation = manifest.get("log_generation", 0)
+        self._log_offset = 0
+
+        self.alive = np.zeros(self.capacity, dtype=bool)
+        self.alive[: self.count] = True
+        deleted = manifest["deleted"]
+        if deleted:
+            self.alive[np.asarray(deleted, dtype=np.int64)] = False
+        self.tombstones = len(deleted)
+        self.id_to_row = {
+            id: row for row, id in enumerate(self.ids) if self.alive[row]
+        }
+        stat = os.stat(self.manifest_path)
+        self._manifest_mtime = stat.st_mtime_ns
+        self._manifest_size = stat.st_size
+
+        self._replay_log()
+        self._open_vectors()
+        self.version += 1
+        logger.info(
+            f"Loaded local vector index {self.manifest_path}: "
+            f"{self.count - self.tombstones} vectors, {self.tombstones} tombstones"
+        )
+
+    def _open_vectors(self):
+        self.vectors = (
+            np.memmap(
+                self.vectors_path,
+                dtype=self.dtype,
+                mode="r+",
+                shape=(self.capacity, self.dimension),
+            )
+            if self.capacity
+            else None
+        )
+
+    def _replay_log(self) -> int:
+        """Apply log entries written since the last replay; returns how many"""
+        try:
+            with open(self.log_path, "rb") as f:
+                f.seek(self._log_offset)
+                data = f.read()
+        except FileNotFoundError:
+            return 0
+
+        applied = 0
+        for line in data.splitlines(keepends=True):
+            # A line without its newline is still being written
+            if not line.endswith(b"\n"):
+                break
+            self._apply(json.loads(line))
+            self._log_offset += len(line)
+            applied += 1
+        return applied
+
+    def _apply(self, entry: Dict[str, Any]):
+        """Apply one log entry to the in-memory row mapping"""
+        if entry["op"] == "upsert":
+            if entry["capacity"] > len(self.alive):
+                alive = np.zeros(entry["capacity"], dtype=bool)
+                alive[: self.count] = self.alive[: self.count]
+                self.alive = alive
+            self.capacity = entry["capacity"]
+
+            start = entry["start"]
+            for offset, id in enumerate(entry["ids"]):
+                previous = self.id_to_row.get(id)
+                if previous is not None:
+                    self.alive[previous] = False
+                    self.tombstones += 1
+                self.id_to_row[id] = start + offset
+            self.ids.extend(entry["ids"])
+            self.metadata.extend(entry["metadata"])
+            self.alive[start : start + len(entry["ids"])] = True
+            self.count = start + len(entry["ids"])
+        else:
+            for id in entry["ids"]:
+                row = self.id_to_row.pop(id, None)
+                if row is not None:
+                    self.alive[row] = False
+                    self.tombstones += 1
+        self.version += 1
+
+    def _write(self, entry: Dict[str, Any]):
+        """Apply a write, then persist it as a log entry or a new snapshot"""
+        if self.vectors is not None:
+            self.vectors.flush()
+        self._apply(entry)
+        if self._maybe_compact():
+            return
+
+        if not os.path.exists(self.manifest_path) or self._log_offset > self._manifest_size:
+            self._persist()
+            return
+
+        line = (json.dumps(entry, default=str) + "\n").encode("utf-8")
+        with open(self.log_path, "ab") as f:
+            f.write(line)
+        self._log_offset += len(line)
+
+    def _persist(self):
+        """Flush vectors and atomically replace the manifest, starting a new log"""
+        if self.vectors is not None:
+            self.vectors.flush()
+
+        previous_log = self.log_path if os.path.exists(self.manifest_path) else None
+        manifest = {
+            "dimension": self.dimension,
+            "dtype": self.dtype.name,
+            "metric": self.metric,
+            "capacity": self.capacity,
+            "count": self.count,
+            "ids": self.ids,
+            "metadata": self.metadata,
+            "deleted": np.flatnonzero(~self.alive[: self.count]).tolist(),
+            "log_generation": self._log_generation + 1,
+        }
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f, default=str)
+        os.replace(tmp_path, self.manifest_path)
+
+        # The new manifest no longer reads the previous log, so it can go
+        self._log_generation += 1
+        self._log_offset = 0
+        if previous_log and os.path.exists(previous_log):
+            os.remove(previous_log)
+        stat = os.stat(self.manifest_path)
+        self._manifest_mtime = stat.st_mtime_ns
+        self._manifest_size = stat.st_size
+
+    def maybe_reload(self, force: bool = False):
+        """Pick up writes from other processes (checked at most once per reload_interval)"""
+        now = time.monotonic()
+        if not force and now - self._last_check < self.reload_interval:
+            return
+        self._last_check = now
+
+        try:
+            mtime = os.stat(self.manifest_path).st_mtime_ns
+        except FileNotFoundError:
+            return
+        if mtime != self._manifest_mtime:
+            with self.lock:
+                self._load()
+            return
+
+        try:
+            log_size = os.stat(self.log_path).st_size
+        except FileNotFoundError:
+            return
+        if log_size > self._log_offset:
+            with self.lock:
+                capacity = self.capacity
+                if self._replay_log() and self.capacity != capacity:
+                    self._open_vectors()
+
+    def _ensure_capacity(self, rows: int):
+        """Grow the memory-mapped matrix to hold at least ``rows`` rows"""
+        if rows <= self.capacity:
+            return
+
+        capacity = max(rows, self.capacity * 2, 1024)
+        tmp_path = f"{self.vectors_path}.tmp"
+        grown = np.memmap(tmp_path, dtype=self.dtype, mode="w+", shape=(capacity, self.dimension))
+        if self.vectors is not None and self.count:
+            grown[: self.count] = self.vectors[: self.count]
+        grown.flush()
+        del grown
+        os.replace(tmp_path, self.vectors_path)
+
+        self.vectors = np.memmap(
+            self.vectors_path, dtype=self.dtype, mode="r+", shape=(capacity, self.dimension)
+        )
+        alive = np.zeros(capacity, dtype=bool)
+        alive[: self.count] = self.alive[: self.count]
+        self.alive = alive
+        self.capacity = capacity
+
+    # Writes
+
+    @contextmanager
+    def _writing(self) -> Iterator[None]:
+        """
+        Hold the write lock across threads and processes, with this index
+        caught up on writes made by other processes.
+
+        Reentrant within a thread, since a write may compact.
+        """
+        with self.lock:
+            if self._write_depth == 0:
+                self._lock_file = open(self.lock_path, "a")
+                if fcntl is not None:
+                    fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+                self.maybe_reload(force=True)
+            self._write_depth += 1
+            try:
+                yield
+            finally:
+                self._write_depth -= 1
+                if self._write_depth == 0:
+                    # Closing the file releases the lock
+                    self._lock_file.close()
+                    self._lock_file = None
+
+    def upsert(self, records: List[VectorRecord]):
+        """Append vectors, tombstoning earlier rows with the same ids"""
+        if not records:
+            return
+
+        with self._writing():
+
+            matrix = np.asarray([r.values for r in records], dtype=np.float32)
+            if self.dimension is None:
+                self.dimension = matrix.shape[1]
+            if matrix.ndim != 2 or matrix.shape[1] != self.dimension:
+                raise ValueError(
+                    f"Expected vectors of dimension {self.dimension}, got {matrix.shape}"
+                )
+            if self.metric == "cosine":
+                norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+                matrix = matrix / np.where(norms == 0, 1, norms)
+
+            start = self.count
+            self._ensure_capacity(start + len(records))
+            self.vectors[start : start + len(records)] = matrix.astype(self.dtype)
+
+            self._write(
+                {
+                    "op": "upsert",
+                    "start": start,
+                    "capacity": self.capacity,
+                    "ids": [r.id for r in records],
+                    "metadata": [r.metadata or {} for r in records],
+                }
+            )
+
+    def delete(self, ids: List[str]) -> int:
+        """Tombstone vectors by id; returns the number deleted"""
+        with self._writing():
+
+            deleted = [id for id in dict.fromkeys(ids) if id in self.id_to_row]
+            if deleted:
+                self._write({"op": "delete", "ids": deleted})
+            return len(deleted)
+
+    def _maybe_compact(self) -> bool:
+        if self.count and self.tombstones / self.count > self.compact_ratio:
+            self.compact()
+            return True
+        return False
+
+    def compact(self):
+        """Rewrite the matrix and manifest without tombstoned rows"""
+        with self._writing():
+            if not self.tombstones:
+                return
+
+            rows = np.flatnonzero(self.alive[: self.count])
+            capacity = max(len(rows), 1024)
+            tmp_path = f"{self.vectors_path}.tmp"
+            compacted = np.memmap(
+                tmp_path, dtype=self.dtype, mode="w+", shape=(capacity, self.dimension)
+            )
+            for start in range(0, len(rows), self.block_size):
+                block = rows[start : start + self.block_size]
+                compacted[start : start + len(block)] = self.vectors[block]
+            compacted.flush()
+            del compacted
+            os.replace(tmp_path, self.vectors_path)
+
+            logger.info(
+                f"Compacted local vector index {self.vectors_path}: "
+                f"dropped {self.tombstones} tombstones, {len(rows)} vectors remain"
+            )
+            self.vectors = np.memmap(
+                self.vectors_path, dtype=self.dtype, mode="r+", shape=(capacity, self.dimension)
+            )
+            self.ids = [self.ids[row] for row in rows]
+            self.metadata = [self.metadata[row] for row in rows]
+            self.id_to_row = {id: row for row, id in enumerate(self.ids)}
+            self.capacity = capacity
+            self.count = len(rows)
+            self.alive = np.zeros(capacity, dtype=bool)
+            self.alive[: self.count] = True
+            self.tombstones = 0
+            self.version += 1
+            self._persist()
+
+    # Reads
+
+    def _column(self, key: str, numeric: bool) -> np.ndarray:
+        """Metadata field as a column over all rows, cached until the next write"""
+        if self._columns_version != self.version:
+            self._columns = {}
+            self._columns_version = self.version
+
+        column = self._columns.get((key, numeric))
+        if column is None:
+            values = [m.get(key) for m in self.metadata[: self.count]]
+            if numeric:
+                column = np.array(
+                    [v if isinstance(v, (int, float)) and not isinstance(v, bool) else np.nan for v in values],
+                    dtype=np.float64,
+                )
+            else:
+                column = np.empty(len(values), dtype=object)
+                column[:] = values
+            self._columns[(key, numeric)] = column
+        return column
+
+    def _condition_mask(self, key: str, condition: Any) -> np.ndarray:
+        if not isinstance(condition, dict):
+            condition = {"$eq": condition}
+
+        mask = np.ones(self.count, dtype=bool)
+        for op, value in condition.items():
+            if op in ("$gt", "$gte", "$lt", "$lte"):
+                column = self._column(key, numeric=True)
+                with np.errstate(invalid="ignore"):
+                    if op == "$gt":
+                        mask &= column > value
+                    elif op == "$gte":
+                        mask &= column >= value
+                    elif op == "$lt":
+                        mask &= column < value
+                    else:
+                        mask &= column <= value
+            elif op in ("$eq", "$ne", "$in", "$nin"):
+                column = self._column(key, numeric=False)
+                allowed = set(value) if op in ("$in", "$nin") else {value}
+                matches = np.fromiter(
+                    (_contains_any(allowed, v) for v in column), dtype=bool, count=len(column)
+                )
+                mask &= matches if op in ("$eq", "$in") else ~matches
+            else:
+                raise ValueError(f"Unsupported filter operator: {op}")
+        return mask
+
+    def filter_mask(self, filter: Dict[str, Any]) -> np.ndarray:
+        """Evaluate a Pinecone-style metadata filter over all rows"""
+        mask = np.ones(self.count, dtype=bool)
+        for key, condition in filter.items():
+            if key == "$and":
+                for sub in condition:
+                    mask &= self.filter_mask(sub)
+            elif key == "$or":
+                any_mask = np.zeros(self.count, dtype=bool)
+                for sub in condition:
+                    any_mask |= self.filter_mask(sub)
+                mask &= any_mask
+            else:
+                mask &= self._condition_mask(key, condition)
+        return mask
+
+    def search(
+        self,
+        vector: List[float],
+        top_k: int,
+        filter: Optional[Dict[str, Any]] = None,
+    ) -> List[SearchResult]:
+        """Exact top-k by inner product over live rows matching the filter"""
+        self.maybe_reload()
+
+        with self.lock:
+            if not self.count or top_k <= 0:
+                return []
+            vectors, count, ids, metadata = self.vectors, self.count, self.ids, self.metadata
+            mask = self.alive[:count].copy()
+            if filter:
+                mask &= self.filter_mask(filter)
+
+        query = np.asarray(vector, dtype=np.float32)
+        if query.shape != (self.dimension,):
+            raise ValueError(f"Expected query of dimension {self.dimension}, got {query.shape}")
+        if self.metric == "cosine":
+            norm = np.linalg.norm(query)
+            if norm:
+                query = query / norm
+
+        matching = int(mask.sum())
+        k = min(top_k, matching)
+        if not k:
+            return []
+
+        if matching < count // 10:
+            # Selective filter: score only the matching rows
+            rows = np.flatnonzero(mask)
+            scores = np.asarray(vectors[rows], dtype=np.float32) @ query
+        else:
+            rows, scores = self._blocked_top_k(vectors, count, mask, query, k)
+
+        if len(scores) > k:
+            top = np.argpartition(-scores, k - 1)[:k]
+            rows, scores = rows[top], scores[top]
+        order = np.argsort(-scores, kind="stable")
+
+        return [
+            SearchResult(id=ids[row], score=float(score), metadata=metadata[row])
+            for row, score in zip(rows[order], scores[order])
+        ]
+
+    def _blocked_top_k(
+        self,
+        vectors: np.ndarray,
+        count: int,
+        mask: np.ndarray,
+        query: np.ndarray,
+        k: int,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Top-k candidates over row blocks, so float16 rows are upcast a block at a time"""
+        best_rows = np.empty(0, dtype=np.int64)
+        best_scores = np.empty(0, dtype=np.float32)
+
+        for start in range(0, count, self.block_size):
+            stop = min(start + self.block_size, count)
+            block_mask = mask[start:stop]
+            if not block_mask.any():
+                continue
+
+            scores = np.asarray(vectors[start:stop], dtype=np.float32) @ query
+            scores[~block_mask] = -np.inf
+            if k < len(scores):
+                top = np.argpartition(-scores, k - 1)[:k]
+            else:
+                top = np.arange(len(scores))
+            top = top[block_mask[top]]
+
+            best_rows = np.concatenate([best_rows, top + start])
+            best_scores = np.concatenate([best_scores, scores[top]])
+            if len(best_scores) > k:
+                keep = np.argpartition(-best_scores, k - 1)[:k]
+                best_rows, best_scores = best_rows[keep], best_scores[keep]
+
+        return best_rows, best_scores
+
+    def __len__(self) -> int:
+        return self.count - self.tombstones
+
+
+class LocalVectorProvider(VectorProvider):
+    """
+    In-process vector provider backed by memory-mapped NumPy matrices.
+
+    Search is exact (brute force inner product), which is fast enough for
+    single-node catalogs of a few hundred thousand vectors and avoids a
+    network round trip per query. Sparse search is not supported.
+    """
+
+    def _setup(self):
+        """Resolve the data directory and index defaults."""
+        self.data_dir = self.config.get("data_dir", "data/vectors")
+        self.dtype = np.dtype(self.config.get("dtype", "float32"))
+        self.block_size = int(self.config.get("block_size", 65536))
+        self.compact_ratio = float(self.config.get("compact_ratio", 0.2))
+        self.reload_interval = float(self.config.get("reload_interval", 1.0))
+        self._index_configs: Dict[str, IndexConfig] = {}
+        self._indexes: Dict[Tuple[str, str], _LocalIndex] = {}
+        self._lock = threading.Lock()
+        os.makedirs(self.data_dir, exist_ok=True)
+
+    def _get_index(self, index_name: str, namespace: Optional[str] = None) -> _LocalIndex:
+        """Get or open the index for a name/namespace pair."""
+        key = (index_name, namespace or "__default__")
+        index = self._indexes.get(key)
+        if index is None:
+            with self._lock:
+                index = self._indexes.get(key)
+                if index is None:
+                    index_config = self._index_configs.get(index_name)
+                    index = _LocalIndex(
+                        os.path.join(self.data_dir, f"{key[0]}.{key[1]}"),
+                        dtype=self.dtype,
+                        metric=index_config.metric if index_config else "cosine",
+                        dimension=index_config.dimension if index_config else None,
+                        block_size=self.block_size,
+                        compact_ratio=self.compact_ratio,
+                        reload_interval=self.reload_interval,
+                    )
+                    self._indexes[key] = index
+        return index
+
+    def create_index(self, index_config: IndexConfig) -> bool:
+        """Register dimension and metric for an index; files are created on first upsert."""
+        if index_config.index_type != "dense":
+            logger.error("Local vector provider only supports dense indexes")
+            return False
+        if index_config.metric not in _SUPPORTED_METRICS:
+            logger.error(
+                f"Unsupported metric for local vector provider: {index_config.metric}. "
+                f"Supported: {_SUPPORTED_METRICS}"
+            )
+            return False
+
+        self._index_configs[index_config.name] = index_config
+        logger.info(f"Registered local vector index {index_config.name}")
+        return True
+
+    def upsert_vectors(
+        self,
+        index_name: str,
+        records: List[VectorRecord],
+        namespace: Optional[str] = None
+    ) -> bool:
+        """Append vectors to the local index."""
+        try:
+            self._get_index(index_name, namespace).upsert(records)
+            logger.info(f"Successfully upserted {len(records)} records to local index {index_name}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to upsert vectors: {e}")
+            return False
+
+    def batch_upsert_vectors(
+        self,
+        index_name: str,
+        records: List[VectorRecord],
+        batch_size: int = 100,
+        namespace: Optional[str] = None
+    ) -> bool:
+        """Upsert all records at once, as one log entry."""
+        return self.upsert_vectors(index_name, records, namespace)
+
+    def search(
+        self,
+        index_name: str,
+        query: str,
+        top_k: int = 10,
+        search_type: SearchType = SearchType.HYBRID,
+        filter: Optional[Dict[str, Any]] = None,
+        namespace: Optional[str] = None
+    ) -> List[SearchResult]:
+        """Embed the query with the shared embedding provider and search."""
+        if search_type == SearchType.SPARSE:
+            logger.warning("Sparse search not supported by the local vector provider")
+            return []
+
+        from app.embeddings import get_query_embedding
+        vector = get_query_embedding(query)
+        return self.search_by_vector(index_name, vector, top_k, filter, namespace)
+
+    def search_by_vector(
+        self,
+        index_name: str,
+        vector: List[float],
+        top_k: int = 10,
+        filter: Optional[Dict[str, Any]] = None,
+        namespace: Optional[str] = None
+    ) -> List[SearchResult]:
+        """Exact top-k search using a pre-computed vector."""
+        return self._get_index(index_name, namespace).search(vector, top_k, filter)
+
+    def delete_vectors(
+        self,
+        index_name: str,
+        ids: List[str],
+        namespace: Optional[str] = None
+    ) -> bool:
+        """Tombstone vectors by IDs."""
+        try:
+            deleted = self._get_index(index_name, namespace).delete(ids)
+            logger.info(f"Deleted {deleted} vectors from local index {index_name}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to delete vectors: {e}")
+            return False
+
+    def compact(self, index_name: str, namespace: Optional[str] = None):
+        """Drop tombstoned rows from an index."""
+        self._get_index(index_name, namespace).compact()
+
+    def delete_index(self, index_name: str) -> bool:
+        """Delete all namespaces of an index from disk."""
+        try:
+            with self._lock:
+                for key in [key for key in self._indexes if key[0] == index_name]:
+                    del self._indexes[key]
+            prefix = f"{index_name}."
+            for filename in os.listdir(self.data_dir):
+                if filename.startswith(prefix):
+                    os.remove(os.path.join(self.data_dir, filename))
+            self._index_configs.pop(index_name, None)
+            logger.info(f"Deleted local index {index_name}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to delete index: {e}")
+            return False
+
+    def health_check(self) -> bool:
+        """Check that the data directory is writable."""
+        return os.path.isdir(self.data_dir) and os.access(self.data_dir, os.W_OK)
+
+
+_local_provider: Optional[LocalVectorProvider] = None
+_local_provider_lock = threading.Lock()
+
+
+def get_local_vector_provider() -> LocalVectorProvider:
+    """Get the process-wide local vector provider configured from settings."""
+    global _local_provider
+    if _local_provider is None:
+        with _local_provider_lock:
+            if _local_provider is None:
+                from app.core.config import settings
+                _local_provider = LocalVectorProvider({
+                    "data_dir": settings.LOCAL_VECTOR_DIR,
+                    "dtype": settings.LOCAL_VECTOR_DTYPE,
+                    "block_size": settings.LOCAL_VECTOR_BLOCK_SIZE,
+                    "compact_ratio": settings.LOCAL_VECTOR_COMPACT_RATIO,
+                })
+    return _local_provider
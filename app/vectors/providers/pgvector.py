@@ -3,7 +3,6 @@ import logging
 from typing import List, Dict, Any, Optional
 import asyncpg
 from pgvector.asyncpg import register_vector
-import numpy as np
 
 from ..base import VectorProvider
 from ..types import VectorRecord, SearchResult, IndexConfig, SearchType
@@ -371,25 +370,9 @@ class PgVectorProvider(VectorProvider):
             return False
     
     async def _get_embedding(self, text: str, search_type: SearchType) -> List[float]:
-        """Get embedding for text using external service."""
-        # This would call your embedding service
-        # For now, returning a placeholder
-        # In production, this would make an HTTP request to your embedding service
-        
-        if self.embedding_service_url:
-            # Make request to embedding service
-            import aiohttp
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{self.embedding_service_url}/embed",
-                    json={"text": text, "type": search_type.value}
-                ) as resp:
-                    result = await resp.json()
-                    return result["embedding"]
-        else:
-            # Placeholder - in production, use actual embedding service
-            logger.warning("No embedding service configured, using random vector")
-            return np.random.rand(1024).tolist()
+        """Get embedding for text from the shared, pooled embedding provider."""
+        from app.embeddings import aget_query_embedding
+        return await aget_query_embedding(text)
     
     def __del__(self):
         """Cleanup connection pool on deletion."""
@@ -3,7 +3,7 @@
 Celery application configuration for the CMP discovery node.
 """
 from celery import Celery
-from celery.signals import worker_ready
+from celery.signals import worker_init, worker_ready
 import os
 import logging
 from app.core.config import settings
@@ -15,7 +15,7 @@ celery_app = Celery(
     "cmp_discovery",
     broker=settings.CELERY_BROKER_URL,
     backend=settings.CELERY_RESULT_BACKEND,
-    include=["app.worker.tasks.ingest", "app.worker.tasks.cleanup"],
+    include=["app.worker.tasks.ingest", "app.worker.tasks.cleanup", "app.worker.tasks.stats"],
 )
 
 # Configure Celery
@@ -39,6 +39,29 @@ from app.worker.schedulers import get_beat_schedule
 
 celery_app.conf.beat_schedule.update(get_beat_schedule())
 
+# Keep index statistics fresh between ingestions
+celery_app.conf.beat_schedule["refresh-index-stats"] = {
+    "task": "stats:refresh_index",
+    "schedule": settings.INDEX_STATS_REFRESH_INTERVAL,
+    "options": {"expires": settings.INDEX_STATS_REFRESH_INTERVAL},
+}
+
+
+@worker_init.connect
+def start_worker_metrics(sender=None, **kwargs):
+    """Serve ingestion metrics, which are recorded here and not in the API process."""
+    if not (settings.METRICS_ENABLED and settings.METRICS_WORKER_PORT):
+        return
+
+    if not os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        logger.warning(
+            "PROMETHEUS_MULTIPROC_DIR is not set, so metrics recorded in prefork "
+            "pool processes will not be served"
+        )
+    from app.core.metrics import start_metrics_server
+
+    start_metrics_server(settings.METRICS_WORKER_PORT)
+
 
 @worker_ready.connect
 def at_worker_ready(sender, **kwargs):
@@ -63,6 +63,14 @@ def ingest_all(self, ingestor_name, ingestor_config):
             results["vector"] = {"status": "error", "error": str(e)}
             return {"status": "error", "step": "vector", "results": results}
 
+        # Counts changed, refresh the index statistics snapshot. This already
+        # runs in the worker, so there is no need to queue a separate task.
+        try:
+            from app.services.index_stats_service import refresh_index_stats
+
+            refresh_index_stats()
+        except Exception as e:
+            logger.warning(f"Failed to refresh index stats for {ingestor_name}: {e}")
 
         return {"status": "success", "results": results}
     except Exception as e:
@@ -0,0 +1,27 @@
+# app/worker/tasks/stats.py
+"""
+Celery tasks for refreshing search index statistics.
+"""
+import logging
+from celery import shared_task
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(name="stats:refresh_index")
+def refresh_index_stats():
+    """
+    Recompute embedded product counts and publish the index stats snapshot.
+    """
+    try:
+        # Import here to avoid circular imports
+        from app.services.index_stats_service import refresh_index_stats as refresh
+
+        snapshot = refresh()
+        return {
+            "status": "success",
+            "embedded_products": snapshot["embedded_products"],
+        }
+    except Exception as e:
+        logger.exception(f"Error refreshing index stats: {str(e)}")
+        return {"status": "error", "message": str(e)}
@@ -0,0 +1,102 @@
+"""Add pre-extracted media to products and product groups
+
+Revision ID: 0b7e4d2a9c15
+Revises: f3c9a1d7b846
+Create Date: 2025-08-12 10:18:44.530972
+
+"""
+import json
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0b7e4d2a9c15'
+down_revision: Union[str, None] = 'f3c9a1d7b846'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+BACKFILL_BATCH_SIZE = 1000
+
+
+def _backfill_media(table: str) -> None:
+    """
+    Fill ``media`` of every row of ``table`` with app.utils.media.extract_media
+    of its raw_data, in batches keyed on id, so stored media follows exactly
+    the rules ingestion applies
+    """
+    from app.utils.media import extract_media
+
+    bind = op.get_bind()
+    select = sa.text(
+        f"SELECT id, raw_data FROM {table} WHERE id > CAST(:last_id AS uuid) "
+        "ORDER BY id LIMIT :limit"
+    )
+    update = sa.text(
+        f"UPDATE {table} SET media = CAST(:media AS jsonb) WHERE id = CAST(:id AS uuid)"
+    )
+    last_id = '00000000-0000-0000-0000-000000000000'
+    while True:
+        rows = bind.execute(
+            select, {'last_id': last_id, 'limit': BACKFILL_BATCH_SIZE}
+        ).fetchall()
+        if not rows:
+            break
+        bind.execute(
+            update,
+            [
+                {'id': str(row.id), 'media': json.dumps(extract_media(row.raw_data))}
+                for row in rows
+            ],
+        )
+        last_id = str(rows[-1].id)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'product_groups',
+        sa.Column(
+            'media',
+            postgresql.JSONB(astext_type=sa.Text()),
+            server_default='[]',
+            nullable=True,
+            comment='Media objects extracted from raw_data at ingestion',
+        ),
+    )
+    op.add_column(
+        'products',
+        sa.Column(
+            'media',
+            postgresql.JSONB(astext_type=sa.Text()),
+            server_default='[]',
+            nullable=True,
+            comment='Media objects extracted from raw_data at ingestion, falling back to the product group',
+        ),
+    )
+
+    # Backfill groups first so products without their own media can fall back
+    _backfill_media('product_groups')
+    _backfill_media('products')
+    op.execute("""
+        UPDATE products p SET media = pg.media
+        FROM product_groups pg
+        WHERE pg.id = p.product_group_id AND p.media = '[]'::jsonb
+    """)
+
+    # Search cards now copy products.media; bring existing cards in line
+    op.execute("""
+        UPDATE product_search_cards sc SET media = p.media
+        FROM products p
+        WHERE p.id = sc.product_id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('products', 'media')
+    op.drop_column('product_groups', 'media')
@@ -0,0 +1,58 @@
+"""Add delivery and warranty fields to search card offers
+
+Revision ID: 5c2e8f1a7d36
+Revises: 0b7e4d2a9c15
+Create Date: 2025-08-14 16:05:12.418306
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c2e8f1a7d36'
+down_revision: Union[str, None] = '0b7e4d2a9c15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Search cards now carry the offer fields used by re-ranking; bring
+    # existing cards in line
+    op.execute("""
+        UPDATE product_search_cards sc SET offers = coalesce(
+            (
+                SELECT jsonb_agg(
+                    jsonb_build_object(
+                        'price', o.price,
+                        'currency', o.price_currency,
+                        'availability', o.availability,
+                        'inventory_level', o.inventory_level,
+                        'est_delivery_max_days', o.est_delivery_max_days,
+                        'warranty_months', o.warranty_months,
+                        'seller_id', o.seller_id
+                    )
+                    ORDER BY o.price
+                )
+                FROM offers o
+                WHERE o.product_id = sc.product_id
+            ),
+            '[]'::jsonb
+        )
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("""
+        UPDATE product_search_cards sc SET offers = coalesce(
+            (
+                SELECT jsonb_agg(e - 'est_delivery_max_days' - 'warranty_months' ORDER BY ord)
+                FROM jsonb_array_elements(sc.offers) WITH ORDINALITY AS t(e, ord)
+            ),
+            '[]'::jsonb
+        )
+    """)
@@ -0,0 +1,40 @@
+"""Add embedded_at timestamp to products
+
+Revision ID: a9ddadfc73e3
+Revises: 5a968e0b071d
+Create Date: 2025-08-02 10:14:37.412907
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9ddadfc73e3'
+down_revision: Union[str, None] = '5a968e0b071d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'products',
+        sa.Column(
+            'embedded_at',
+            postgresql.TIMESTAMP(timezone=True),
+            nullable=True,
+            comment='When the embedding column was last written',
+        ),
+    )
+
+    # Backfill existing embeddings with their last update time
+    op.execute('UPDATE products SET embedded_at = updated_at WHERE embedding IS NOT NULL')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('products', 'embedded_at')
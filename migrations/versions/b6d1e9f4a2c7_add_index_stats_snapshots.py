@@ -0,0 +1,35 @@
+"""Add index_stats_snapshots
+
+Revision ID: b6d1e9f4a2c7
+Revises: 5c2e8f1a7d36
+Create Date: 2025-08-15 10:12:44.902517
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6d1e9f4a2c7'
+down_revision: Union[str, None] = '5c2e8f1a7d36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'index_stats_snapshots',
+        sa.Column('name', sa.String(), nullable=False, comment="Snapshot name, 'latest'"),
+        sa.Column('snapshot', postgresql.JSONB(astext_type=sa.Text()), nullable=False, comment='Statistics as served by /health'),
+        sa.Column('updated_at', postgresql.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('name'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('index_stats_snapshots')
@@ -0,0 +1,71 @@
+"""Add full-text search vector to products
+
+Revision ID: c41f7e2b9a10
+Revises: a9ddadfc73e3
+Create Date: 2025-08-05 16:02:11.538204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41f7e2b9a10'
+down_revision: Union[str, None] = 'a9ddadfc73e3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'products',
+        sa.Column(
+            'search_tsv',
+            postgresql.TSVECTOR(),
+            nullable=True,
+            comment='Weighted full-text vector over name, SKU, brand, category, variant attributes and description',
+        ),
+    )
+
+    # Brand and category names live in other tables, so the vector is
+    # maintained by a trigger rather than a generated column
+    op.execute("""
+        CREATE OR REPLACE FUNCTION products_search_tsv_update() RETURNS trigger AS $$
+        BEGIN
+            NEW.search_tsv :=
+                setweight(to_tsvector('english', coalesce(NEW.name, '')), 'A') ||
+                setweight(to_tsvector('simple', coalesce(NEW.sku, '')), 'A') ||
+                setweight(to_tsvector('simple', coalesce(
+                    (SELECT name FROM brands WHERE id = NEW.brand_id), '')), 'A') ||
+                setweight(to_tsvector('english', coalesce(
+                    (SELECT name FROM categories WHERE id = NEW.category_id), '')), 'B') ||
+                setweight(jsonb_to_tsvector('english',
+                    coalesce(NEW.variant_attributes, '{}'::jsonb), '["string", "numeric"]'), 'B') ||
+                setweight(to_tsvector('english', coalesce(NEW.description, '')), 'C');
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER products_search_tsv_trigger
+        BEFORE INSERT OR UPDATE OF name, sku, description, brand_id, category_id, variant_attributes
+        ON products
+        FOR EACH ROW EXECUTE FUNCTION products_search_tsv_update()
+    """)
+
+    # Backfill through the trigger
+    op.execute('UPDATE products SET name = name')
+
+    op.execute('CREATE INDEX idx_products_search_tsv ON products USING gin (search_tsv)')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute('DROP INDEX IF EXISTS idx_products_search_tsv')
+    op.execute('DROP TRIGGER IF EXISTS products_search_tsv_trigger ON products')
+    op.execute('DROP FUNCTION IF EXISTS products_search_tsv_update()')
+    op.drop_column('products', 'search_tsv')
@@ -0,0 +1,35 @@
+"""Document the quantized HNSW indexes on product embeddings
+
+Revision ID: d8b2f0c6e5a4
+Revises: c41f7e2b9a10
+Create Date: 2025-08-07 11:41:52.905316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8b2f0c6e5a4'
+down_revision: Union[str, None] = 'c41f7e2b9a10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The quantized HNSW indexes are expression indexes over the existing
+    # embedding column, only needed with PGVECTOR_QUANTIZATION=halfvec or
+    # binary. Which one is needed depends on configuration, not on the schema,
+    # and building one locks writes to products for as long as it takes, so
+    # they are built with CREATE INDEX CONCURRENTLY as described in
+    # docs/vector-storage-architecture.md. The API refuses to start when the
+    # configured mode's index is missing.
+    pass
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute('DROP INDEX IF EXISTS idx_products_embedding_binary')
+    op.execute('DROP INDEX IF EXISTS idx_products_embedding_halfvec')
@@ -0,0 +1,50 @@
+"""Add Matryoshka embedding prefix to products
+
+Revision ID: e17a4c9d3b52
+Revises: d8b2f0c6e5a4
+Create Date: 2025-08-08 15:22:04.117839
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from pgvector.sqlalchemy import Vector
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e17a4c9d3b52'
+down_revision: Union[str, None] = 'd8b2f0c6e5a4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Must match EMBEDDING_PREFIX_DIMENSION
+    op.add_column(
+        'products',
+        sa.Column(
+            'embedding_prefix',
+            Vector(256),
+            nullable=True,
+            comment='Renormalized Matryoshka prefix of the embedding for the first search stage',
+        ),
+    )
+
+    # Backfill from the full embeddings (subvector and l2_normalize need pgvector >= 0.7)
+    op.execute(
+        'UPDATE products SET embedding_prefix = l2_normalize(subvector(embedding, 1, 256)) '
+        'WHERE embedding IS NOT NULL'
+    )
+
+    op.execute(
+        'CREATE INDEX idx_products_embedding_prefix ON products '
+        'USING hnsw (embedding_prefix vector_cosine_ops)'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute('DROP INDEX IF EXISTS idx_products_embedding_prefix')
+    op.drop_column('products', 'embedding_prefix')
@@ -0,0 +1,68 @@
+"""Backfill search cards for products without a category
+
+Revision ID: e2a7c5b9d3f1
+Revises: b6d1e9f4a2c7
+Create Date: 2025-08-15 14:36:08.217940
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a7c5b9d3f1'
+down_revision: Union[str, None] = 'b6d1e9f4a2c7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Card refreshes used to inner-join brands and categories, so products
+    # whose category is null never got a card
+    op.execute("""
+        INSERT INTO product_search_cards (
+            urn, product_id, organization_id, name, description, url,
+            brand_name, category_name, media, offers, updated_at
+        )
+        SELECT
+            p.urn,
+            p.id,
+            p.organization_id,
+            p.name,
+            p.description,
+            p.url,
+            b.name,
+            c.name,
+            coalesce(p.media, '[]'::jsonb),
+            coalesce(po.offers, '[]'::jsonb),
+            now()
+        FROM products p
+        LEFT JOIN brands b ON b.id = p.brand_id
+        LEFT JOIN categories c ON c.id = p.category_id
+        LEFT JOIN LATERAL (
+            SELECT jsonb_agg(
+                jsonb_build_object(
+                    'price', o.price,
+                    'currency', o.price_currency,
+                    'availability', o.availability,
+                    'inventory_level', o.inventory_level,
+                    'est_delivery_max_days', o.est_delivery_max_days,
+                    'warranty_months', o.warranty_months,
+                    'seller_id', o.seller_id
+                )
+                ORDER BY o.price
+            ) AS offers
+            FROM offers o
+            WHERE o.product_id = p.id
+        ) po ON true
+        ON CONFLICT (urn) DO NOTHING
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Backfilled cards are valid under the previous revision; nothing to undo
+    pass
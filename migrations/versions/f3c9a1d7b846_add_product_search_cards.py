@@ -0,0 +1,110 @@
+"""Add product_search_cards projection
+
+Revision ID: f3c9a1d7b846
+Revises: e17a4c9d3b52
+Create Date: 2025-08-11 09:47:30.662091
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3c9a1d7b846'
+down_revision: Union[str, None] = 'e17a4c9d3b52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'product_search_cards',
+        sa.Column('urn', sa.String(), nullable=False, comment='Product URN'),
+        sa.Column('product_id', sa.UUID(), nullable=False),
+        sa.Column('organization_id', sa.UUID(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('url', sa.String(), nullable=True),
+        sa.Column('brand_name', sa.String(), nullable=True),
+        sa.Column('category_name', sa.String(), nullable=True),
+        sa.Column('media', postgresql.JSONB(astext_type=sa.Text()), server_default='[]', nullable=False, comment='JSON-LD media objects'),
+        sa.Column('offers', postgresql.JSONB(astext_type=sa.Text()), server_default='[]', nullable=False, comment='Offers, cheapest first'),
+        sa.Column('updated_at', postgresql.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['product_id'], ['products.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('urn'),
+        sa.UniqueConstraint('product_id'),
+    )
+    op.create_index(
+        op.f('ix_product_search_cards_organization_id'),
+        'product_search_cards',
+        ['organization_id'],
+        unique=False,
+    )
+
+    # Backfill from the current catalog
+    op.execute("""
+        INSERT INTO product_search_cards (
+            urn, product_id, organization_id, name, description, url,
+            brand_name, category_name, media, offers
+        )
+        SELECT
+            p.urn,
+            p.id,
+            p.organization_id,
+            p.name,
+            p.description,
+            p.url,
+            b.name,
+            c.name,
+            CASE jsonb_typeof(p.raw_data->'@cmp:media')
+                WHEN 'array' THEN p.raw_data->'@cmp:media'
+                WHEN 'object' THEN jsonb_build_array(p.raw_data->'@cmp:media')
+                ELSE '[]'::jsonb
+            END
+            ||
+            CASE jsonb_typeof(p.raw_data->'image')
+                WHEN 'array' THEN coalesce((
+                    SELECT jsonb_agg(
+                        CASE WHEN jsonb_typeof(i) = 'string'
+                            THEN jsonb_build_object('@type', 'ImageObject', 'url', i)
+                            ELSE i
+                        END
+                    )
+                    FROM jsonb_array_elements(p.raw_data->'image') i
+                    WHERE jsonb_typeof(i) IN ('string', 'object')
+                ), '[]'::jsonb)
+                WHEN 'object' THEN jsonb_build_array(p.raw_data->'image')
+                WHEN 'string' THEN jsonb_build_array(
+                    jsonb_build_object('@type', 'ImageObject', 'url', p.raw_data->'image')
+                )
+                ELSE '[]'::jsonb
+            END,
+            coalesce(po.offers, '[]'::jsonb)
+        FROM products p
+        JOIN brands b ON b.id = p.brand_id
+        JOIN categories c ON c.id = p.category_id
+        LEFT JOIN LATERAL (
+            SELECT jsonb_agg(
+                jsonb_build_object(
+                    'price', o.price,
+                    'currency', o.price_currency,
+                    'availability', o.availability,
+                    'inventory_level', o.inventory_level,
+                    'seller_id', o.seller_id
+                )
+                ORDER BY o.price
+            ) AS offers
+            FROM offers o
+            WHERE o.product_id = p.id
+        ) po ON true
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_product_search_cards_organization_id'), table_name='product_search_cards')
+    op.drop_table('product_search_cards')
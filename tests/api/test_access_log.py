@@ -0,0 +1,66 @@
+# tests/api/test_access_log.py
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.testclient import TestClient
+
+from app.api.access_log import AccessLogMiddleware, logger, should_log_request
+
+
+def test_should_log_request_samples_only_fast_successes():
+    """Test that errors and slow requests bypass sampling."""
+    assert should_log_request(500, 5.0, 0.0, 1000)
+    assert should_log_request(200, 1500.0, 0.0, 1000)
+    assert not should_log_request(200, 5.0, 0.0, 1000)
+    assert not should_log_request(404, 5.0, 0.1, 1000, rand=lambda: 0.5)
+    assert should_log_request(200, 5.0, 0.1, 1000, rand=lambda: 0.05)
+
+
+def test_middleware_writes_one_line_per_logged_request(monkeypatch):
+    """Test that sampled-out requests log nothing and errors log one line."""
+    app = FastAPI()
+
+    @app.get("/ok")
+    async def ok():
+        return {"ok": True}
+
+    @app.get("/boom")
+    async def boom():
+        raise HTTPException(status_code=503, detail="down")
+
+    app.add_middleware(AccessLogMiddleware, sample_rate=0.0, slow_ms=10_000)
+    lines = []
+    monkeypatch.setattr(logger, "info", lambda *args: lines.append(args))
+    monkeypatch.setattr(logger, "error", lambda *args: lines.append(args))
+
+    client = TestClient(app)
+    client.get("/ok")
+    client.get("/boom", headers={"X-Request-ID": "req-1"})
+
+    assert len(lines) == 1
+    fmt, method, path, status, _, request_id, _ = lines[0]
+    assert (method, path, status, request_id) == ("GET", "/boom", 503, "req-1")
+    assert fmt.startswith("method=%s path=%s status=%d")
+
+
+def test_request_id_is_generated_once_and_echoed(monkeypatch):
+    """Test that the logged request ID is the one in request state and the response."""
+    app = FastAPI()
+
+    @app.get("/ok")
+    async def ok(request: Request):
+        return {"request_id": request.state.request_id}
+
+    app.add_middleware(AccessLogMiddleware, sample_rate=1.0, slow_ms=10_000)
+    lines = []
+    monkeypatch.setattr(logger, "info", lambda *args: lines.append(args))
+
+    client = TestClient(app)
+    generated = client.get("/ok")
+    forwarded = client.get("/ok", headers={"X-Request-ID": "req-2"})
+
+    request_id = generated.headers["X-Request-ID"]
+    assert request_id
+    assert generated.json() == {"request_id": request_id}
+    assert lines[0][5] == request_id
+    assert forwarded.headers["X-Request-ID"] == "req-2"
+    assert forwarded.json() == {"request_id": "req-2"}
+    assert lines[1][5] == "req-2"
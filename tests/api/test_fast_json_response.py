@@ -0,0 +1,34 @@
+# tests/api/test_fast_json_response.py
+import json
+
+from app.api.responses import FastJSONResponse, JSONFragment, dumps_json, model_payload
+from app.schemas.product import ProductSearchResponse
+
+
+def test_dumps_json_splices_fragments():
+    """Test that pre-serialized fragments are embedded verbatim."""
+    item = JSONFragment(b'{"@type":"Product","name":"Caf\xc3\xa9"}')
+    body = dumps_json({"itemListElement": [{"position": 1, "item": item}], "n": 1.5})
+
+    assert json.loads(body) == {
+        "itemListElement": [{"position": 1, "item": {"@type": "Product", "name": "Café"}}],
+        "n": 1.5,
+    }
+
+
+def test_model_payload_matches_validated_response():
+    """Test that the fast path produces the same document as response_model validation."""
+    data = {
+        "@context": {"schema": "https://schema.org", "cmp": "https://schema.commercemesh.ai/ns#"},
+        "@type": "ItemList",
+        "itemListElement": [{"@type": "ListItem", "position": 1, "item": {"name": "Shoe"}}],
+        "cmp:totalResults": 1,
+        "cmp:nodeVersion": "v1.0.0",
+        "cmp:nextCursor": None,
+        "datePublished": "2025-08-12T10:00:00+00:00",
+    }
+
+    expected = ProductSearchResponse(**data).model_dump(mode="json", by_alias=True)
+    response = FastJSONResponse(model_payload(ProductSearchResponse, data))
+
+    assert json.loads(response.body) == expected
@@ -0,0 +1,35 @@
+# tests/api/test_health.py
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+
+from app.api.web_app import app
+from app.services import index_stats_service
+
+
+def test_health_reports_the_stored_index_snapshot(monkeypatch):
+    """Test that /health returns the latest snapshot without querying the catalog."""
+    snapshot = {
+        "embedded_products": 7,
+        "organizations": {},
+        "refreshed_at": datetime.now(timezone.utc).isoformat(),
+    }
+    monkeypatch.setattr(index_stats_service, "get_redis_client", lambda: None)
+
+    class SnapshotRowSession:
+        def execute(self, statement, params=None):
+            # Only the primary key lookup of the stored snapshot is allowed
+            assert statement is index_stats_service._LOAD_SQL
+            return SimpleNamespace(scalar=lambda: snapshot)
+
+        def close(self):
+            pass
+
+    monkeypatch.setattr(index_stats_service, "SessionLocal", SnapshotRowSession)
+
+    response = TestClient(app).get("/health")
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "healthy"
+    assert response.json()["index"] == dict(snapshot, stale=False)
@@ -0,0 +1,107 @@
+# tests/services/test_batch_search.py
+import asyncio
+
+from prometheus_client import REGISTRY
+
+from app.core.config import settings
+from app.core.metrics import metrics_endpoint
+from app.embeddings import query as query_embeddings
+from app.services.search.base import BaseSearchService, SearchResult
+from app.services.search.batch import search_batch
+from app.services.search.pagination import BatchQuery, search_page, search_pages
+
+
+class BatchSearchService(BaseSearchService):
+    """Search service ranking each query's own products and counting enrichment calls."""
+
+    def __init__(self):
+        super().__init__(db_session=None)
+        self.enriched = []
+
+    def search_products(self, query, top_k=20, alpha=0.7, include_metadata=True, filters=None):
+        return self.enrich_results(self.retrieve_candidates(query, top_k, alpha, filters))
+
+    def retrieve_candidates(self, query, top_k=100, alpha=0.7, filters=None):
+        # "shared" is ranked for every query, with a different score each time
+        ids = ["urn:p:shared"] + [f"urn:p:{query}:{i}" for i in range(14)]
+        return [
+            SearchResult(id=urn, score=len(query) - i / 100, metadata={})
+            for i, urn in enumerate(ids)
+        ]
+
+    def enrich_results(self, candidates):
+        self.enriched.append([c.id for c in candidates])
+        return [
+            SearchResult(id=c.id, score=0.0, metadata={}, product_name=c.id.upper())
+            for c in candidates
+        ]
+
+
+def test_batch_enriches_the_union_of_results_once():
+    """Test that shared products are loaded once and keep per-query scores."""
+    service = BatchSearchService()
+    pages = asyncio.run(
+        search_pages(service, [BatchQuery("shoes", limit=3), BatchQuery("socks", limit=2)])
+    )
+
+    assert len(service.enriched) == 1
+    assert service.enriched[0].count("urn:p:shared") == 1
+    assert [r.id for r in pages[1].results] == ["urn:p:shared", "urn:p:socks:0"]
+    assert pages[0].results[0].product_name == "URN:P:SHARED"
+    assert pages[0].results[0].score == 5.0
+    assert pages[1].results[1].score == 5.0 - 0.01
+
+
+def test_batch_cursor_continues_through_single_search():
+    """Test that a batch page's cursor pages on with search_page."""
+    service = BatchSearchService()
+
+    async def run():
+        first = (await search_pages(service, [BatchQuery("boots", limit=10)]))[0]
+        return first, await search_page(service, "boots", 10, cursor=first.next_cursor)
+
+    first, second = asyncio.run(run())
+
+    assert first.total_candidates == 15
+    assert second.offset == 10
+    assert [r.id for r in second.results][0] == "urn:p:boots:9"
+
+
+def test_query_embeddings_use_one_provider_call(monkeypatch):
+    """Test that cache misses are deduplicated and embedded in one request."""
+    calls = []
+
+    class Provider:
+        async def aembed(self, texts):
+            calls.append(list(texts))
+            return [[float(len(text))] for text in texts]
+
+    monkeypatch.setattr(query_embeddings, "get_embedding_cache", lambda: None)
+    monkeypatch.setattr(query_embeddings, "get_embedding_provider", lambda: Provider())
+
+    embeddings = asyncio.run(query_embeddings.aget_query_embeddings(["tv", "sofa", "tv"]))
+
+    assert embeddings == [[2.0], [4.0], [2.0]]
+    assert calls == [["tv", "sofa"]]
+
+
+def test_batch_formatting_is_timed_once():
+    """Test that a batch records a single formatting stage for all its queries."""
+    labels = {"stage": "formatting", "backend": settings.VECTOR_PROVIDER, "endpoint": "batch"}
+
+    def formatted():
+        return REGISTRY.get_sample_value("cmp_search_stage_seconds_count", labels) or 0
+
+    async def run():
+        with metrics_endpoint("batch"):
+            return await search_batch(
+                [BatchQuery("shoes", limit=3), BatchQuery("socks", limit=2)],
+                BatchSearchService,
+            )
+
+    before = formatted()
+    responses, degraded = asyncio.run(run())
+
+    assert len(responses) == 2
+    assert degraded == []
+    assert formatted() == before + 1
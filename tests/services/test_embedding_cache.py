@@ -0,0 +1,100 @@
+# tests/services/test_embedding_cache.py
+import asyncio
+import threading
+import time
+
+from app.core.cache import LRUCache
+from app.embeddings import query as query_module
+from app.embeddings.cache import EmbeddingCache
+
+
+def test_lru_cache_evicts_least_recently_used():
+    """Test that the LRU tier evicts the oldest untouched entry."""
+    cache = LRUCache(max_size=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+
+    # Touch "a" so that "b" becomes the eviction candidate
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_lru_cache_expires_entries():
+    """Test that entries are dropped once their TTL has elapsed."""
+    cache = LRUCache(max_size=10, ttl_seconds=0.01)
+    cache.set("a", 1)
+    time.sleep(0.02)
+
+    assert cache.get("a") is None
+    assert cache.stats()["misses"] == 1
+
+
+def test_embedding_cache_normalizes_query_text():
+    """Test that queries differing only in case and spacing share an entry."""
+    cache = EmbeddingCache(max_size=10, ttl_seconds=60)
+    cache.set("Wireless  Headphones", "model", 3, [0.1, 0.2, 0.3])
+
+    assert cache.get(" wireless headphones ", "model", 3) == [0.1, 0.2, 0.3]
+    assert cache.get("wireless headphones", "other-model", 3) is None
+    assert cache.get("wireless headphones", "model", 1536) is None
+
+    stats = cache.stats()
+    assert stats["local_hits"] == 1
+    assert stats["misses"] == 2
+
+
+def test_embedding_cache_get_or_compute_calls_once():
+    """Test that the compute function only runs on a miss."""
+    cache = EmbeddingCache(max_size=10, ttl_seconds=60)
+    calls = []
+
+    def compute(text):
+        calls.append(text)
+        return [1.0, 0.0]
+
+    assert cache.get_or_compute("books", compute, "model", 2) == [1.0, 0.0]
+    assert cache.get_or_compute("Books", compute, "model", 2) == [1.0, 0.0]
+    assert calls == ["books"]
+
+
+def test_async_query_embedding_cache_runs_off_the_event_loop(monkeypatch):
+    """Test that async embedding cache lookups and stores, which may call Redis, run in the search pool."""
+    threads = []
+
+    class RecordingCache(EmbeddingCache):
+        def get(self, text, model, dimension):
+            threads.append(threading.current_thread().name)
+            return super().get(text, model, dimension)
+
+        def set(self, text, model, dimension, embedding):
+            threads.append(threading.current_thread().name)
+            return super().set(text, model, dimension, embedding)
+
+    class FakeProvider:
+        async def aembed_query(self, text):
+            return [1.0, 0.0]
+
+        async def aembed(self, texts):
+            return [[float(len(text)), 0.0] for text in texts]
+
+    cache = RecordingCache(max_size=10, ttl_seconds=60)
+    monkeypatch.setattr(query_module, "get_embedding_cache", lambda: cache)
+    monkeypatch.setattr(query_module, "get_embedding_provider", lambda: FakeProvider())
+
+    async def run():
+        first = await query_module.aget_query_embedding("books")
+        again = await query_module.aget_query_embedding("books")
+        batch = await query_module.aget_query_embeddings(["books", "shoes", "shoes"])
+        return first, again, batch
+
+    first, again, batch = asyncio.run(run())
+
+    assert first == again == [1.0, 0.0]
+    assert batch == [[1.0, 0.0], [5.0, 0.0], [5.0, 0.0]]
+    # get + set, get, then get per distinct query + set for the miss
+    assert len(threads) == 6
+    assert all(name.startswith("search") for name in threads)
@@ -0,0 +1,79 @@
+# tests/services/test_embedding_provider.py
+import asyncio
+
+import pytest
+
+from app.core.config import settings
+from app.embeddings.base import EmbeddingProvider
+from app.embeddings.factory import EmbeddingProviderFactory, _provider_from_settings
+from app.embeddings.providers.local import LocalEmbeddingProvider
+
+
+class FlakyProvider(EmbeddingProvider):
+    """Provider that fails a fixed number of times before succeeding."""
+
+    def _setup(self):
+        self.failures = self.config.get("failures", 0)
+        self.calls = []
+
+    def _backoff_delay(self, attempt: int) -> float:
+        return 0
+
+    def _embed_batch(self, texts):
+        self.calls.append(list(texts))
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("transient")
+        return [[float(len(text))] for text in texts]
+
+    async def _aembed_batch(self, texts):
+        return self._embed_batch(texts)
+
+
+def test_embed_splits_into_batches_and_keeps_order():
+    """Test that inputs are batched and results come back in input order."""
+    provider = FlakyProvider({"batch_size": 2})
+    embeddings = provider.embed(["a", "bb", "ccc"])
+
+    assert provider.calls == [["a", "bb"], ["ccc"]]
+    assert embeddings == [[1.0], [2.0], [3.0]]
+    assert asyncio.run(provider.aembed(["a", "bb", "ccc"])) == embeddings
+
+
+def test_embed_retries_transient_failures():
+    """Test that failed batches are retried up to max_retries."""
+    provider = FlakyProvider({"failures": 2, "max_retries": 3})
+    assert provider.embed_query("abcd") == [4.0]
+
+    provider = FlakyProvider({"failures": 3, "max_retries": 3})
+    with pytest.raises(RuntimeError):
+        provider.embed_query("abcd")
+
+
+def test_local_provider_is_deterministic_and_normalized():
+    """Test that the local provider returns stable unit vectors."""
+    provider = EmbeddingProviderFactory.create("local", {"dimension": 64})
+    first, second, other = provider.embed(["red shoes", "red shoes", "blue hat"])
+
+    assert len(first) == 64
+    assert first == second
+    assert first != other
+    assert sum(v * v for v in first) == pytest.approx(1.0, rel=1e-5)
+
+
+def test_factory_rejects_unknown_provider():
+    """Test that unknown provider names raise ValueError."""
+    with pytest.raises(ValueError):
+        EmbeddingProviderFactory.create("nope", {})
+
+
+def test_missing_api_key_is_a_configuration_error(monkeypatch):
+    """Test that the local provider is only used when selected explicitly."""
+    monkeypatch.setattr(settings, "PGVECTOR_EMBEDDING_SERVICE_URL", "")
+    monkeypatch.setattr(settings, "EMBEDDING_MODEL_PROVIDER", "openai")
+    monkeypatch.setattr(settings, "EMBEDDING_API_KEY", "")
+    with pytest.raises(ValueError):
+        _provider_from_settings()
+
+    monkeypatch.setattr(settings, "EMBEDDING_MODEL_PROVIDER", "local")
+    assert isinstance(_provider_from_settings(), LocalEmbeddingProvider)
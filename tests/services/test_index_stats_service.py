@@ -0,0 +1,131 @@
+# tests/services/test_index_stats_service.py
+import json
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from app.core.config import settings
+from app.services import index_stats_service
+from app.services.index_stats_service import IndexStatsService, get_index_stats
+
+
+class FakeSession:
+    """Session returning fixed per-organization aggregate rows."""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def execute(self, statement):
+        return SimpleNamespace(fetchall=lambda: self.rows)
+
+
+class FakeRedis:
+    def __init__(self):
+        self.values = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def set(self, key, value):
+        self.values[key] = value
+
+
+class SnapshotTable:
+    """The snapshot row, shared by the sessions of every simulated process."""
+
+    def __init__(self):
+        self.snapshot = None
+
+    def session(self):
+        return SnapshotSession(self)
+
+
+class SnapshotSession:
+    """Session that only stores and loads the snapshot row."""
+
+    def __init__(self, table):
+        self.table = table
+
+    def execute(self, statement, params=None):
+        if statement is index_stats_service._STORE_SQL:
+            self.table.snapshot = json.loads(params["snapshot"])
+            return None
+        if statement is index_stats_service._LOAD_SQL:
+            return SimpleNamespace(scalar=lambda: self.table.snapshot)
+        raise AssertionError("stats must only be refreshed by the worker")
+
+    def commit(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def test_compute_totals_organizations():
+    """Test that the snapshot sums organizations and keeps the latest embedding time."""
+    earlier = datetime(2025, 8, 1, tzinfo=timezone.utc)
+    later = datetime(2025, 8, 2, tzinfo=timezone.utc)
+    rows = [
+        SimpleNamespace(org_urn="urn:cmp:org:a", embedded_products=3, last_embedded_at=later),
+        SimpleNamespace(org_urn="urn:cmp:org:b", embedded_products=2, last_embedded_at=earlier),
+    ]
+
+    snapshot = IndexStatsService(FakeSession(rows)).compute()
+
+    assert snapshot["embedded_products"] == 5
+    assert snapshot["last_embedded_at"] == later.isoformat()
+    assert snapshot["organizations"]["urn:cmp:org:b"]["embedded_products"] == 2
+
+
+def test_api_reads_the_snapshot_the_worker_stored(monkeypatch):
+    """Test that without Redis the snapshot reaches other processes through the database."""
+    table = SnapshotTable()
+    monkeypatch.setattr(index_stats_service, "get_redis_client", lambda: None)
+    monkeypatch.setattr(index_stats_service, "SessionLocal", table.session)
+    monkeypatch.setattr(settings, "INDEX_STATS_MAX_AGE", 900)
+    assert get_index_stats() is None
+
+    refreshed_at = datetime.now(timezone.utc) - timedelta(hours=1)
+    # Stored from the worker's own session, read through a new one
+    index_stats_service._store_snapshot(
+        table.session(),
+        {"embedded_products": 5, "organizations": {}, "refreshed_at": refreshed_at.isoformat()},
+    )
+
+    snapshot = get_index_stats()
+    assert snapshot["embedded_products"] == 5
+    assert snapshot["stale"] is True
+    assert "stale" not in table.snapshot
+
+
+def test_reads_prefer_the_redis_copy(monkeypatch):
+    """Test that with Redis configured reads are served without the database."""
+    redis = FakeRedis()
+    table = SnapshotTable()
+    monkeypatch.setattr(index_stats_service, "get_redis_client", lambda: redis)
+    refreshed_at = datetime.now(timezone.utc).isoformat()
+    index_stats_service._store_snapshot(
+        table.session(), {"embedded_products": 2, "organizations": {}, "refreshed_at": refreshed_at}
+    )
+
+    def no_database():
+        raise AssertionError("the Redis copy must be served")
+
+    monkeypatch.setattr(index_stats_service, "SessionLocal", no_database)
+
+    assert get_index_stats()["embedded_products"] == 2
+    assert json.loads(redis.values[index_stats_service.INDEX_STATS_REDIS_KEY]) == table.snapshot
+
+
+def test_snapshot_round_trips_through_the_database(monkeypatch, db_session):
+    """Test the stored snapshot row against a real database."""
+    monkeypatch.setattr(index_stats_service, "get_redis_client", lambda: None)
+    monkeypatch.setattr(index_stats_service, "SessionLocal", lambda: db_session)
+    snapshot = {
+        "embedded_products": 3,
+        "organizations": {"urn:cmp:org:a": {"embedded_products": 3, "last_embedded_at": None}},
+        "refreshed_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+    index_stats_service._store_snapshot(db_session, snapshot)
+
+    assert get_index_stats() == dict(snapshot, stale=False)
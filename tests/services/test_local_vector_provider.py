@@ -0,0 +1,144 @@
+# tests/services/test_local_vector_provider.py
+import os
+import subprocess
+import sys
+import zlib
+
+import numpy as np
+
+from app.vectors.providers.local import LocalVectorProvider
+from app.vectors.types import VectorRecord
+
+
+def _records(n, dim=8, offset=0, seed=0):
+    rng = np.random.default_rng(seed)
+    return [
+        VectorRecord(
+            id=f"urn:p:{offset + i}",
+            values=rng.normal(size=dim).tolist(),
+            metadata={"price": float(offset + i), "brand": "Acme" if i % 2 else "Other"},
+        )
+        for i in range(n)
+    ]
+
+
+def test_search_matches_brute_force_and_filters(tmp_path):
+    """Test that blocked top-k equals a full sort and metadata filters apply."""
+    provider = LocalVectorProvider({"data_dir": str(tmp_path), "block_size": 7})
+    records = _records(50)
+    provider.upsert_vectors("products", records)
+
+    query = records[3].values
+    results = provider.search_by_vector("products", query, top_k=5)
+
+    matrix = np.asarray([r.values for r in records])
+    matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+    expected = np.argsort(-(matrix @ (np.asarray(query) / np.linalg.norm(query))))[:5]
+    assert [r.id for r in results] == [f"urn:p:{i}" for i in expected]
+    assert results[0].id == "urn:p:3"
+
+    filtered = provider.search_by_vector(
+        "products", query, top_k=50,
+        filter={"brand": {"$eq": "Acme"}, "price": {"$gte": 10, "$lte": 20}},
+    )
+    assert {r.id for r in filtered} == {f"urn:p:{i}" for i in range(11, 21, 2)}
+
+
+def test_upsert_delete_compact_and_reload(tmp_path):
+    """Test tombstones, compaction and that another instance sees the same index."""
+    provider = LocalVectorProvider({"data_dir": str(tmp_path), "compact_ratio": 0.5})
+    records = _records(10)
+    provider.upsert_vectors("products", records)
+
+    # Re-upserting an id replaces it, deleting one hides it
+    provider.upsert_vectors("products", _records(1, seed=1))
+    provider.delete_vectors("products", ["urn:p:1"])
+    index = provider._get_index("products")
+    assert len(index) == 9
+    assert index.tombstones == 2
+
+    ids = {r.id for r in provider.search_by_vector("products", records[1].values, top_k=20)}
+    assert "urn:p:1" not in ids and len(ids) == 9
+
+    provider.compact("products")
+    assert index.tombstones == 0 and index.count == 9
+
+    reopened = LocalVectorProvider({"data_dir": str(tmp_path)})
+    results = reopened.search_by_vector("products", records[5].values, top_k=1)
+    assert results[0].id == "urn:p:5"
+    assert results[0].metadata["price"] == 5.0
+
+
+def test_writes_are_logged_and_replayed(tmp_path):
+    """Test that batches append to the log and other instances replay it."""
+    writer = LocalVectorProvider({"data_dir": str(tmp_path)})
+    reader = LocalVectorProvider({"data_dir": str(tmp_path), "reload_interval": 0})
+    writer.upsert_vectors("products", _records(200))
+    index = writer._get_index("products")
+    manifest_mtime = index._manifest_mtime
+    assert reader.search_by_vector("products", _records(1)[0].values, top_k=1)[0].id == "urn:p:0"
+
+    writer.upsert_vectors("products", _records(2, offset=200, seed=2))
+    writer.delete_vectors("products", ["urn:p:0"])
+
+    # The manifest is only rewritten once the log outgrows it
+    assert index._manifest_mtime == manifest_mtime
+    assert index._log_offset > 0
+    new_record = _records(2, offset=200, seed=2)[1]
+    results = reader.search_by_vector("products", new_record.values, top_k=1)
+    assert results[0].id == "urn:p:201"
+    assert len(reader._get_index("products")) == 201
+
+    reopened = LocalVectorProvider({"data_dir": str(tmp_path)})
+    ids = {r.id for r in reopened.search_by_vector("products", new_record.values, top_k=300)}
+    assert len(ids) == 201 and "urn:p:0" not in ids
+
+
+def test_writers_catch_up_with_each_other(tmp_path):
+    """Test that a writer appends after rows another instance wrote meanwhile."""
+    first = LocalVectorProvider({"data_dir": str(tmp_path)})
+    second = LocalVectorProvider({"data_dir": str(tmp_path)})
+    first.upsert_vectors("products", _records(3))
+    second.upsert_vectors("products", _records(3, offset=3, seed=1))
+    first.upsert_vectors("products", _records(3, offset=6, seed=2))
+    second.delete_vectors("products", ["urn:p:7"])
+
+    reopened = LocalVectorProvider({"data_dir": str(tmp_path)})
+    index = reopened._get_index("products")
+    assert len(index) == 8
+    for i, record in enumerate(_records(3, offset=3, seed=1)):
+        assert reopened.search_by_vector("products", record.values, top_k=1)[0].id == f"urn:p:{3 + i}"
+
+
+def test_concurrent_writer_processes_do_not_collide(tmp_path):
+    """Test that prefork workers writing the same index keep every vector."""
+    write = (
+        "import sys\n"
+        "import zlib\n"
+        "import numpy as np\n"
+        "from app.vectors.providers.local import LocalVectorProvider\n"
+        "from app.vectors.types import VectorRecord\n"
+        "worker = int(sys.argv[1])\n"
+        f"provider = LocalVectorProvider({{'data_dir': {str(tmp_path)!r}}})\n"
+        "for batch in range(20):\n"
+        "    ids = [f'urn:p:{worker}:{batch}:{i}' for i in range(5)]\n"
+        "    provider.upsert_vectors('products', [\n"
+        "        VectorRecord(id=id, values=np.random.default_rng(zlib.crc32(id.encode())).normal(size=8).tolist(),\n"
+        "                     metadata={'id': id}) for id in ids\n"
+        "    ])\n"
+    )
+    processes = [
+        subprocess.Popen([sys.executable, "-c", write, str(worker)], env=dict(os.environ))
+        for worker in range(4)
+    ]
+    assert all(process.wait(timeout=120) == 0 for process in processes)
+
+    provider = LocalVectorProvider({"data_dir": str(tmp_path)})
+    index = provider._get_index("products")
+    assert len(index) == 400 and index.tombstones == 0
+    # Every row still holds the vector written with its own id
+    rows = np.asarray(index.vectors[: index.count], dtype=np.float32)
+    for row, (id, metadata) in enumerate(zip(index.ids, index.metadata)):
+        assert metadata["id"] == id
+        expected = np.random.default_rng(zlib.crc32(id.encode())).normal(size=8)
+        assert np.allclose(rows[row], expected / np.linalg.norm(expected), atol=1e-5)
@@ -0,0 +1,16 @@
+# tests/services/test_matryoshka.py
+import numpy as np
+
+from app.embeddings import truncate_embedding
+
+
+def test_truncate_embedding_keeps_prefix_direction():
+    """Test that the prefix is renormalized but keeps the direction of the first dims."""
+    embedding = np.random.default_rng(0).normal(size=1536)
+
+    prefix = np.asarray(truncate_embedding(embedding.tolist(), 256))
+
+    assert prefix.shape == (256,)
+    assert np.isclose(np.linalg.norm(prefix), 1.0, atol=1e-5)
+    assert np.allclose(prefix * np.linalg.norm(embedding[:256]), embedding[:256], atol=1e-4)
+    assert truncate_embedding([0.0] * 8, 4) == [0.0] * 4
@@ -0,0 +1,26 @@
+# tests/services/test_media_extraction.py
+from app.utils.media import extract_media
+
+
+def test_extract_media_normalizes_cmp_media_and_images():
+    """Test that @cmp:media and image are merged, URLs wrapped and duplicates dropped."""
+    raw_data = {
+        "@cmp:media": {"@type": "VideoObject", "url": "https://cdn.example/v.mp4"},
+        "image": [
+            "https://cdn.example/a.jpg",
+            {"@type": "ImageObject", "url": "https://cdn.example/b.jpg", "width": 800},
+            "https://cdn.example/a.jpg",
+            42,
+        ],
+    }
+
+    assert extract_media(raw_data) == [
+        {"@type": "VideoObject", "url": "https://cdn.example/v.mp4"},
+        {"@type": "ImageObject", "url": "https://cdn.example/a.jpg"},
+        {"@type": "ImageObject", "url": "https://cdn.example/b.jpg", "width": 800},
+    ]
+    assert extract_media({"image": "https://cdn.example/c.jpg"}) == [
+        {"@type": "ImageObject", "url": "https://cdn.example/c.jpg"}
+    ]
+    assert extract_media(None) == []
+    assert extract_media({"name": "No media"}) == []
@@ -0,0 +1,60 @@
+# tests/services/test_metrics.py
+import asyncio
+import os
+import subprocess
+import sys
+
+from app.core.metrics import (
+    SEARCH_CACHE_REQUESTS,
+    current_endpoint,
+    metrics_endpoint,
+    render_metrics,
+    time_search_stage,
+)
+from app.services.search.executor import fan_out, run_in_search_executor
+
+
+def test_search_stages_are_exported():
+    """Test that timed stages show up in the exposition output."""
+    with metrics_endpoint("test"), time_search_stage("embedding", backend="test-backend"):
+        pass
+    SEARCH_CACHE_REQUESTS.labels(cache="test", result="hit").inc(2)
+
+    lines = render_metrics().decode().splitlines()
+    assert any(
+        line.startswith("cmp_search_stage_seconds_count{")
+        and 'stage="embedding"' in line
+        and 'backend="test-backend"' in line
+        and 'endpoint="test"' in line
+        for line in lines
+    )
+    assert 'cmp_search_cache_requests_total{cache="test",result="hit"} 2.0' in lines
+
+
+def test_worker_process_metrics_are_aggregated(tmp_path):
+    """Test that ingestion metrics recorded in another process are served."""
+    env = dict(os.environ, PROMETHEUS_MULTIPROC_DIR=str(tmp_path))
+    record = (
+        "from app.core.metrics import INGESTION_ITEMS; "
+        "INGESTION_ITEMS.labels(kind='products').inc(3)"
+    )
+    render = "from app.core.metrics import render_metrics; print(render_metrics().decode())"
+    for _ in range(2):
+        subprocess.run([sys.executable, "-c", record], env=env, check=True)
+
+    output = subprocess.run(
+        [sys.executable, "-c", render], env=env, check=True, capture_output=True, text=True
+    ).stdout
+
+    assert 'cmp_ingestion_items_total{kind="products"} 6.0' in output.splitlines()
+
+
+def test_endpoint_label_follows_search_into_thread_pools():
+    """Test that the endpoint set by a route is seen by offloaded search code."""
+    async def search():
+        with metrics_endpoint("rest"):
+            offloaded = await run_in_search_executor(current_endpoint)
+            fanned, _ = fan_out({"dense": current_endpoint}, {"dense": 1.0})
+        return offloaded, fanned["dense"], current_endpoint()
+
+    assert asyncio.run(search()) == ("rest", "rest", "internal")
@@ -0,0 +1,81 @@
+# tests/services/test_pgvector_filtered_search.py
+import pytest
+
+from app.core.config import settings
+from app.services.search.filters import SearchFilters
+from app.services.search.pgvector_search import PgVectorSearchService
+from tests.services.test_pgvector_search import EF_SEARCH_SQL, FakeSession
+
+
+@pytest.fixture
+def filtered_search(monkeypatch):
+    monkeypatch.setattr(settings, "PGVECTOR_QUANTIZATION", "none")
+    monkeypatch.setattr(settings, "PGVECTOR_PREFIX_SEARCH", False)
+    monkeypatch.setattr(settings, "PGVECTOR_EXACT_SCAN_THRESHOLD", 100)
+    monkeypatch.setattr(settings, "PGVECTOR_ITERATIVE_SCAN", "relaxed_order")
+    monkeypatch.setattr(PgVectorSearchService, "_iterative_scan_supported", None)
+
+
+def test_selective_filter_uses_exact_scan(filtered_search):
+    """Test that a filter matching few products is ranked by an exact scan."""
+    session = FakeSession(matches=100)
+
+    sql, params = PgVectorSearchService(session)._nearest_cte(
+        [0.1] * 8, 10, SearchFilters(brand="Acme")
+    )
+
+    probe_sql, probe_params = session.statements[0]
+    assert "SELECT 1 FROM products p WHERE p.embedding IS NOT NULL AND p.brand_id IN" in probe_sql
+    assert probe_params == {"filter_brand": "Acme", "probe_limit": 101}
+    assert "WITH candidates AS MATERIALIZED" in sql
+    assert params["filter_brand"] == "Acme"
+    # The exact scan does not touch the HNSW settings
+    assert len(session.statements) == 1
+
+
+def test_broad_filter_uses_iterative_index_scan(filtered_search):
+    """Test that a broad filter keeps the HNSW scan and enables iterative scanning."""
+    session = FakeSession(matches=101)
+
+    sql, _ = PgVectorSearchService(session)._nearest_cte([0.1] * 8, 10, SearchFilters(brand="Acme"))
+
+    assert "MATERIALIZED" not in sql
+    assert "ORDER BY p.embedding <=> CAST(:embedding AS vector)" in sql
+    assert session.statements[1][0] == "SET LOCAL hnsw.iterative_scan = relaxed_order"
+    assert PgVectorSearchService._iterative_scan_supported is True
+
+
+def test_iterative_scan_is_probed_once_when_unsupported(filtered_search):
+    """Test that an old pgvector disables iterative scans after one failed probe."""
+    session = FakeSession(matches=101, iterative_scan=False)
+    service = PgVectorSearchService(session)
+
+    service._nearest_cte([0.1] * 8, 10, SearchFilters(brand="Acme"))
+    service._nearest_cte([0.1] * 8, 10, SearchFilters(brand="Acme"))
+
+    set_statements = [sql for sql, _ in session.statements if sql.startswith("SET LOCAL")]
+    assert len(set_statements) == 1
+    assert PgVectorSearchService._iterative_scan_supported is False
+
+
+@pytest.mark.parametrize("mode", ["off", "strict_order"])
+def test_scan_settings_can_be_disabled(filtered_search, monkeypatch, mode):
+    """Test that a zero threshold skips the probe and iterative scans follow their setting."""
+    monkeypatch.setattr(settings, "PGVECTOR_EXACT_SCAN_THRESHOLD", 0)
+    monkeypatch.setattr(settings, "PGVECTOR_ITERATIVE_SCAN", mode)
+    session = FakeSession(matches=1)
+
+    sql, _ = PgVectorSearchService(session)._nearest_cte([0.1] * 8, 10, SearchFilters(brand="Acme"))
+
+    assert "MATERIALIZED" not in sql
+    expected = [] if mode == "off" else [f"SET LOCAL hnsw.iterative_scan = {mode}"]
+    assert [sql for sql, _ in session.statements] == expected + [EF_SEARCH_SQL]
+
+
+def test_unfiltered_search_skips_the_probe(filtered_search):
+    """Test that searches without filters only let the HNSW scan return the whole pool."""
+    session = FakeSession()
+
+    PgVectorSearchService(session)._nearest_cte([0.1] * 8, 100)
+
+    assert session.statements == [(EF_SEARCH_SQL, {"ef_search": 100})]
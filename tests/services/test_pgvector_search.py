@@ -0,0 +1,243 @@
+# tests/services/test_pgvector_search.py
+from contextlib import nullcontext
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.exc import DBAPIError
+
+from app.core.config import settings
+from app.db.models.offer import Offer
+from app.schemas.product import ProductCreate
+from app.services.product_service import ProductService
+from app.services.search import pgvector_search
+from app.services.search.base import SearchResult
+from app.services.search.filters import SearchFilters
+from app.services.search.pgvector_search import PgVectorSearchService
+
+EF_SEARCH_SQL = " ".join(pgvector_search._EF_SEARCH_SQL.split())
+
+
+class FakeSession:
+    """Session that answers the selectivity probe and records executed statements."""
+
+    def __init__(self, matches=0, iterative_scan=True):
+        self.matches = matches
+        self.iterative_scan = iterative_scan
+        self.statements = []
+
+    def execute(self, statement, params=None):
+        sql = " ".join(str(statement).split())
+        self.statements.append((sql, params))
+        if sql.startswith("SET LOCAL hnsw.iterative_scan") and not self.iterative_scan:
+            raise DBAPIError(sql, params, Exception("unrecognized parameter"))
+        return SimpleNamespace(scalar=lambda: self.matches)
+
+    def begin_nested(self):
+        return nullcontext()
+
+
+def test_product_without_search_card_is_enriched(
+    db_session, organization_service, brand_service, test_organization_data
+):
+    """Test that a ranked product whose card was never built keeps its details."""
+    org_id = organization_service.process_organization(test_organization_data)
+    brand_id = brand_service.process_brand(test_organization_data["brand"][0], org_id)
+    product = ProductService(db_session).create_product(
+        ProductCreate(
+            name="Cardless Widget",
+            urn="urn:cmp:product:cardless-widget",
+            brand_id=brand_id,
+            organization_id=org_id,
+        )
+    )
+    candidate = SearchResult(
+        id=product.urn, score=0.5, metadata={"product_id": str(product.id)}
+    )
+
+    results = PgVectorSearchService(db_session).enrich_results([candidate])
+
+    assert [r.product_urn for r in results] == ["urn:cmp:product:cardless-widget"]
+    assert results[0].product_name == "Cardless Widget"
+    assert results[0].product_brand == "WidgetCo"
+    assert results[0].product_category is None
+    assert results[0].product_offers is None
+
+
+@pytest.mark.parametrize("filters", [None, SearchFilters(price_max=30)])
+def test_search_returns_one_row_per_product_with_all_offers(
+    monkeypatch, filters, db_session, organization_service, brand_service, test_organization_data
+):
+    """Test that top_k counts products, not offers, and every offer is attached."""
+    monkeypatch.setattr(settings, "PGVECTOR_HYBRID_SEARCH", False)
+    monkeypatch.setattr(settings, "PGVECTOR_QUANTIZATION", "none")
+    monkeypatch.setattr(settings, "PGVECTOR_PREFIX_SEARCH", False)
+    org_id = organization_service.process_organization(test_organization_data)
+    brand_id = brand_service.process_brand(test_organization_data["brand"][0], org_id)
+    product_service = ProductService(db_session)
+    catalog = {
+        # Three offers, two of which match price_max=30
+        "urn:cmp:product:multi-offer": ([1.0, 0.0], [25.0, 10.0, 40.0]),
+        "urn:cmp:product:single-offer": ([0.8, 0.6], [20.0]),
+    }
+    for urn, (direction, prices) in catalog.items():
+        product = product_service.create_product(
+            ProductCreate(name=urn, urn=urn, brand_id=brand_id, organization_id=org_id)
+        )
+        product.embedding = direction + [0.0] * 1534
+        db_session.add_all(
+            Offer(
+                product_id=product.id,
+                seller_id=org_id,
+                price=price,
+                price_currency="USD",
+                availability="InStock",
+            )
+            for price in prices
+        )
+    db_session.flush()
+
+    results = PgVectorSearchService(db_session)._search_by_embedding(
+        [1.0] + [0.0] * 1535, top_k=2, filters=filters
+    )
+
+    assert [r.product_urn for r in results] == [
+        "urn:cmp:product:multi-offer",
+        "urn:cmp:product:single-offer",
+    ]
+    assert [o["price"] for o in results[0].product_offers] == [10.0, 25.0, 40.0]
+    assert results[0].product_price == 10.0
+    assert [o["price"] for o in results[1].product_offers] == [20.0]
+
+
+@pytest.mark.parametrize(
+    "mode, order_by",
+    [
+        ("halfvec", "p.embedding::halfvec(1536) <=> CAST(:embedding AS halfvec(1536))"),
+        (
+            "binary",
+            "binary_quantize(p.embedding)::bit(1536) <~> "
+            "binary_quantize(CAST(:embedding AS vector))",
+        ),
+    ],
+)
+def test_quantized_search_reranks_index_candidates(monkeypatch, mode, order_by):
+    """Test the quantized ANN pass and its exact re-ranking of the candidates."""
+    monkeypatch.setattr(settings, "PGVECTOR_QUANTIZATION", mode)
+    monkeypatch.setattr(settings, "PGVECTOR_PREFIX_SEARCH", False)
+    monkeypatch.setattr(settings, "PGVECTOR_RERANK_FACTOR", 4)
+    monkeypatch.setattr(settings, "EMBEDDING_DIMENSION", 1536)
+
+    session = FakeSession()
+    sql, params = PgVectorSearchService(session)._nearest_cte([0.1] * 1536, 25)
+
+    assert f"ORDER BY {order_by}" in sql
+    assert "c.embedding <=> CAST(:embedding AS vector) AS distance" in sql
+    assert params["candidate_limit"] == 100
+    assert params["limit"] == 25
+    # The HNSW scan must be allowed to return every candidate
+    assert session.statements == [(EF_SEARCH_SQL, {"ef_search": 100})]
+
+
+def test_prefix_search_raises_ef_search_for_its_candidates(monkeypatch):
+    """Test that the Matryoshka prefix pass can return all of its candidates."""
+    monkeypatch.setattr(settings, "PGVECTOR_PREFIX_SEARCH", True)
+    monkeypatch.setattr(settings, "EMBEDDING_PREFIX_DIMENSION", 4)
+    monkeypatch.setattr(settings, "PGVECTOR_RERANK_FACTOR", 4)
+    session = FakeSession()
+
+    sql, params = PgVectorSearchService(session)._nearest_cte([0.1] * 8, 100)
+
+    assert "ORDER BY p.embedding_prefix <=> CAST(:embedding_prefix AS vector)" in sql
+    assert params["candidate_limit"] == 400
+    assert session.statements == [(EF_SEARCH_SQL, {"ef_search": 400})]
+
+
+class IndexCatalog:
+    """Session answering pg_indexes lookups from a name -> definition map."""
+
+    def __init__(self, indexes):
+        self.indexes = indexes
+
+    def execute(self, statement, params):
+        return SimpleNamespace(scalar=lambda: self.indexes.get(params["name"]))
+
+
+def test_startup_requires_the_configured_quantized_index(monkeypatch):
+    """Test that a missing or mis-sized quantized index stops startup with the fix."""
+    monkeypatch.setattr(settings, "VECTOR_PROVIDER", "pgvector")
+    monkeypatch.setattr(settings, "PGVECTOR_QUANTIZATION", "halfvec")
+    monkeypatch.setattr(settings, "EMBEDDING_DIMENSION", 1536)
+    built = (
+        "CREATE INDEX idx_products_embedding_halfvec ON public.products "
+        "USING hnsw (((embedding)::halfvec(1536)) halfvec_cosine_ops)"
+    )
+
+    pgvector_search.check_quantized_index(
+        IndexCatalog({"idx_products_embedding_halfvec": built})
+    )
+    with pytest.raises(RuntimeError) as missing:
+        pgvector_search.check_quantized_index(IndexCatalog({}))
+    assert (
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_products_embedding_halfvec ON products "
+        "USING hnsw ((embedding::halfvec(1536)) halfvec_cosine_ops)"
+    ) in str(missing.value)
+
+    monkeypatch.setattr(settings, "EMBEDDING_DIMENSION", 768)
+    with pytest.raises(RuntimeError, match="found: CREATE INDEX"):
+        pgvector_search.check_quantized_index(
+            IndexCatalog({"idx_products_embedding_halfvec": built})
+        )
+
+    # Nothing to check without quantization
+    monkeypatch.setattr(settings, "PGVECTOR_QUANTIZATION", "none")
+    pgvector_search.check_quantized_index(IndexCatalog({}))
+
+
+def test_hybrid_search_fuses_lexical_matches_with_rrf(monkeypatch):
+    """Test that hybrid ranking runs both retrievers and scores by RRF."""
+    monkeypatch.setattr(settings, "PGVECTOR_HYBRID_SEARCH", True)
+    monkeypatch.setattr(settings, "PGVECTOR_QUANTIZATION", "none")
+    monkeypatch.setattr(settings, "PGVECTOR_PREFIX_SEARCH", False)
+    monkeypatch.setattr(settings, "PGVECTOR_EXACT_SCAN_THRESHOLD", 0)
+    monkeypatch.setattr(settings, "PGVECTOR_ITERATIVE_SCAN", "off")
+    monkeypatch.setattr(settings, "SEARCH_RRF_K", 60)
+
+    sql, params = PgVectorSearchService(FakeSession())._ranked_cte(
+        [0.1] * 8, 10, SearchFilters(brand="Acme"), "red shoes"
+    )
+
+    assert "WHERE p.search_tsv @@ q.tsquery AND p.brand_id IN" in sql
+    assert "FULL OUTER JOIN lexical_ranks l ON l.id = d.id" in sql
+    assert "coalesce(1.0 / (:rrf_k + d.rank), 0) + coalesce(1.0 / (:rrf_k + l.rank), 0)" in sql
+    assert params["text_query"] == "red shoes"
+    assert params["rrf_k"] == 60
+    assert params["filter_brand"] == "Acme"
+
+
+@pytest.mark.parametrize("hybrid, query", [(False, "red shoes"), (True, "  "), (True, None)])
+def test_dense_search_scores_by_cosine_similarity(monkeypatch, hybrid, query):
+    """Test that without hybrid search or a query text the score stays the cosine similarity."""
+    monkeypatch.setattr(settings, "PGVECTOR_HYBRID_SEARCH", hybrid)
+    monkeypatch.setattr(settings, "PGVECTOR_QUANTIZATION", "none")
+    monkeypatch.setattr(settings, "PGVECTOR_PREFIX_SEARCH", False)
+
+    sql, params = PgVectorSearchService(FakeSession())._ranked_cte([0.1] * 8, 10, None, query)
+
+    assert "1 - n.distance AS score" in sql
+    assert "lexical" not in sql
+    assert "text_query" not in params
+
+
+def test_embedding_failure_degrades_search(monkeypatch):
+    """Test that a failed query embedding is reported as a degraded retriever."""
+    def fail(query):
+        raise RuntimeError("embedding service down")
+
+    monkeypatch.setattr(pgvector_search, "get_query_embedding", fail)
+    monkeypatch.setattr(settings, "EMBEDDING_DIMENSION", 8)
+    service = PgVectorSearchService(db_session=None)
+
+    embedding = service._get_query_embedding("red shoes")
+
+    assert len(embedding) == 8
+    assert service.degraded_retrievers == ["embedding"]
@@ -0,0 +1,30 @@
+# tests/services/test_product_search_card_repository.py
+from app.db.repositories.product_search_card_repository import ProductSearchCardRepository
+from app.schemas.product import ProductCreate
+from app.services.product_service import ProductService
+
+
+def test_refresh_builds_card_for_uncategorized_product(
+    db_session, organization_service, brand_service, test_organization_data
+):
+    """Test that a product without a category still gets a search card."""
+    org_id = organization_service.process_organization(test_organization_data)
+    brand_id = brand_service.process_brand(test_organization_data["brand"][0], org_id)
+    product = ProductService(db_session).create_product(
+        ProductCreate(
+            name="Loose Widget",
+            urn="urn:cmp:product:loose-widget",
+            brand_id=brand_id,
+            organization_id=org_id,
+        )
+    )
+    assert product.category_id is None
+
+    repository = ProductSearchCardRepository(db_session)
+    assert repository.refresh([product.id]) == 1
+
+    [card] = repository.get_by_urns([product.urn])
+    assert card.name == "Loose Widget"
+    assert card.brand_name == "WidgetCo"
+    assert card.category_name is None
+    assert card.offers == []
@@ -0,0 +1,79 @@
+# tests/services/test_search_collapse.py
+from types import SimpleNamespace
+
+from app.core.config import settings
+from app.services.search import local_search
+from app.services.search.base import SearchResult
+from app.services.search.collapse import collapse_by_group
+from app.services.search.local_search import LocalSearchService
+from app.utils.formatters import format_product_search_response
+
+
+def candidate(urn, group=None):
+    metadata = {"product_id": urn}
+    if group:
+        metadata["product_group_id"] = group
+    return SearchResult(id=urn, score=1.0, metadata=metadata)
+
+
+def test_best_variant_represents_its_group():
+    """Test that each group keeps its first ranked product and counts its variants."""
+    collapsed = collapse_by_group(
+        [
+            candidate("urn:p:red", "shirt"),
+            candidate("urn:p:mug"),
+            candidate("urn:p:blue", "shirt"),
+            candidate("urn:p:green", "shirt"),
+            candidate("urn:p:lamp", "lamp"),
+        ],
+        top_k=2,
+    )
+
+    assert [(c.id, c.variant_count) for c in collapsed] == [("urn:p:red", 3), ("urn:p:mug", 1)]
+
+
+def test_collapsed_results_carry_variant_count():
+    """Test the search response fields of a collapsed result."""
+    result = SearchResult(
+        id="urn:p:red",
+        score=0.5,
+        metadata={},
+        product_urn="urn:p:red",
+        product_name="Shirt (red)",
+        variant_count=3,
+        product_group_urn="urn:cmp:product:shirt",
+    )
+
+    response = format_product_search_response([result])
+    item = response["itemListElement"][0]["item"]
+
+    assert item["cmp:variantCount"] == 3
+    assert item["isVariantOf"] == {"@type": "ProductGroup", "@id": "urn:cmp:product:shirt"}
+    assert "cmp" in response["@context"]
+
+
+def test_local_search_overfetches_and_collapses(monkeypatch):
+    """Test that the local backend ranks extra products to fill top_k groups."""
+    requested = []
+
+    class Provider:
+        def search_by_vector(self, index, embedding, top_k, filter=None):
+            requested.append(top_k)
+            return [
+                SimpleNamespace(
+                    id=f"urn:p:{i}",
+                    score=1.0 - i / 10,
+                    metadata={"product_id": str(i), "product_group_id": f"g{i // 3}"},
+                )
+                for i in range(6)
+            ]
+
+    monkeypatch.setattr(local_search, "get_local_vector_provider", lambda: Provider())
+    monkeypatch.setattr(settings, "SEARCH_COLLAPSE_FETCH_FACTOR", 4)
+    service = LocalSearchService(db_session=None)
+    service.collapse_variants = True
+
+    candidates = service._search_candidates([1.0], top_k=2)
+
+    assert requested == [8]
+    assert [(c.id, c.variant_count) for c in candidates] == [("urn:p:0", 3), ("urn:p:3", 3)]
@@ -0,0 +1,84 @@
+# tests/services/test_search_executor.py
+import asyncio
+import threading
+import time
+
+from app.services.search.base import BaseSearchService, SearchResult
+from app.services.search.executor import fan_out, search_dense_and_sparse
+
+
+class SlowSearchService(BaseSearchService):
+    """Search service with a blocking search_products implementation."""
+
+    def search_products(self, query, top_k=20, alpha=0.7, include_metadata=True, filters=None):
+        time.sleep(0.1)
+        return [SearchResult(id=threading.current_thread().name, score=1.0, metadata={})]
+
+
+def test_asearch_products_does_not_block_event_loop():
+    """Test that concurrent async searches overlap instead of serializing."""
+    service = SlowSearchService(db_session=None)
+
+    async def run():
+        start = time.perf_counter()
+        results = await asyncio.gather(*[service.asearch_products("q") for _ in range(5)])
+        return results, time.perf_counter() - start
+
+    results, elapsed = asyncio.run(run())
+
+    assert len(results) == 5
+    assert all(r[0].id.startswith("search") for r in results)
+    assert elapsed < 0.4
+
+
+def test_fan_out_runs_concurrently_and_reports_failures():
+    """Test that retrievers overlap and slow or failing ones are reported."""
+
+    def slow():
+        time.sleep(0.5)
+        return "slow"
+
+    def broken():
+        raise RuntimeError("boom")
+
+    start = time.perf_counter()
+    results, failed = fan_out(
+        {"dense": lambda: "dense", "sparse": slow, "other": broken},
+        {"dense": 1.0, "sparse": 0.05, "other": 1.0},
+    )
+
+    assert results == {"dense": "dense"}
+    assert sorted(failed) == ["other", "sparse"]
+    assert time.perf_counter() - start < 0.4
+
+
+class FakeRepository:
+    """Repository whose sparse index is down, recording the arguments it gets."""
+
+    def __init__(self):
+        self.calls = []
+
+    def _search_dense_index(self, *args):
+        self.calls.append(args)
+        return {"results": [{"id": "p1", "score": 1.0}]}
+
+    def _search_sparse_index(self, *args):
+        raise RuntimeError("sparse down")
+
+
+def test_search_dense_and_sparse_degrades_and_forwards_filter():
+    """Test that a failing retriever is reported and the metadata filter is passed on."""
+    repository = FakeRepository()
+
+    dense, sparse, degraded = search_dense_and_sparse(
+        repository, "shoes", 10, metadata_filter={"brand": {"$eq": "acme"}}
+    )
+
+    assert dense == {"results": [{"id": "p1", "score": 1.0}]}
+    assert sparse == {"results": []}
+    assert degraded == ["sparse"]
+    assert repository.calls == [("shoes", 10, 0.7, True, {"brand": {"$eq": "acme"}})]
+
+    repository.calls.clear()
+    search_dense_and_sparse(repository, "shoes", 10)
+    assert repository.calls == [("shoes", 10, 0.7, True)]
@@ -0,0 +1,166 @@
+# tests/services/test_search_filters.py
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import text
+
+from app.db.models.offer import Offer
+from app.schemas.product import ProductCreate, ProductForVector
+from app.services.product_service import ProductService
+from app.services.search.filters import SearchFilters, to_pinecone_filter, to_sql
+from app.services.vector_service import VectorService
+from app.vectors.providers.local import LocalVectorProvider
+from app.vectors.types import VectorRecord
+
+
+def test_empty_filters():
+    """Test that unset filters produce no predicates."""
+    filters = SearchFilters()
+
+    assert filters.is_empty()
+    assert to_sql(filters) == ("TRUE", {})
+    assert to_pinecone_filter(filters) is None
+
+
+def test_offer_predicates_share_one_exists():
+    """Test that price and availability must hold for the same offer."""
+    sql, params = to_sql(
+        SearchFilters(price_min=10, price_max=50, availability="InStock", brand="Acme")
+    )
+
+    assert sql.count("EXISTS") == 1
+    assert "o.price >= :filter_price_min" in sql
+    assert "o.availability = :filter_availability" in sql
+    assert "lower(name) = lower(:filter_brand)" in sql
+    assert params == {
+        "filter_brand": "Acme",
+        "filter_price_min": 10,
+        "filter_price_max": 50,
+        "filter_availability": "InStock",
+    }
+
+
+def test_pinecone_filter_matches_vector_metadata():
+    """Test that Pinecone filters use the upserted metadata fields."""
+    metadata_filter = to_pinecone_filter(
+        SearchFilters(price_max=20, category="Books", organization_urn="urn:cmp:org:1")
+    )
+
+    assert metadata_filter == {
+        "price_min": {"$lte": 20},
+        "category_lower": {"$eq": "books"},
+        "organization_urn": {"$eq": "urn:cmp:org:1"},
+    }
+
+
+# Filters whose SQL and metadata semantics coincide, to check the backends agree
+AGREEING_FILTERS = [
+    SearchFilters(brand="widgetco"),
+    SearchFilters(brand="WIDGETCO", category="gadgets"),
+    SearchFilters(availability="OutOfStock"),
+    SearchFilters(availability="InStock"),
+    SearchFilters(price_min=40),
+    SearchFilters(price_max=15),
+    SearchFilters(price_min=20, price_max=60),
+]
+
+
+def _metadata_matches(tmp_path, products, filters):
+    """URNs the local index (Pinecone filter semantics) returns for the filters"""
+    vector_service = VectorService(db_session=None)
+    provider = LocalVectorProvider({"data_dir": str(tmp_path)})
+    provider.upsert_vectors(
+        "products",
+        [
+            VectorRecord(
+                id=product.urn,
+                values=[1.0, float(i)],
+                metadata=vector_service._add_metadata(
+                    ProductForVector.from_product_with_relations(product)
+                ),
+            )
+            for i, product in enumerate(products)
+        ],
+    )
+    hits = provider.search_by_vector(
+        "products", [1.0, 0.0], top_k=len(products), filter=to_pinecone_filter(filters)
+    )
+    return {hit.id for hit in hits}
+
+
+def _product(urn, brand, category, offers):
+    return SimpleNamespace(
+        id=urn,
+        urn=urn,
+        name=urn,
+        description=None,
+        brand=SimpleNamespace(name=brand),
+        category=SimpleNamespace(name=category),
+        offers=[SimpleNamespace(price=p, availability=a) for p, a in offers],
+        product_group_id=None,
+        organization=None,
+        variant_attributes={},
+    )
+
+
+@pytest.mark.parametrize(
+    "filters, expected",
+    [
+        (SearchFilters(brand="widgetco"), {"urn:p:a", "urn:p:b"}),
+        (SearchFilters(brand="WIDGETCO", category="gadgets"), {"urn:p:a"}),
+        (SearchFilters(availability="OutOfStock"), {"urn:p:a", "urn:p:c"}),
+        (SearchFilters(price_min=40), {"urn:p:a"}),
+        (SearchFilters(price_max=15), {"urn:p:a", "urn:p:b"}),
+        (SearchFilters(price_min=20, price_max=60), {"urn:p:a", "urn:p:c"}),
+    ],
+)
+def test_metadata_filter_matches_any_offer_and_ignores_case(tmp_path, filters, expected):
+    """Test that indexed metadata gives to_sql's case and offer semantics."""
+    products = [
+        _product("urn:p:a", "WidgetCo", "Gadgets", [(5.0, "InStock"), (50.0, "OutOfStock")]),
+        _product("urn:p:b", "WIDGETCO", "Tools", [(11.0, "InStock")]),
+        _product("urn:p:c", "Other", "Gadgets", [(30.0, "OutOfStock")]),
+    ]
+
+    assert _metadata_matches(tmp_path, products, filters) == expected
+
+
+@pytest.mark.parametrize("filters", AGREEING_FILTERS)
+def test_sql_and_metadata_filters_agree(
+    tmp_path, filters, db_session, organization_service, brand_service, test_organization_data
+):
+    """Test that pgvector and Pinecone-style filtering select the same products."""
+    org_id = organization_service.process_organization(test_organization_data)
+    brand_id = brand_service.process_brand(test_organization_data["brand"][0], org_id)
+    product_service = ProductService(db_session)
+    catalog = {
+        "urn:cmp:product:filter-a": [(5.0, "InStock"), (50.0, "OutOfStock")],
+        "urn:cmp:product:filter-b": [(11.0, "InStock")],
+        "urn:cmp:product:filter-c": [],
+    }
+    for urn, offers in catalog.items():
+        product = product_service.create_product(
+            ProductCreate(name=urn, urn=urn, brand_id=brand_id, organization_id=org_id)
+        )
+        db_session.add_all(
+            Offer(
+                product_id=product.id,
+                seller_id=org_id,
+                price=price,
+                price_currency="USD",
+                availability=availability,
+            )
+            for price, availability in offers
+        )
+    db_session.flush()
+
+    predicate, params = to_sql(filters)
+    sql_matches = set(
+        db_session.execute(
+            text(f"SELECT p.urn FROM products p WHERE p.urn = ANY(:urns) AND {predicate}"),
+            {"urns": list(catalog), **params},
+        ).scalars()
+    )
+    products = product_service.product_repo.get_products_by_urns(list(catalog))
+
+    assert _metadata_matches(tmp_path, products, filters) == sql_matches
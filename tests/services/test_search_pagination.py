@@ -0,0 +1,122 @@
+# tests/services/test_search_pagination.py
+import asyncio
+import threading
+
+import pytest
+
+from app.services.search.base import BaseSearchService, SearchResult
+from app.services.search import pagination
+from app.services.search.filters import SearchFilters
+from app.services.search.pagination import (
+    BatchQuery,
+    CandidateStore,
+    InvalidCursorError,
+    _search_fingerprint,
+    check_cursor,
+    encode_cursor,
+    search_page,
+    search_pages,
+)
+
+
+class CountingSearchService(BaseSearchService):
+    """Search service that counts how often candidates are ranked."""
+
+    def __init__(self):
+        super().__init__(db_session=None)
+        self.retrievals = 0
+
+    def search_products(self, query, top_k=20, alpha=0.7, include_metadata=True, filters=None):
+        return self.retrieve_candidates(query, top_k, alpha, filters)
+
+    def retrieve_candidates(self, query, top_k=100, alpha=0.7, filters=None):
+        self.retrievals += 1
+        return [
+            SearchResult(id=f"urn:p:{i}", score=1.0 - i / 100, metadata={})
+            for i in range(25)
+        ]
+
+
+def test_later_pages_reuse_the_ranking():
+    """Test that following the cursor pages through one ranking without re-querying."""
+    service = CountingSearchService()
+
+    async def run():
+        pages = [await search_page(service, "shoes", 10)]
+        while pages[-1].next_cursor:
+            pages.append(
+                await search_page(service, "shoes", 10, cursor=pages[-1].next_cursor)
+            )
+        return pages
+
+    pages = asyncio.run(run())
+
+    assert [len(p.results) for p in pages] == [10, 10, 5]
+    assert [p.offset for p in pages] == [0, 10, 20]
+    assert pages[1].results[0].id == "urn:p:10"
+    assert service.retrievals == 1
+
+
+def test_cursor_is_tied_to_query_and_filters():
+    """Test that a cursor cannot be replayed against another search."""
+    service = CountingSearchService()
+
+    async def run():
+        first = await search_page(service, "shoes", 10)
+        with pytest.raises(InvalidCursorError):
+            await search_page(service, "boots", 10, cursor=first.next_cursor)
+        with pytest.raises(InvalidCursorError):
+            await search_page(
+                service, "shoes", 10, cursor=first.next_cursor,
+                filters=SearchFilters(brand="Acme"),
+            )
+        with pytest.raises(InvalidCursorError):
+            await search_page(service, "shoes", 10, cursor="not-a-cursor")
+
+    asyncio.run(run())
+
+
+def test_cursor_is_tied_to_ranking_mode():
+    """Test that a cursor from a collapsed search is rejected by an uncollapsed one."""
+    collapsed = CountingSearchService()
+    collapsed.collapse_variants = True
+
+    async def run():
+        first = await search_page(collapsed, "shoes", 10)
+        assert (await search_page(collapsed, "shoes", 10, cursor=first.next_cursor)).offset == 10
+        with pytest.raises(InvalidCursorError):
+            await search_page(CountingSearchService(), "shoes", 10, cursor=first.next_cursor)
+
+    asyncio.run(run())
+    assert check_cursor(
+        encode_cursor("c", 10, _search_fingerprint("shoes", None, collapse_variants=True)),
+        "shoes",
+        collapse_variants=True,
+    ) == ("c", 10)
+
+
+def test_candidate_store_runs_off_the_event_loop(monkeypatch):
+    """Test that ranking storage and lookups, which may call Redis, run in the search pool."""
+    threads = []
+
+    class RecordingStore(CandidateStore):
+        def get(self, candidates_id):
+            threads.append(threading.current_thread().name)
+            return super().get(candidates_id)
+
+        def put(self, candidates):
+            threads.append(threading.current_thread().name)
+            return super().put(candidates)
+
+    monkeypatch.setattr(pagination, "_candidate_store", RecordingStore())
+    service = CountingSearchService()
+
+    async def run():
+        first = await search_page(service, "shoes", 10)
+        await search_page(service, "shoes", 10, cursor=first.next_cursor)
+        await search_pages(service, [BatchQuery("socks", limit=5)])
+
+    asyncio.run(run())
+
+    assert len(threads) == 3
+    assert all(name.startswith("search") for name in threads)
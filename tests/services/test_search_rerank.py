@@ -0,0 +1,74 @@
+# tests/services/test_search_rerank.py
+import asyncio
+
+import pytest
+
+from app.core.config import settings
+from app.services.search import rerank
+from app.services.search.base import BaseSearchService, SearchResult
+from app.services.search.pagination import search_page
+from app.services.search.rerank import LinearReranker, parse_weights
+
+
+def candidate(urn, score, **offer):
+    return SearchResult(id=urn, score=score, metadata={"product_id": urn, "offers": [offer]})
+
+
+def test_in_stock_and_cheaper_candidates_move_up():
+    """Test that offer features outweigh small retrieval score gaps."""
+    reranker = LinearReranker({"score": 1.0, "in_stock": 0.5, "price_percentile": -0.5})
+    candidates = [
+        candidate("urn:p:sold-out", 0.90, price=20, availability="OutOfStock"),
+        candidate("urn:p:pricey", 0.89, price=80, availability="InStock"),
+        candidate("urn:p:cheap", 0.88, price=10, availability="https://schema.org/InStock"),
+    ]
+
+    ranked = reranker.rerank(candidates)
+
+    assert [c.id for c in ranked] == ["urn:p:cheap", "urn:p:pricey", "urn:p:sold-out"]
+    assert ranked[0].score > ranked[1].score > ranked[2].score
+
+
+def test_unknown_features_are_neutral():
+    """Test that a candidate without delivery data is not pushed up or down."""
+    reranker = LinearReranker({"delivery_days": -1.0})
+    candidates = [
+        candidate("urn:p:slow", 0.5, est_delivery_max_days=10),
+        candidate("urn:p:unknown", 0.5),
+        candidate("urn:p:fast", 0.5, est_delivery_max_days=2),
+    ]
+
+    assert [c.id for c in reranker.rerank(candidates)] == [
+        "urn:p:fast", "urn:p:unknown", "urn:p:slow"
+    ]
+
+
+def test_weights_are_validated():
+    """Test the weight spec parser."""
+    assert parse_weights("score=1, in_stock=0.25") == {"score": 1.0, "in_stock": 0.25}
+    with pytest.raises(ValueError):
+        parse_weights("popularity=1")
+
+
+class OfferSearchService(BaseSearchService):
+    """Search service ranking an out-of-stock product first."""
+
+    def search_products(self, query, top_k=20, alpha=0.7, include_metadata=True, filters=None):
+        return self.retrieve_candidates(query, top_k, alpha, filters)
+
+    def retrieve_candidates(self, query, top_k=100, alpha=0.7, filters=None):
+        return [
+            candidate("urn:p:1", 1.0, price=30, availability="OutOfStock"),
+            candidate("urn:p:2", 0.99, price=30, availability="InStock"),
+        ]
+
+
+def test_pages_are_served_in_reranked_order(monkeypatch):
+    """Test that the configured model re-orders candidates before paging."""
+    monkeypatch.setattr(settings, "SEARCH_RERANK_ENABLED", True)
+    monkeypatch.setattr(rerank, "_reranker", LinearReranker({"score": 1.0, "in_stock": 1.0}))
+
+    page = asyncio.run(search_page(OfferSearchService(db_session=None), "lamp", 1))
+
+    assert [r.id for r in page.results] == ["urn:p:2"]
+    assert page.next_cursor is not None
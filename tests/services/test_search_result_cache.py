@@ -0,0 +1,56 @@
+# tests/services/test_search_result_cache.py
+from app.core.config import settings
+from app.services.search import result_cache
+from app.services.search.filters import SearchFilters
+from app.services.search.result_cache import SearchResultCache
+
+
+def test_key_normalizes_query_and_includes_filters():
+    """Test that trivial query variants share a key but filters do not."""
+    cache = SearchResultCache()
+
+    assert cache.make_key("Red  Shoes", 20) == cache.make_key("red shoes", 20)
+    assert cache.make_key("red shoes", 20) != cache.make_key("red shoes", 10)
+    assert cache.make_key("red shoes", 20) != cache.make_key(
+        "red shoes", 20, SearchFilters(brand="Acme")
+    )
+
+
+def test_generation_bump_invalidates_entries():
+    """Test that ingestion for an organization invalidates affected entries only."""
+    cache = SearchResultCache()
+    org_a = SearchFilters(organization_urn="urn:cmp:org:a")
+    org_b = SearchFilters(organization_urn="urn:cmp:org:b")
+
+    for filters in (None, org_a, org_b):
+        cache.set(cache.make_key("shoes", 20, filters), {"itemListElement": []})
+
+    cache.bump_generation("urn:cmp:org:a")
+
+    assert cache.get(cache.make_key("shoes", 20)) is None
+    assert cache.get(cache.make_key("shoes", 20, org_a)) is None
+    assert cache.get(cache.make_key("shoes", 20, org_b)) == {"itemListElement": []}
+
+
+def test_cache_requires_shared_generations(monkeypatch):
+    """Test that the cache stays off without Redis, where worker invalidations cannot reach it."""
+    monkeypatch.setattr(settings, "SEARCH_CACHE_ENABLED", True)
+    monkeypatch.setattr(result_cache, "_search_result_cache", None)
+    monkeypatch.setattr(result_cache, "get_redis_client", lambda: None)
+
+    assert result_cache.get_search_result_cache() is None
+
+
+def test_key_includes_rerank_config(monkeypatch):
+    """Test that changing the re-ranking model changes the key."""
+    cache = SearchResultCache()
+    monkeypatch.setattr(settings, "SEARCH_RERANK_ENABLED", False)
+    plain = cache.make_key("shoes", 20)
+
+    monkeypatch.setattr(settings, "SEARCH_RERANK_ENABLED", True)
+    monkeypatch.setattr(settings, "SEARCH_RERANK_WEIGHTS", "score=1,in_stock=0.2")
+    reranked = cache.make_key("shoes", 20)
+    monkeypatch.setattr(settings, "SEARCH_RERANK_WEIGHTS", "score=1,in_stock=0.5")
+
+    assert plain != reranked
+    assert reranked != cache.make_key("shoes", 20)
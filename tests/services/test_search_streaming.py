@@ -0,0 +1,87 @@
+# tests/services/test_search_streaming.py
+import asyncio
+
+from app.services.search.base import BaseSearchService, SearchResult
+from app.services.search.streaming import SearchStream
+
+
+class Session:
+    closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class StreamingSearchService(BaseSearchService):
+    """Search service whose enrichment can be held until released."""
+
+    def __init__(self, db_session, release=None):
+        super().__init__(db_session)
+        self.release = release
+
+    def search_products(self, query, top_k=20, alpha=0.7, include_metadata=True, filters=None):
+        return self.retrieve_candidates(query, top_k, alpha, filters)
+
+    def retrieve_candidates(self, query, top_k=100, alpha=0.7, filters=None):
+        return [
+            SearchResult(id=f"urn:p:{i}", score=1.0 - i / 10, metadata={}) for i in range(5)
+        ]
+
+    async def aenrich_results(self, candidates):
+        if self.release is not None:
+            await self.release.wait()
+        return [
+            SearchResult(id=c.id, score=c.score, metadata={}, product_urn=c.id, product_name=c.id)
+            for c in candidates
+        ]
+
+
+def test_stream_sends_candidates_before_enriched_batches():
+    """Test the event order, batch positions and session cleanup."""
+    session = Session()
+    stream = SearchStream(
+        "lamp", 5, lambda: session, StreamingSearchService, batch_size=2
+    )
+
+    async def collect():
+        return [event async for event in stream.events()]
+
+    events = asyncio.run(collect())
+
+    assert [name for name, _ in events] == ["candidates", "items", "items", "items", "done"]
+    assert events[0][1]["itemListElement"][0]["item"] == {"@id": "urn:p:0", "cmp:searchScore": 1.0}
+    assert [e["position"] for e in events[2][1]["itemListElement"]] == [3, 4]
+    assert events[2][1]["itemListElement"][0]["item"]["@id"] == "urn:p:2"
+    assert len(stream.results) == 5
+    assert session.closed
+
+
+def test_abandoned_stream_closes_session_after_running_step():
+    """Test that a cancelled consumer releases the session once the step ends."""
+    session = Session()
+
+    async def run():
+        release = asyncio.Event()
+        stream = SearchStream(
+            "lamp", 5, lambda: session,
+            lambda db: StreamingSearchService(db, release), batch_size=2,
+        )
+        first_event = asyncio.Event()
+
+        async def consume():
+            async for _ in stream.events():
+                first_event.set()
+
+        task = asyncio.create_task(consume())
+        await first_event.wait()
+        await asyncio.sleep(0)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        closed_while_running = session.closed
+
+        release.set()
+        await asyncio.sleep(0.01)
+        return closed_while_running
+
+    assert asyncio.run(run()) is False
+    assert session.closed
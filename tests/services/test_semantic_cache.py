@@ -0,0 +1,123 @@
+# tests/services/test_semantic_cache.py
+import asyncio
+
+from app.core.config import settings
+from app.services.search import semantic_cache
+from app.services.search.base import SearchResult
+from app.services.search.filters import SearchFilters
+from app.services.search.pgvector_search import PgVectorSearchService
+from app.services.search.result_cache import SearchResultCache
+from app.services.search.semantic_cache import SemanticQueryCache
+
+PARTITION = SemanticQueryCache.partition(100)
+
+
+def ranking(*ids):
+    return [SearchResult(id=urn, score=1.0, metadata={"product_id": urn}) for urn in ids]
+
+
+def test_near_duplicate_query_reuses_ranking():
+    """Test that embeddings within the threshold share an entry and others miss."""
+    cache = SemanticQueryCache(threshold=0.95)
+    cache.set([1.0, 0.0, 0.1], PARTITION, ranking("urn:p:1", "urn:p:2"))
+
+    hit = cache.get([2.0, 0.0, 0.25], PARTITION)
+
+    assert [r.id for r in hit] == ["urn:p:1", "urn:p:2"]
+    assert cache.get([0.5, 1.0, 0.0], PARTITION) is None
+    assert cache.get([1.0, 0.0, 0.1], SemanticQueryCache.partition(20)) is None
+    assert cache.get(
+        [1.0, 0.0, 0.1], SemanticQueryCache.partition(100, SearchFilters(brand="Acme"))
+    ) is None
+
+
+def test_hits_are_copies():
+    """Test that enriching a returned ranking does not change the cached one."""
+    cache = SemanticQueryCache()
+    cache.set([1.0, 0.0], PARTITION, ranking("urn:p:1"))
+
+    cache.get([1.0, 0.0], PARTITION)[0].metadata["name"] = "changed"
+
+    assert cache.get([1.0, 0.0], PARTITION)[0].metadata == {"product_id": "urn:p:1"}
+
+
+def test_least_recently_used_entry_is_evicted():
+    """Test that a full cache overwrites the entry unused for longest."""
+    cache = SemanticQueryCache(max_size=2)
+    cache.set([1.0, 0.0, 0.0], PARTITION, ranking("urn:p:x"))
+    cache.set([0.0, 1.0, 0.0], PARTITION, ranking("urn:p:y"))
+    cache.get([1.0, 0.0, 0.0], PARTITION)
+
+    cache.set([0.0, 0.0, 1.0], PARTITION, ranking("urn:p:z"))
+
+    assert len(cache) == 2
+    assert cache.get([0.0, 1.0, 0.0], PARTITION) is None
+    assert cache.get([1.0, 0.0, 0.0], PARTITION) is not None
+
+
+class EmbeddingSearchService(PgVectorSearchService):
+    """pgvector service with fixed query embeddings and a counted index query."""
+
+    embeddings = {"wireless earbuds": [1.0, 0.2], "bluetooth earbuds wireless": [1.0, 0.22]}
+
+    def __init__(self):
+        super().__init__(db_session=None)
+        self.index_queries = []
+
+    async def _aget_query_embedding(self, query):
+        return self.embeddings[query]
+
+    def _search_candidates(self, embedding, top_k, filters=None, query=None):
+        self.index_queries.append(query)
+        return ranking(f"urn:p:{query}")
+
+
+def test_paraphrase_skips_index_until_catalog_changes(monkeypatch):
+    """Test the retrieval path and invalidation by catalog generation."""
+    result_cache = SearchResultCache()
+    monkeypatch.setattr(settings, "SEARCH_CACHE_ENABLED", True)
+    monkeypatch.setattr(settings, "SEARCH_SEMANTIC_CACHE_ENABLED", True)
+    monkeypatch.setattr(settings, "PGVECTOR_HYBRID_SEARCH", False)
+    monkeypatch.setattr(semantic_cache, "_semantic_cache", SemanticQueryCache())
+    monkeypatch.setattr(semantic_cache, "get_search_result_cache", lambda: result_cache)
+
+    async def retrieve(query):
+        service = EmbeddingSearchService()
+        candidates = await service.aretrieve_candidates(query, top_k=100)
+        return [c.id for c in candidates], service.index_queries
+
+    assert asyncio.run(retrieve("wireless earbuds")) == (
+        ["urn:p:wireless earbuds"], ["wireless earbuds"]
+    )
+    assert asyncio.run(retrieve("bluetooth earbuds wireless")) == (
+        ["urn:p:wireless earbuds"], []
+    )
+
+    result_cache.bump_generation()
+
+    assert asyncio.run(retrieve("bluetooth earbuds wireless")) == (
+        ["urn:p:bluetooth earbuds wireless"], ["bluetooth earbuds wireless"]
+    )
+
+
+def test_hybrid_search_bypasses_semantic_cache(monkeypatch):
+    """Test that paraphrases with different lexical terms are not answered from the cache."""
+    result_cache = SearchResultCache()
+    monkeypatch.setattr(settings, "SEARCH_CACHE_ENABLED", True)
+    monkeypatch.setattr(settings, "SEARCH_SEMANTIC_CACHE_ENABLED", True)
+    monkeypatch.setattr(settings, "PGVECTOR_HYBRID_SEARCH", True)
+    monkeypatch.setattr(semantic_cache, "_semantic_cache", SemanticQueryCache())
+    monkeypatch.setattr(semantic_cache, "get_search_result_cache", lambda: result_cache)
+
+    async def retrieve(query):
+        service = EmbeddingSearchService()
+        candidates = await service.aretrieve_candidates(query, top_k=100)
+        return [c.id for c in candidates], service.index_queries
+
+    assert semantic_cache.get_semantic_cache() is None
+    assert asyncio.run(retrieve("wireless earbuds")) == (
+        ["urn:p:wireless earbuds"], ["wireless earbuds"]
+    )
+    assert asyncio.run(retrieve("bluetooth earbuds wireless")) == (
+        ["urn:p:bluetooth earbuds wireless"], ["bluetooth earbuds wireless"]
+    )
@@ -0,0 +1,64 @@
+# tests/services/test_tracing.py
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from app.core.metrics import time_search_stage
+from app.core.tracing import install_sql_tracing, request_trace
+from app.services.search.executor import fan_out, run_in_search_executor
+
+
+def test_server_timing_sums_stages_recorded_in_thread_pools():
+    """Test that offloaded stages land in the request's Server-Timing header."""
+    def retrieve():
+        with time_search_stage("retrieval"):
+            return 1
+
+    async def search():
+        with request_trace() as trace:
+            with time_search_stage("total"):
+                await run_in_search_executor(retrieve)
+                fan_out({"dense": retrieve, "sparse": retrieve}, {"dense": 1.0, "sparse": 1.0})
+                with time_search_stage("formatting"):
+                    pass
+        return trace
+
+    trace = asyncio.run(search())
+    names = [part.split(";")[0] for part in trace.server_timing().split(", ")]
+    assert names == ["ann", "serialization", "total"]
+    assert all(";dur=" in part for part in trace.server_timing().split(", "))
+
+
+def test_sql_is_recorded_only_inside_a_debug_trace():
+    """Test that statements and row counts are kept for debug traces only."""
+    engine = create_engine("sqlite://")
+    install_sql_tracing(engine)
+
+    with engine.connect() as conn:
+        conn.execute(text("CREATE TABLE t (x INTEGER)"))
+        with request_trace() as plain:
+            conn.execute(text("INSERT INTO t VALUES (1), (2)"))
+        with request_trace(debug=True) as debug:
+            conn.execute(text("UPDATE t SET x = x + 1"))
+
+    assert "db" in plain.stages and plain.queries == []
+    assert debug.to_dict()["queries"][0]["sql"] == "UPDATE t SET x = x + 1"
+    assert debug.to_dict()["queries"][0]["rows"] == 2
+    assert "db" in debug.to_dict()["timingsMs"]
+
+
+def test_failed_statements_do_not_skew_later_timings():
+    """Test that a statement that raises leaves no start time behind."""
+    engine = create_engine("sqlite://")
+    install_sql_tracing(engine)
+
+    with engine.connect() as conn:
+        with request_trace(debug=True) as debug:
+            with pytest.raises(OperationalError):
+                conn.execute(text("SELECT * FROM missing"))
+            conn.execute(text("SELECT 1"))
+        assert "trace_query_start" not in conn.info
+
+    assert [q["sql"] for q in debug.to_dict()["queries"]] == ["SELECT 1"]